@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class BuscaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'busca'
+
+    def ready(self):
+        # Registra os sinais que mantêm o índice de busca atualizado
+        from . import signals  # noqa: F401
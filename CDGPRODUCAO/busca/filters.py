@@ -0,0 +1,32 @@
+from rest_framework.filters import BaseFilterBackend
+from busca.services.busca_service import BuscaService
+
+
+class BuscaTextoFilter(BaseFilterBackend):
+    """
+    Busca textual (?q=) pelo índice de busca.
+
+    A view indica o tipo de objeto em `busca_tipo` (BuscaService.TIPO_PEDIDO ou
+    TIPO_FORMULARIO). Os resultados vêm ordenados por relevância, a menos que a
+    requisição peça outra ordem com ?ordering=; por isso este filtro deve vir
+    depois do OrderingFilter.
+
+    Com `busca_completa = True` na view (exportações), todos os objetos
+    encontrados são mantidos, sem o limite de resultados nem a ordem por relevância.
+    """
+    parametro = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        texto = request.query_params.get(self.parametro, '').strip()
+        if not texto:
+            return queryset
+        if getattr(view, 'busca_completa', False):
+            return queryset.filter(BuscaService.filtro(view.busca_tipo, texto))
+
+        ids = BuscaService.buscar(view.busca_tipo, texto)
+        if not ids:
+            return queryset.none()
+        queryset = queryset.filter(pk__in=ids)
+        if request.query_params.get('ordering'):
+            return queryset
+        return queryset.order_by(BuscaService.ordem_ranking(ids))
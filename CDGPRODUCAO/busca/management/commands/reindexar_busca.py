@@ -0,0 +1,35 @@
+import logging
+from django.core.management.base import BaseCommand
+from busca.services.busca_service import BuscaService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Reconstrói o índice de busca textual de pedidos e formulários'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tipo',
+            choices=list(BuscaService.TABELAS),
+            default=None,
+            help='Reindexa apenas um tipo de objeto (padrão: todos)'
+        )
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=1000,
+            help='Quantidade de objetos carregados por consulta (padrão: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        if not BuscaService.disponivel():
+            self.stdout.write(self.style.WARNING(
+                'O banco não tem as tabelas do índice de busca (rode as migrações); a busca usará icontains'
+            ))
+            return
+
+        tipos = [options['tipo']] if options['tipo'] else list(BuscaService.TABELAS)
+        for tipo in tipos:
+            self.stdout.write(f'Reindexando {tipo}...')
+            total = BuscaService.reindexar(tipo, tamanho_lote=options['tamanho_lote'])
+            self.stdout.write(self.style.SUCCESS(f'{total} documento(s) de {tipo} indexado(s)'))
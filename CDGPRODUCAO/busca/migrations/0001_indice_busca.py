@@ -0,0 +1,56 @@
+import logging
+from django.db import migrations
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+TABELAS = ('busca_pedidos', 'busca_formularios')
+
+
+def criar_tabelas(apps, schema_editor):
+    """
+    Cria as tabelas do índice de busca conforme o banco: FTS5 no SQLite e tsvector
+    com índice GIN no PostgreSQL. Em outros bancos nada é criado e a busca usa icontains.
+
+    O índice começa vazio; rode `python manage.py reindexar_busca` para os dados existentes.
+    """
+    vendor = schema_editor.connection.vendor
+    for tabela in TABELAS:
+        if vendor == 'sqlite':
+            try:
+                schema_editor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {tabela} USING fts5("
+                    f"titulo, conteudo, tokenize='unicode61 remove_diacritics 2')"
+                )
+            except OperationalError as e:
+                logger.warning(f"SQLite sem FTS5, busca textual usará icontains: {e}")
+                return
+        elif vendor == 'postgresql':
+            schema_editor.execute(
+                f"CREATE TABLE IF NOT EXISTS {tabela} ("
+                f"id bigint PRIMARY KEY, "
+                f"titulo text NOT NULL DEFAULT '', "
+                f"conteudo text NOT NULL DEFAULT '', "
+                f"documento tsvector GENERATED ALWAYS AS ("
+                f"setweight(to_tsvector('simple', titulo), 'A') || "
+                f"setweight(to_tsvector('simple', conteudo), 'B')) STORED)"
+            )
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {tabela}_documento_idx ON {tabela} USING GIN (documento)"
+            )
+
+
+def remover_tabelas(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('sqlite', 'postgresql'):
+        return
+    for tabela in TABELAS:
+        schema_editor.execute(f"DROP TABLE IF EXISTS {tabela}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = []
+
+    operations = [
+        migrations.RunPython(criar_tabelas, remover_tabelas),
+    ]
@@ -0,0 +1 @@
+from .busca_service import *
@@ -0,0 +1,304 @@
+import logging
+import re
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+
+class BuscaService:
+    """
+    Índice de busca textual de pedidos e formulários.
+
+    No SQLite o índice são tabelas virtuais FTS5 (rowid = id do objeto); no
+    PostgreSQL, tabelas com uma coluna tsvector e índice GIN. Cada objeto vira um
+    documento com um título (peso maior no ranking) e um conteúdo. As tabelas são
+    criadas pela migração do app e mantidas pelos sinais em busca/signals.py; o
+    comando `reindexar_busca` reconstrói o índice inteiro.
+
+    Em outros bancos a busca recorre a icontains, sem ranking.
+    """
+    TIPO_PEDIDO = 'pedido'
+    TIPO_FORMULARIO = 'formulario'
+
+    TABELAS = {
+        TIPO_PEDIDO: 'busca_pedidos',
+        TIPO_FORMULARIO: 'busca_formularios',
+    }
+    MODELOS = {
+        TIPO_PEDIDO: 'pedidosMontink.Pedido',
+        TIPO_FORMULARIO: 'formsProducao.Formulario',
+    }
+    # Campos usados pela busca sem índice (bancos sem FTS)
+    CAMPOS_ALTERNATIVOS = {
+        TIPO_PEDIDO: ('nome_cliente', 'email_cliente', 'nome_destinatario', 'nome_produto', 'sku', 'itens__sku'),
+        TIPO_FORMULARIO: ('titulo', 'nome', 'email', 'cod_op'),
+    }
+
+    # Peso do título em relação ao conteúdo no ranking (SQLite)
+    PESO_TITULO = 10.0
+
+    # O ranking é calculado só para os documentos mais recentes que atendem à busca;
+    # uma palavra presente em quase todos os pedidos não obriga a pontuar a tabela inteira
+    JANELA_RANKING = 5000
+
+    # Comandos por banco; {tabela} é substituído pelo nome da tabela do tipo
+    SQL = {
+        'sqlite': {
+            'gravar': "INSERT OR REPLACE INTO {tabela} (rowid, titulo, conteudo) VALUES (%s, %s, %s)",
+            'remover': "DELETE FROM {tabela} WHERE rowid = %s",
+            'limpar': "DELETE FROM {tabela}",
+            # Junta os segmentos do índice em um só, deixando as buscas mais rápidas
+            'otimizar': "INSERT INTO {tabela} ({tabela}) VALUES ('optimize')",
+            # Todos os documentos encontrados, sem ranking (exportações)
+            'filtrar': "SELECT rowid FROM {tabela} WHERE {tabela} MATCH %s",
+            'buscar': (
+                "SELECT rowid FROM ("
+                "SELECT rowid, bm25({tabela}, %s, 1.0) AS relevancia FROM {tabela} "
+                "WHERE {tabela} MATCH %s ORDER BY rowid DESC LIMIT %s"
+                ") ORDER BY relevancia, rowid DESC LIMIT %s"
+            ),
+        },
+        'postgresql': {
+            'gravar': (
+                "INSERT INTO {tabela} (id, titulo, conteudo) VALUES (%s, %s, %s) "
+                "ON CONFLICT (id) DO UPDATE SET titulo = EXCLUDED.titulo, conteudo = EXCLUDED.conteudo"
+            ),
+            'remover': "DELETE FROM {tabela} WHERE id = %s",
+            'limpar': "TRUNCATE {tabela}",
+            'otimizar': "ANALYZE {tabela}",
+            'filtrar': "SELECT id FROM {tabela} WHERE documento @@ to_tsquery('simple', %s)",
+            'buscar': (
+                "SELECT id FROM ("
+                "SELECT id, ts_rank(documento, to_tsquery('simple', %s)) AS relevancia FROM {tabela} "
+                "WHERE documento @@ to_tsquery('simple', %s) ORDER BY id DESC LIMIT %s"
+                ") AS candidatos ORDER BY relevancia DESC, id DESC LIMIT %s"
+            ),
+        },
+    }
+
+    _disponivel = None
+
+    @classmethod
+    def disponivel(cls):
+        """Indica se o banco tem as tabelas do índice (criadas pela migração)."""
+        if cls._disponivel is None:
+            if connection.vendor not in cls.SQL:
+                cls._disponivel = False
+            else:
+                tabelas = set(connection.introspection.table_names())
+                cls._disponivel = all(tabela in tabelas for tabela in cls.TABELAS.values())
+        return cls._disponivel
+
+    @classmethod
+    def _sql(cls, tipo, comando):
+        return cls.SQL[connection.vendor][comando].format(tabela=cls.TABELAS[tipo])
+
+    @classmethod
+    def _modelo(cls, tipo):
+        return apps.get_model(cls.MODELOS[tipo])
+
+    @staticmethod
+    def termos(texto):
+        """Palavras da busca, sem pontuação nem operadores da sintaxe do FTS."""
+        return re.findall(r'\w+', (texto or '').lower())
+
+    @staticmethod
+    def _juntar(*valores):
+        return ' '.join(str(valor) for valor in valores if valor not in (None, ''))
+
+    @classmethod
+    def documento_pedido(cls, pedido):
+        """
+        Título e conteúdo indexados de um pedido (itens devem estar pré-carregados).
+        """
+        itens = pedido.itens.all()
+        titulo = cls._juntar(pedido.numero_pedido, pedido.nome_cliente)
+        conteudo = cls._juntar(
+            pedido.nome_produto, pedido.sku, pedido.email_cliente, pedido.nome_destinatario,
+            *[cls._juntar(item.nome, item.sku) for item in itens]
+        )
+        return titulo, conteudo
+
+    @classmethod
+    def documento_formulario(cls, formulario):
+        """
+        Título e conteúdo indexados de um formulário (unidades devem estar pré-carregadas).
+        """
+        titulo = formulario.titulo or ''
+        conteudo = cls._juntar(
+            formulario.cod_op, formulario.nome, formulario.email, formulario.tipo,
+            *[unidade.get_nome_display() for unidade in formulario.unidades.all()]
+        )
+        return titulo, conteudo
+
+    @classmethod
+    def _carregar(cls, tipo, ids):
+        modelo = cls._modelo(tipo)
+        if tipo == cls.TIPO_PEDIDO:
+            return modelo.objects.filter(id__in=ids).prefetch_related('itens')
+        return modelo.objects.filter(id__in=ids).prefetch_related('unidades')
+
+    @classmethod
+    def _documento(cls, tipo, objeto):
+        if tipo == cls.TIPO_PEDIDO:
+            return cls.documento_pedido(objeto)
+        return cls.documento_formulario(objeto)
+
+    @classmethod
+    def indexar(cls, tipo, ids):
+        """
+        Grava (ou regrava) no índice os objetos com os IDs informados.
+
+        IDs que não existem mais no banco são removidos do índice.
+
+        Returns:
+            int: Quantidade de documentos gravados
+        """
+        if not cls.disponivel():
+            return 0
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return 0
+
+        documentos = [
+            (objeto.id, *cls._documento(tipo, objeto))
+            for objeto in cls._carregar(tipo, ids)
+        ]
+        encontrados = {documento[0] for documento in documentos}
+        removidos = [(objeto_id,) for objeto_id in ids if objeto_id not in encontrados]
+
+        with connection.cursor() as cursor:
+            if documentos:
+                cursor.executemany(cls._sql(tipo, 'gravar'), documentos)
+            if removidos:
+                cursor.executemany(cls._sql(tipo, 'remover'), removidos)
+        return len(documentos)
+
+    @classmethod
+    def indexar_apos_commit(cls, tipo, ids):
+        """
+        Agenda a indexação para depois do commit da transação atual, quando os itens
+        ou unidades gravados na mesma transação já estão no banco.
+
+        Falhas são registradas no log e não afetam a operação que alterou os objetos.
+        """
+        def indexar():
+            try:
+                cls.indexar(tipo, ids)
+            except Exception as e:
+                logger.exception(f"Erro ao indexar {tipo} {ids} na busca: {str(e)}")
+        transaction.on_commit(indexar)
+
+    @classmethod
+    def reindexar(cls, tipo, tamanho_lote=1000):
+        """
+        Reconstrói o índice de um tipo a partir de todos os objetos do banco.
+
+        Cada lote é gravado na sua própria transação, percorrendo os objetos por ID.
+
+        Returns:
+            int: Quantidade de documentos gravados
+        """
+        if not cls.disponivel():
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(cls._sql(tipo, 'limpar'))
+
+        total = 0
+        ultimo_id = 0
+        objetos = cls._modelo(tipo).objects.order_by('id').values_list('id', flat=True)
+        while True:
+            ids = list(objetos.filter(id__gt=ultimo_id)[:tamanho_lote])
+            if not ids:
+                break
+            with transaction.atomic():
+                total += cls.indexar(tipo, ids)
+            ultimo_id = ids[-1]
+
+        with connection.cursor() as cursor:
+            cursor.execute(cls._sql(tipo, 'otimizar'))
+        return total
+
+    @classmethod
+    def buscar(cls, tipo, texto, limite=None):
+        """
+        Busca textual no índice.
+
+        Todas as palavras precisam aparecer no documento; a última é buscada como
+        prefixo ("joão sil" encontra "João Silva"). Acentos e maiúsculas são
+        ignorados. A relevância é calculada entre os JANELA_RANKING documentos mais
+        recentes encontrados.
+
+        Returns:
+            list: IDs dos objetos encontrados, do mais relevante para o menos relevante
+        """
+        termos = cls.termos(texto)
+        if not termos:
+            return []
+        limite = limite or settings.BUSCA_LIMITE_RESULTADOS
+
+        if not cls.disponivel():
+            return cls._buscar_sem_indice(tipo, termos, limite)
+
+        consulta = cls._consulta(termos)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(cls._sql(tipo, 'buscar'), [cls.PESO_TITULO, consulta, cls.JANELA_RANKING, limite])
+            else:
+                cursor.execute(cls._sql(tipo, 'buscar'), [consulta, consulta, cls.JANELA_RANKING, limite])
+            return [linha[0] for linha in cursor.fetchall()]
+
+    @classmethod
+    def filtro(cls, tipo, texto):
+        """
+        Condição com todos os objetos encontrados pela busca, sem o limite de
+        BUSCA_LIMITE_RESULTADOS nem ranking. Usada pelas exportações, que percorrem
+        o resultado inteiro na ordem da listagem.
+
+        Returns:
+            Q: Condição para o modelo do tipo (id IN subconsulta no índice)
+        """
+        termos = cls.termos(texto)
+        if not termos:
+            return Q(pk__in=[])
+        if not cls.disponivel():
+            return Q(pk__in=cls._modelo(tipo).objects.filter(cls._condicao_sem_indice(tipo, termos)).values('pk'))
+        return Q(pk__in=RawSQL(cls._sql(tipo, 'filtrar'), [cls._consulta(termos)]))
+
+    @staticmethod
+    def _consulta(termos):
+        """Expressão de busca do banco: todas as palavras, a última como prefixo."""
+        if connection.vendor == 'sqlite':
+            return ' AND '.join([f'"{termo}"' for termo in termos[:-1]] + [f'"{termos[-1]}"*'])
+        return ' & '.join(termos[:-1] + [f'{termos[-1]}:*'])
+
+    @classmethod
+    def _condicao_sem_indice(cls, tipo, termos):
+        condicao = Q()
+        for termo in termos:
+            condicao_termo = Q()
+            for campo in cls.CAMPOS_ALTERNATIVOS[tipo]:
+                condicao_termo |= Q(**{f'{campo}__icontains': termo})
+            condicao &= condicao_termo
+        return condicao
+
+    @classmethod
+    def _buscar_sem_indice(cls, tipo, termos, limite):
+        condicao = cls._condicao_sem_indice(tipo, termos)
+        ids = cls._modelo(tipo).objects.filter(condicao).order_by('-criado_em', '-id').values_list('id', flat=True)
+        return list(dict.fromkeys(ids[:limite * 2]))[:limite]
+
+    @staticmethod
+    def ordem_ranking(ids):
+        """
+        Expressão para order_by que mantém a ordem de relevância retornada por buscar().
+        """
+        return Case(
+            *[When(pk=objeto_id, then=Value(posicao)) for posicao, objeto_id in enumerate(ids)],
+            default=Value(len(ids)),
+            output_field=IntegerField()
+        )
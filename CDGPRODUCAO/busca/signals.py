@@ -0,0 +1,57 @@
+from django.db.models.signals import post_save, post_delete, post_migrate
+from formsProducao.models import Formulario, Unidade
+from pedidosMontink.models import Pedido, ItemPedido
+from busca.services.busca_service import BuscaService
+
+# Campos que fazem parte dos documentos indexados; um save(update_fields=...)
+# sem nenhum deles (ex.: alteração de status) não reindexa o objeto
+CAMPOS_INDEXADOS = {
+    BuscaService.TIPO_PEDIDO: {
+        'numero_pedido', 'nome_cliente', 'email_cliente', 'nome_destinatario', 'nome_produto', 'sku'
+    },
+    BuscaService.TIPO_FORMULARIO: {'titulo', 'nome', 'email', 'cod_op', 'tipo'},
+}
+
+
+def _alterou_campos_indexados(tipo, update_fields):
+    return not update_fields or bool(set(update_fields) & CAMPOS_INDEXADOS[tipo])
+
+
+def pedido_salvo(sender, instance, update_fields=None, **kwargs):
+    if _alterou_campos_indexados(BuscaService.TIPO_PEDIDO, update_fields):
+        BuscaService.indexar_apos_commit(BuscaService.TIPO_PEDIDO, [instance.id])
+
+
+def item_pedido_alterado(sender, instance, **kwargs):
+    BuscaService.indexar_apos_commit(BuscaService.TIPO_PEDIDO, [instance.pedido_id])
+
+
+def formulario_salvo(sender, instance, update_fields=None, **kwargs):
+    if _alterou_campos_indexados(BuscaService.TIPO_FORMULARIO, update_fields):
+        BuscaService.indexar_apos_commit(BuscaService.TIPO_FORMULARIO, [instance.id])
+
+
+def unidade_alterada(sender, instance, **kwargs):
+    BuscaService.indexar_apos_commit(BuscaService.TIPO_FORMULARIO, [instance.formulario_id])
+
+
+def objeto_removido(sender, instance, **kwargs):
+    tipo = BuscaService.TIPO_PEDIDO if sender is Pedido else BuscaService.TIPO_FORMULARIO
+    # indexar() remove do índice os IDs que não existem mais
+    BuscaService.indexar_apos_commit(tipo, [instance.id])
+
+
+def verificar_indice(sender, **kwargs):
+    """As tabelas do índice podem ter sido criadas (ou removidas) pela migração."""
+    BuscaService._disponivel = None
+
+
+post_save.connect(pedido_salvo, sender=Pedido, dispatch_uid='busca_pedido_salvo')
+post_delete.connect(objeto_removido, sender=Pedido, dispatch_uid='busca_pedido_removido')
+post_save.connect(item_pedido_alterado, sender=ItemPedido, dispatch_uid='busca_item_pedido_salvo')
+post_delete.connect(item_pedido_alterado, sender=ItemPedido, dispatch_uid='busca_item_pedido_removido')
+post_save.connect(formulario_salvo, sender=Formulario, dispatch_uid='busca_formulario_salvo')
+post_delete.connect(objeto_removido, sender=Formulario, dispatch_uid='busca_formulario_removido')
+post_save.connect(unidade_alterada, sender=Unidade, dispatch_uid='busca_unidade_salva')
+post_delete.connect(unidade_alterada, sender=Unidade, dispatch_uid='busca_unidade_removida')
+post_migrate.connect(verificar_indice, dispatch_uid='busca_verificar_indice')
@@ -0,0 +1,34 @@
+"""
+Utilitários de ETag para respostas condicionais (If-None-Match / 304 Not Modified).
+
+Os ETags são calculados a partir de dados baratos de consultar (atualizado_em e
+contagens), antes de qualquer serialização, para que uma requisição cujo conteúdo
+não mudou custe apenas uma consulta leve e nenhuma transferência.
+"""
+import hashlib
+from django.utils.cache import get_conditional_response, quote_etag
+
+# Incrementar quando o formato das respostas mudar, para invalidar os ETags já emitidos
+VERSAO_REPRESENTACAO = 1
+
+
+def calcular_etag(*partes):
+    """
+    Calcula um ETag forte a partir das partes informadas.
+
+    Returns:
+        str: ETag entre aspas, pronto para o cabeçalho
+    """
+    conteudo = '|'.join(str(parte) for parte in (VERSAO_REPRESENTACAO,) + partes)
+    return quote_etag(hashlib.sha1(conteudo.encode()).hexdigest())
+
+
+def resposta_nao_modificada(request, etag):
+    """
+    Retorna uma resposta 304 (com o ETag) se o If-None-Match da requisição
+    corresponder ao ETag atual, ou None caso contrário.
+    """
+    resposta = get_conditional_response(request, etag=etag)
+    if resposta is not None:
+        resposta['ETag'] = etag
+    return resposta
@@ -0,0 +1,115 @@
+"""
+Utilitários de exportação em CSV e NDJSON (um objeto JSON por linha).
+
+As linhas são geradas uma a uma a partir de um iterável de registros (dicts),
+normalmente alimentado por QuerySet.iterator(chunk_size=...), e enviadas com
+StreamingHttpResponse ou gravadas direto em um arquivo. Nenhuma das duas formas
+monta a exportação inteira em memória.
+"""
+import csv
+import datetime
+import json
+import logging
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+FORMATO_CSV = 'csv'
+FORMATO_NDJSON = 'ndjson'
+FORMATOS = (FORMATO_CSV, FORMATO_NDJSON)
+
+CONTENT_TYPES = {
+    FORMATO_CSV: 'text/csv; charset=utf-8',
+    FORMATO_NDJSON: 'application/x-ndjson; charset=utf-8',
+}
+
+
+class _Eco:
+    """Pseudo-arquivo para o csv.writer: write() devolve a linha em vez de gravá-la."""
+    def write(self, valor):
+        return valor
+
+
+def _valor_csv(valor):
+    # Datas no mesmo formato ISO 8601 do NDJSON
+    if isinstance(valor, (datetime.date, datetime.time)):
+        return valor.isoformat()
+    return valor
+
+
+def gerar_linhas(formato, colunas, registros):
+    """
+    Gera as linhas da exportação, uma por registro.
+
+    No CSV a primeira linha é o cabeçalho e cada registro contribui só com as
+    `colunas` (valores aninhados, como listas de itens, ficam de fora). No NDJSON
+    cada registro é serializado inteiro.
+
+    Args:
+        formato (str): FORMATO_CSV ou FORMATO_NDJSON
+        colunas (list): Chaves dos registros exportadas no CSV, em ordem
+        registros (iterable): Dicts a exportar
+
+    Yields:
+        str: Linha terminada em quebra de linha
+    """
+    if formato == FORMATO_CSV:
+        escritor = csv.writer(_Eco())
+        yield escritor.writerow(colunas)
+        for registro in registros:
+            yield escritor.writerow([_valor_csv(registro.get(coluna)) for coluna in colunas])
+    else:
+        for registro in registros:
+            yield json.dumps(registro, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _registrar_falha(linhas, nome):
+    # Depois do primeiro byte enviado o status da resposta não muda mais; a falha
+    # fica no log e o arquivo chega truncado ao cliente
+    try:
+        yield from linhas
+    except Exception as e:
+        logger.exception(f"Erro durante a exportação de {nome}: {str(e)}")
+        raise
+
+
+def resposta_exportacao(formato, colunas, registros, nome):
+    """
+    Resposta HTTP que envia a exportação à medida que os registros são lidos.
+
+    Args:
+        formato (str): FORMATO_CSV ou FORMATO_NDJSON
+        colunas (list): Colunas do CSV
+        registros (iterable): Dicts a exportar
+        nome (str): Nome do arquivo, sem extensão
+
+    Returns:
+        StreamingHttpResponse: Resposta com Content-Disposition de anexo
+    """
+    resposta = StreamingHttpResponse(
+        _registrar_falha(gerar_linhas(formato, colunas, registros), nome),
+        content_type=CONTENT_TYPES[formato]
+    )
+    resposta['Content-Disposition'] = f'attachment; filename="{nome}.{formato}"'
+    return resposta
+
+
+def gravar_exportacao(arquivo, formato, colunas, registros):
+    """
+    Grava a exportação em um arquivo de texto aberto, linha a linha.
+
+    Returns:
+        int: Quantidade de registros gravados
+    """
+    total = 0
+
+    def contar():
+        nonlocal total
+        for registro in registros:
+            total += 1
+            yield registro
+
+    for linha in gerar_linhas(formato, colunas, contar()):
+        arquivo.write(linha)
+    return total
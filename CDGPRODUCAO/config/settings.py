@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'usuarios',
     'formsProducao',
     'pedidosMontink',
+    'busca',
 ]
 
 MIDDLEWARE = [
@@ -135,6 +136,87 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Upload assíncrono dos PDFs dos formulários
+# Quando ativo, o envio do formulário responde 202 e os PDFs são enviados
+# para o Google Drive pelo comando `processar_uploads`
+FORMULARIO_UPLOAD_ASSINCRONO = os.environ.get('FORMULARIO_UPLOAD_ASSINCRONO', 'False') == 'True'
+FORMULARIO_UPLOAD_SPOOL_DIR = BASE_DIR / 'spool' / 'uploads'
+FORMULARIO_UPLOAD_MAX_TENTATIVAS = int(os.environ.get('FORMULARIO_UPLOAD_MAX_TENTATIVAS', 3))
+
+# Uploads simultâneos para o Google Drive: limite do processo inteiro (tamanho do
+# pool de threads) e limite de arquivos de uma mesma requisição/job
+DRIVE_UPLOAD_MAX_CONCORRENCIA_PROCESSO = int(os.environ.get('DRIVE_UPLOAD_MAX_CONCORRENCIA_PROCESSO', 8))
+DRIVE_UPLOAD_MAX_CONCORRENCIA_REQUISICAO = int(os.environ.get('DRIVE_UPLOAD_MAX_CONCORRENCIA_REQUISICAO', 4))
+
+# Cache. O backend é escolhido pela variável CACHE_BACKEND:
+# 'locmem' (padrão, memória do processo), 'file' (diretório local, compartilhado
+# entre os processos da máquina) ou 'redis' (requer o pacote redis)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / 'cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'cdgproducao',
+        }
+    }
+
+# Tempo (segundos) que a representação de um formulário fica no cache
+FORMULARIO_CACHE_TIMEOUT = int(os.environ.get('FORMULARIO_CACHE_TIMEOUT', 300))
+
+# Recebimento assíncrono dos webhooks de pedidos da Montink
+# Quando ativo, o webhook é verificado e registrado, a resposta é 202 e os pedidos
+# são criados em lotes pelo comando `processar_webhooks`
+PEDIDOS_WEBHOOK_ASSINCRONO = os.environ.get('PEDIDOS_WEBHOOK_ASSINCRONO', 'False') == 'True'
+PEDIDOS_WEBHOOK_TAMANHO_LOTE = int(os.environ.get('PEDIDOS_WEBHOOK_TAMANHO_LOTE', 50))
+
+# Quantidade máxima de pedidos aceitos pelo recebimento em lote (receber/lote/)
+PEDIDOS_WEBHOOK_LOTE_MAXIMO = int(os.environ.get('PEDIDOS_WEBHOOK_LOTE_MAXIMO', 500))
+
+# Entregas repetidas de um pedido (mesmo numero_pedido) são respondidas com o pedido
+# existente; quando ativo, um payload diferente do original atualiza os dados do pedido
+PEDIDOS_WEBHOOK_ATUALIZAR_DUPLICADOS = os.environ.get('PEDIDOS_WEBHOOK_ATUALIZAR_DUPLICADOS', 'False') == 'True'
+
+# Tempo (segundos) que o total da listagem de pedidos paginada por cursor (?total=exato)
+# fica em cache para cada combinação de filtros
+PEDIDOS_TOTAL_CACHE_TIMEOUT = int(os.environ.get('PEDIDOS_TOTAL_CACHE_TIMEOUT', 60))
+
+# Quadro de pedidos por status (pedidos/quadro/): tempo (segundos) que os totais
+# ficam em cache e quantidade padrão de pedidos por coluna
+PEDIDOS_QUADRO_CACHE_TIMEOUT = int(os.environ.get('PEDIDOS_QUADRO_CACHE_TIMEOUT', 300))
+PEDIDOS_QUADRO_LIMITE = int(os.environ.get('PEDIDOS_QUADRO_LIMITE', 20))
+
+# Envio dos webhooks de status (fila WebhookStatusPendente, comando `enviar_webhooks_status`)
+# Falhas são reenviadas com espera exponencial: BACKOFF_BASE * 2^(tentativa-1) segundos,
+# limitada a BACKOFF_MAXIMO; depois de MAX_TENTATIVAS o envio é marcado como falho
+PEDIDOS_STATUS_WEBHOOK_TAMANHO_LOTE = int(os.environ.get('PEDIDOS_STATUS_WEBHOOK_TAMANHO_LOTE', 20))
+PEDIDOS_STATUS_WEBHOOK_MAX_TENTATIVAS = int(os.environ.get('PEDIDOS_STATUS_WEBHOOK_MAX_TENTATIVAS', 8))
+PEDIDOS_STATUS_WEBHOOK_BACKOFF_BASE = int(os.environ.get('PEDIDOS_STATUS_WEBHOOK_BACKOFF_BASE', 30))
+PEDIDOS_STATUS_WEBHOOK_BACKOFF_MAXIMO = int(os.environ.get('PEDIDOS_STATUS_WEBHOOK_BACKOFF_MAXIMO', 3600))
+# Envios simultâneos (threads) e conexões mantidas abertas por host de endpoint
+PEDIDOS_STATUS_WEBHOOK_MAX_THREADS = int(os.environ.get('PEDIDOS_STATUS_WEBHOOK_MAX_THREADS', 8))
+
+# Quantidade máxima de resultados da busca textual (?q=), ordenados por relevância
+BUSCA_LIMITE_RESULTADOS = int(os.environ.get('BUSCA_LIMITE_RESULTADOS', 200))
+
+# Exportação em CSV/NDJSON (pedidos/exportar/, <tipo>/exportar/ e os comandos
+# exportar_pedidos e exportar_formularios): registros lidos do banco por vez
+EXPORTACAO_TAMANHO_LOTE = int(os.environ.get('EXPORTACAO_TAMANHO_LOTE', 2000))
+
 # Webhook settings
 WEBHOOK_SECRET_KEY = 'sua-chave-secreta-aqui'  # Recomendamos usar variáveis de ambiente para isso em produção
 
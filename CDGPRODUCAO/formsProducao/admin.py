@@ -1,5 +1,5 @@
 from django.contrib import admin
-from formsProducao.models import Formulario, Unidade, ArquivoPDF
+from formsProducao.models import Formulario, Unidade, ArquivoPDF, UploadJob, UploadJobArquivo, PastaDrive, SequenciaCodOp
 
 class UnidadeInline(admin.TabularInline):
     model = Unidade
@@ -53,3 +53,29 @@ class ArquivoPDFAdmin(admin.ModelAdmin):
     tem_arquivo.short_description = "Arquivo"
     tem_link.boolean = True
     tem_link.short_description = "Link"
+
+class UploadJobArquivoInline(admin.TabularInline):
+    model = UploadJobArquivo
+    extra = 0
+    fields = ('nome', 'status', 'tamanho', 'bytes_enviados', 'arquivo_pdf', 'erro')
+    readonly_fields = fields
+
+@admin.register(UploadJob)
+class UploadJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'formulario', 'tipo', 'status', 'tentativas', 'criado_em', 'concluido_em')
+    search_fields = ('formulario__cod_op',)
+    list_filter = ('status', 'tipo', 'criado_em')
+    readonly_fields = ('criado_em', 'iniciado_em', 'concluido_em', 'atualizado_em')
+    inlines = [UploadJobArquivoInline]
+
+@admin.register(PastaDrive)
+class PastaDriveAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'nome', 'pasta_id', 'atualizado_em')
+    search_fields = ('tipo', 'nome', 'pasta_id')
+    readonly_fields = ('criado_em', 'atualizado_em')
+
+@admin.register(SequenciaCodOp)
+class SequenciaCodOpAdmin(admin.ModelAdmin):
+    list_display = ('prefixo', 'data', 'ultimo_numero')
+    list_filter = ('prefixo',)
+    date_hierarchy = 'data'
@@ -0,0 +1,81 @@
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from busca.services.busca_service import BuscaService
+from config.exportacao import FORMATO_CSV, FORMATOS, gravar_exportacao
+from formsProducao.services import (
+    ExportacaoFormulariosService, UploadJobService, ZeroHumService, PensiService, EliteService, coleguiumService
+)
+
+logger = logging.getLogger(__name__)
+
+TIPOS = [servico.TIPO_FORMULARIO for servico in (ZeroHumService, PensiService, EliteService, coleguiumService)]
+
+
+def data(valor):
+    resultado = parse_date(valor)
+    if resultado is None:
+        raise ValueError(valor)
+    return resultado
+
+
+class Command(BaseCommand):
+    help = 'Exporta os formulários de um tipo em CSV ou NDJSON, com os mesmos filtros da listagem, lendo o banco em lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tipo',
+            choices=TIPOS,
+            help='Tipo de formulário'
+        )
+        parser.add_argument(
+            '--formato',
+            choices=FORMATOS,
+            default=FORMATO_CSV,
+            help='Formato do arquivo (padrão: csv)'
+        )
+        parser.add_argument(
+            '--saida',
+            default=None,
+            help='Arquivo de saída (padrão: saída padrão)'
+        )
+        parser.add_argument('--data-inicio', type=data, default=None, help='Criados a partir desta data (AAAA-MM-DD)')
+        parser.add_argument('--data-fim', type=data, default=None, help='Criados até esta data (AAAA-MM-DD)')
+        parser.add_argument('--entrega-inicio', type=data, default=None, help='Entrega a partir desta data (AAAA-MM-DD)')
+        parser.add_argument('--entrega-fim', type=data, default=None, help='Entrega até esta data (AAAA-MM-DD)')
+        parser.add_argument('--q', default=None, help='Busca textual pelo índice de busca')
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=None,
+            help='Quantidade de formulários lidos por consulta (padrão: EXPORTACAO_TAMANHO_LOTE)'
+        )
+
+    def handle(self, *args, **options):
+        filtros = {
+            parametro: options[parametro]
+            for parametro in ('data_inicio', 'data_fim', 'entrega_inicio', 'entrega_fim')
+        }
+        formularios = UploadJobService.obter_servico(options['tipo']).listar_formularios(filtros)
+        if options['q']:
+            # Todos os formulários encontrados, sem o limite de resultados da busca
+            formularios = formularios.filter(BuscaService.filtro(BuscaService.TIPO_FORMULARIO, options['q']))
+
+        formato = options['formato']
+        registros = ExportacaoFormulariosService.registros(
+            ExportacaoFormulariosService.ordenar(formularios),
+            formato_csv=formato == FORMATO_CSV,
+            tamanho_lote=options['tamanho_lote']
+        )
+
+        if not options['saida']:
+            total = gravar_exportacao(self.stdout, formato, ExportacaoFormulariosService.COLUNAS, registros)
+            self.stderr.write(f'{total} formulário(s) exportado(s)')
+            return
+
+        try:
+            with open(options['saida'], 'w', encoding='utf-8', newline='') as arquivo:
+                total = gravar_exportacao(arquivo, formato, ExportacaoFormulariosService.COLUNAS, registros)
+        except OSError as e:
+            raise CommandError(f'Não foi possível gravar {options["saida"]}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'{total} formulário(s) exportado(s) para {options["saida"]}'))
@@ -0,0 +1,56 @@
+import time
+import logging
+from django.core.management.base import BaseCommand
+from formsProducao.services import UploadJobService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Processa os jobs de upload assíncrono de PDFs dos formulários para o Google Drive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='Continua verificando a fila em vez de sair quando ela estiver vazia'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5,
+            help='Segundos entre verificações da fila no modo contínuo (padrão: 5)'
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=None,
+            help='Quantidade máxima de jobs processados por verificação'
+        )
+        parser.add_argument(
+            '--liberar-apos',
+            type=int,
+            default=30,
+            help='Minutos após os quais um job em processamento é considerado travado e volta para a fila (padrão: 30)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Processando jobs de upload...')
+
+        while True:
+            liberados = UploadJobService.liberar_jobs_travados(options['liberar_apos'])
+            if liberados:
+                self.stdout.write(self.style.WARNING(
+                    f'{liberados} job(s) travado(s) devolvido(s) para a fila'
+                ))
+
+            processados = UploadJobService.processar_pendentes(limite=options['limite'])
+            if processados:
+                self.stdout.write(self.style.SUCCESS(f'{processados} job(s) processado(s)'))
+
+            if not options['continuo']:
+                break
+
+            if not processados:
+                time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS('Processamento de uploads concluído.'))
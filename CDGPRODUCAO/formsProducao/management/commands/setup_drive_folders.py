@@ -9,29 +9,36 @@ from formsProducao.services import (
 logger = logging.getLogger(__name__)
 
 class Command(BaseCommand):
-    help = 'Configura as pastas do Google Drive para os formulários'
+    help = 'Configura as pastas do Google Drive para os formulários e grava os IDs no registro de pastas'
 
     def handle(self, *args, **options):
         self.stdout.write('Verificando configurações do Google Drive...')
         
-        # Verifica se o diretório credentials existe
-        credentials_path = os.path.join(settings.BASE_DIR, 'credentials')
-        if not os.path.exists(credentials_path):
-            os.makedirs(credentials_path)
-            self.stdout.write(self.style.WARNING(
-                f'Criado diretório de credenciais em: {credentials_path}'
-            ))
-        
-        # Verifica se o arquivo de credenciais existe
-        credentials_file = os.path.join(credentials_path, 'google_drive_credentials.json')
-        if not os.path.exists(credentials_file):
-            self.stdout.write(self.style.ERROR(
-                f'Arquivo de credenciais do Google Drive não encontrado em: {credentials_file}. '
-                f'Por favor, coloque o arquivo JSON de credenciais do serviço neste local.'
-            ))
-            return
+        # As credenciais podem vir das variáveis de ambiente ou do arquivo JSON
+        existe_env_credenciais = bool(os.environ.get("GOOGLE_PRIVATE_KEY") and os.environ.get("GOOGLE_CLIENT_EMAIL"))
         
-        self.stdout.write(self.style.SUCCESS('Arquivo de credenciais encontrado.'))
+        if existe_env_credenciais:
+            self.stdout.write(self.style.SUCCESS('Credenciais encontradas nas variáveis de ambiente.'))
+        else:
+            # Verifica se o diretório credentials existe
+            credentials_path = os.path.join(settings.BASE_DIR, 'credentials')
+            if not os.path.exists(credentials_path):
+                os.makedirs(credentials_path)
+                self.stdout.write(self.style.WARNING(
+                    f'Criado diretório de credenciais em: {credentials_path}'
+                ))
+            
+            # Verifica se o arquivo de credenciais existe
+            credentials_file = os.path.join(credentials_path, 'google_drive_credentials.json')
+            if not os.path.exists(credentials_file):
+                self.stdout.write(self.style.ERROR(
+                    f'Arquivo de credenciais do Google Drive não encontrado em: {credentials_file}. '
+                    f'Por favor, coloque o arquivo JSON de credenciais do serviço neste local '
+                    f'ou configure as variáveis GOOGLE_PRIVATE_KEY e GOOGLE_CLIENT_EMAIL.'
+                ))
+                return
+            
+            self.stdout.write(self.style.SUCCESS('Arquivo de credenciais encontrado.'))
         
         # Configura pastas para cada tipo de formulário
         self.setup_form_folder(ZeroHumService, 'ZeroHum')
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formsProducao', '0007_remove_formulario_arquivo_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=20, verbose_name='Tipo de formulário')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('CONCLUIDO', 'Concluído'), ('ERRO', 'Erro')], db_index=True, default='PENDENTE', max_length=20)),
+                ('tentativas', models.IntegerField(default=0)),
+                ('erro', models.TextField(blank=True, null=True)),
+                ('criado_em', models.DateTimeField(default=django.utils.timezone.now)),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True)),
+                ('concluido_em', models.DateTimeField(blank=True, null=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('formulario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_jobs', to='formsProducao.formulario', verbose_name='Formulário')),
+            ],
+            options={
+                'verbose_name': 'Job de upload',
+                'verbose_name_plural': 'Jobs de upload',
+                'ordering': ['criado_em'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadJobArquivo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=255, verbose_name='Nome do arquivo')),
+                ('caminho_spool', models.CharField(max_length=500)),
+                ('tamanho', models.BigIntegerField(default=0)),
+                ('bytes_enviados', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('CONCLUIDO', 'Concluído'), ('ERRO', 'Erro')], default='PENDENTE', max_length=20)),
+                ('erro', models.TextField(blank=True, null=True)),
+                ('criado_em', models.DateTimeField(default=django.utils.timezone.now)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('arquivo_pdf', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='formsProducao.arquivopdf')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='arquivos', to='formsProducao.uploadjob', verbose_name='Job')),
+            ],
+            options={
+                'verbose_name': 'Arquivo do job de upload',
+                'verbose_name_plural': 'Arquivos do job de upload',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formsProducao', '0008_uploadjob_uploadjobarquivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PastaDrive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=20, unique=True, verbose_name='Tipo de formulário')),
+                ('nome', models.CharField(max_length=255, verbose_name='Nome da pasta')),
+                ('pasta_id', models.CharField(blank=True, default='', max_length=100, verbose_name='ID da pasta no Drive')),
+                ('criado_em', models.DateTimeField(default=django.utils.timezone.now)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Pasta do Drive',
+                'verbose_name_plural': 'Pastas do Drive',
+                'ordering': ['tipo'],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Prefixo do cod_op de cada tipo de formulário (PREFIXO_COD_OP dos serviços)
+PREFIXOS_TIPO = {
+    'ZH': 'zerohum',
+    'PS': 'pensi',
+    'EL': 'elite',
+    'CL': 'coleguium',
+}
+
+
+def preencher_tipo(apps, schema_editor):
+    """Preenche o tipo dos formulários existentes a partir do prefixo do cod_op."""
+    Formulario = apps.get_model('formsProducao', 'Formulario')
+    for prefixo, tipo in PREFIXOS_TIPO.items():
+        Formulario.objects.filter(tipo__isnull=True, cod_op__startswith=prefixo).update(tipo=tipo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formsProducao', '0009_pastadrive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formulario',
+            name='tipo',
+            field=models.CharField(blank=True, max_length=20, null=True, verbose_name='Tipo de formulário'),
+        ),
+        migrations.RunPython(preencher_tipo, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='formulario',
+            index=models.Index(fields=['tipo', '-criado_em', '-id'], name='formulario_tipo_criado_idx'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:36
+
+import re
+from datetime import datetime
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# Código gerado pelo sistema: prefixo + AAAAMMDD + número
+PADRAO_COD_OP = re.compile(r'^([A-Z]{2})(\d{8})(\d+)$')
+
+
+def corrigir_cod_ops(apps, schema_editor):
+    """
+    Prepara os códigos de operação existentes para a restrição única:
+    códigos vazios viram NULL e, nos duplicados, o formulário mais antigo mantém
+    o código e os demais recebem um sufixo (-2, -3, ...).
+    """
+    Formulario = apps.get_model('formsProducao', 'Formulario')
+    Formulario.objects.filter(cod_op='').update(cod_op=None)
+
+    duplicados = (
+        Formulario.objects.exclude(cod_op__isnull=True)
+        .values('cod_op').annotate(total=Count('id')).filter(total__gt=1)
+        .values_list('cod_op', flat=True)
+    )
+    for cod_op in list(duplicados):
+        formularios = Formulario.objects.filter(cod_op=cod_op).order_by('criado_em', 'id')
+        sufixo = 2
+        for formulario in list(formularios)[1:]:
+            while Formulario.objects.filter(cod_op=f"{cod_op}-{sufixo}").exists():
+                sufixo += 1
+            formulario.cod_op = f"{cod_op}-{sufixo}"
+            formulario.save(update_fields=['cod_op'])
+            sufixo += 1
+
+
+def preencher_sequencias(apps, schema_editor):
+    """
+    Cria as sequências a partir dos códigos existentes, começando após o maior
+    número já usado em cada prefixo e dia.
+    """
+    Formulario = apps.get_model('formsProducao', 'Formulario')
+    SequenciaCodOp = apps.get_model('formsProducao', 'SequenciaCodOp')
+
+    maiores = {}
+    for cod_op in Formulario.objects.exclude(cod_op__isnull=True).values_list('cod_op', flat=True).iterator():
+        correspondencia = PADRAO_COD_OP.match(cod_op)
+        if not correspondencia:
+            continue
+        prefixo, data, numero = correspondencia.groups()
+        try:
+            data = datetime.strptime(data, '%Y%m%d').date()
+        except ValueError:
+            continue
+        chave = (prefixo, data)
+        maiores[chave] = max(maiores.get(chave, 0), int(numero))
+
+    SequenciaCodOp.objects.bulk_create(
+        [SequenciaCodOp(prefixo=prefixo, data=data, ultimo_numero=numero) for (prefixo, data), numero in maiores.items()],
+        batch_size=500
+    )
+
+
+def preparar_cod_ops(apps, schema_editor):
+    corrigir_cod_ops(apps, schema_editor)
+    preencher_sequencias(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formsProducao', '0010_formulario_tipo'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='formulario',
+            name='cod_op',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.CreateModel(
+            name='SequenciaCodOp',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefixo', models.CharField(max_length=4, verbose_name='Prefixo do cod_op')),
+                ('data', models.DateField(verbose_name='Data')),
+                ('ultimo_numero', models.PositiveIntegerField(default=0, verbose_name='Último número alocado')),
+            ],
+            options={
+                'verbose_name': 'Sequência de cod_op',
+                'verbose_name_plural': 'Sequências de cod_op',
+                'constraints': [models.UniqueConstraint(fields=('prefixo', 'data'), name='sequencia_cod_op_prefixo_data_unica')],
+            },
+        ),
+        migrations.RunPython(preparar_cod_ops, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formsProducao', '0011_sequencia_cod_op'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='formulario',
+            name='cod_op',
+            field=models.CharField(blank=True, max_length=20, null=True, unique=True),
+        ),
+    ]
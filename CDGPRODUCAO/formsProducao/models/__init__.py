@@ -2,5 +2,8 @@
 from .formulario import Formulario
 from .unidade import Unidade
 from .arquivopdf import ArquivoPDF
+from .upload_job import UploadJob, UploadJobArquivo
+from .pasta_drive import PastaDrive
+from .sequencia_cod_op import SequenciaCodOp
 
 # Exporte outras classes de modelo conforme necessário
\ No newline at end of file
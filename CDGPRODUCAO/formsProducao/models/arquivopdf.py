@@ -30,5 +30,22 @@ class ArquivoPDF(models.Model):
         verbose_name_plural = "Arquivos PDF"
         ordering = ['-criado_em']
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.tocar_formulario()
+    
+    def delete(self, *args, **kwargs):
+        resultado = super().delete(*args, **kwargs)
+        self.tocar_formulario()
+        return resultado
+    
+    def tocar_formulario(self):
+        """
+        Atualiza o atualizado_em do formulário, já que os PDFs fazem parte da sua
+        representação (usado no ETag das consultas de formulários).
+        """
+        from formsProducao.models.formulario import Formulario
+        Formulario.objects.filter(pk=self.formulario_id).update(atualizado_em=timezone.now())
+    
     def __str__(self):
         return f"PDF {self.id} - {self.nome} (Formulário {self.formulario.cod_op})"
\ No newline at end of file
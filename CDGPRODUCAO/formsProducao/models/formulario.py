@@ -48,7 +48,12 @@ class Formulario(models.Model):
     grampos = models.CharField(max_length=10, null=True, blank=True)
     espiral = models.BooleanField(default=False)
     capa_pvc = models.BooleanField(default=False)    # Código de operação (ID único do formulário)
-    cod_op = models.CharField(max_length=10, null=True, blank=True)# Campos de controle temporal
+    cod_op = models.CharField(max_length=20, unique=True, null=True, blank=True)
+    
+    # Tipo do formulário (zerohum, pensi, elite, coleguium), usado para filtrar as listagens
+    tipo = models.CharField(max_length=20, null=True, blank=True, verbose_name="Tipo de formulário")
+    
+    # Campos de controle temporal
     criado_em = models.DateTimeField(default=timezone.now)
     atualizado_em = models.DateTimeField(auto_now=True)
     
@@ -56,6 +61,10 @@ class Formulario(models.Model):
         verbose_name = "Formulário"
         verbose_name_plural = "Formulários"
         ordering = ['-criado_em']
+        indexes = [
+            # Listagem por tipo com paginação por cursor em (criado_em, id)
+            models.Index(fields=['tipo', '-criado_em', '-id'], name='formulario_tipo_criado_idx'),
+        ]
         
     def __str__(self):
         return f"Formulário {self.id} - {self.titulo or 'Sem título'} ({self.nome or 'Anônimo'})"
@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils import timezone
+
+
+class PastaDrive(models.Model):
+    """
+    Registro das pastas do Google Drive usadas por cada tipo de formulário.
+
+    Preenchido pelo comando `setup_drive_folders` (ou na primeira vez que a pasta
+    é necessária), para que novos processos não precisem consultar o Drive antes
+    do primeiro upload. Um registro com `pasta_id` vazio indica que algum processo
+    está criando a pasta naquele momento.
+    """
+    # Tipo do formulário (TIPO_FORMULARIO do serviço: zerohum, pensi, ...)
+    tipo = models.CharField(max_length=20, unique=True, verbose_name="Tipo de formulário")
+    nome = models.CharField(max_length=255, verbose_name="Nome da pasta")
+    pasta_id = models.CharField(max_length=100, blank=True, default='', verbose_name="ID da pasta no Drive")
+
+    # Campos de controle temporal
+    criado_em = models.DateTimeField(default=timezone.now)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Pasta do Drive"
+        verbose_name_plural = "Pastas do Drive"
+        ordering = ['tipo']
+
+    def __str__(self):
+        return f"{self.nome} ({self.tipo}): {self.pasta_id or 'em criação'}"
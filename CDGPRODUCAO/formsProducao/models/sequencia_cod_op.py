@@ -0,0 +1,54 @@
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
+
+
+class SequenciaCodOp(models.Model):
+    """
+    Sequência diária dos códigos de operação (cod_op), por prefixo do tipo de formulário.
+
+    Cada formulário recebe o próximo número da sequência do seu prefixo no dia
+    (ZH + AAAAMMDD + 0001, 0002, ...), alocado com um incremento atômico no banco,
+    de forma que envios simultâneos nunca recebem o mesmo código.
+    """
+    prefixo = models.CharField(max_length=4, verbose_name="Prefixo do cod_op")
+    data = models.DateField(verbose_name="Data")
+    ultimo_numero = models.PositiveIntegerField(default=0, verbose_name="Último número alocado")
+
+    class Meta:
+        verbose_name = "Sequência de cod_op"
+        verbose_name_plural = "Sequências de cod_op"
+        constraints = [
+            models.UniqueConstraint(fields=['prefixo', 'data'], name='sequencia_cod_op_prefixo_data_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.prefixo} {self.data:%Y-%m-%d}: {self.ultimo_numero}"
+
+    @classmethod
+    def proximo_numero(cls, prefixo, data):
+        """
+        Aloca o próximo número da sequência do prefixo na data informada.
+
+        O UPDATE com F() bloqueia a linha até o fim da transação, então cada
+        chamada concorrente recebe um número diferente.
+
+        Returns:
+            int: Número alocado (começa em 1 a cada dia)
+        """
+        with transaction.atomic():
+            atualizados = cls.objects.filter(prefixo=prefixo, data=data).update(
+                ultimo_numero=F('ultimo_numero') + 1
+            )
+            if not atualizados:
+                # Primeiro código do dia: cria a sequência. Se outro processo criou
+                # ao mesmo tempo, a restrição única impede a duplicata e o incremento
+                # é refeito sobre a linha existente.
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(prefixo=prefixo, data=data, ultimo_numero=1)
+                    return 1
+                except IntegrityError:
+                    cls.objects.filter(prefixo=prefixo, data=data).update(
+                        ultimo_numero=F('ultimo_numero') + 1
+                    )
+            return cls.objects.filter(prefixo=prefixo, data=data).values_list('ultimo_numero', flat=True).get()
@@ -0,0 +1,99 @@
+from django.db import models
+from django.utils import timezone
+
+
+class UploadJob(models.Model):
+    """
+    Job de upload assíncrono dos PDFs de um formulário para o Google Drive.
+    Criado no envio do formulário quando o modo assíncrono está ativo e
+    processado em segundo plano pelo comando `processar_uploads`.
+    """
+    STATUS_PENDENTE = 'PENDENTE'
+    STATUS_PROCESSANDO = 'PROCESSANDO'
+    STATUS_CONCLUIDO = 'CONCLUIDO'
+    STATUS_ERRO = 'ERRO'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDENTE, 'Pendente'),
+        (STATUS_PROCESSANDO, 'Processando'),
+        (STATUS_CONCLUIDO, 'Concluído'),
+        (STATUS_ERRO, 'Erro'),
+    ]
+
+    # Relação com o formulário
+    formulario = models.ForeignKey(
+        'formsProducao.Formulario',
+        on_delete=models.CASCADE,
+        related_name='upload_jobs',
+        verbose_name="Formulário"
+    )
+
+    # Tipo do formulário (zerohum, pensi, ...) usado para escolher o serviço no worker
+    tipo = models.CharField(max_length=20, verbose_name="Tipo de formulário")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDENTE, db_index=True)
+    tentativas = models.IntegerField(default=0)
+    erro = models.TextField(null=True, blank=True)
+
+    # Campos de controle temporal
+    criado_em = models.DateTimeField(default=timezone.now)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Job de upload"
+        verbose_name_plural = "Jobs de upload"
+        ordering = ['criado_em']
+
+    def __str__(self):
+        return f"Job {self.id} - {self.get_status_display()} (Formulário {self.formulario_id})"
+
+
+class UploadJobArquivo(models.Model):
+    """
+    Arquivo PDF de um job de upload. Guarda o caminho do arquivo no spool local
+    e o progresso do envio para o Google Drive.
+    """
+    job = models.ForeignKey(
+        UploadJob,
+        on_delete=models.CASCADE,
+        related_name='arquivos',
+        verbose_name="Job"
+    )
+
+    nome = models.CharField(max_length=255, verbose_name="Nome do arquivo")
+    caminho_spool = models.CharField(max_length=500)
+    tamanho = models.BigIntegerField(default=0)
+    bytes_enviados = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=UploadJob.STATUS_CHOICES, default=UploadJob.STATUS_PENDENTE)
+    erro = models.TextField(null=True, blank=True)
+
+    # Registro criado ao final do upload
+    arquivo_pdf = models.ForeignKey(
+        'formsProducao.ArquivoPDF',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+
+    # Campos de controle temporal
+    criado_em = models.DateTimeField(default=timezone.now)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Arquivo do job de upload"
+        verbose_name_plural = "Arquivos do job de upload"
+        ordering = ['id']
+
+    @property
+    def progresso(self):
+        """Percentual enviado do arquivo (0 a 100)"""
+        if self.status == UploadJob.STATUS_CONCLUIDO:
+            return 100
+        if not self.tamanho:
+            return 0
+        return min(100, int(self.bytes_enviados * 100 / self.tamanho))
+
+    def __str__(self):
+        return f"{self.nome} - {self.get_status_display()} ({self.progresso}%)"
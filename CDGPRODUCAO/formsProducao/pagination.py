@@ -0,0 +1,86 @@
+import base64
+import binascii
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class FormularioCursorPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) dos formulários em (criado_em, id), do mais
+    recente para o mais antigo.
+
+    Cada página é buscada a partir do último registro da página anterior, então o
+    custo não cresce com o número da página e registros novos não deslocam as páginas.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def codificar_cursor(formulario):
+        """Codifica a posição (criado_em, id) de um formulário como cursor opaco."""
+        posicao = f"{formulario.criado_em.isoformat()}|{formulario.id}"
+        return base64.urlsafe_b64encode(posicao.encode()).decode()
+
+    @staticmethod
+    def decodificar_cursor(cursor):
+        """Decodifica um cursor em (criado_em, id)."""
+        try:
+            criado_em, id_formulario = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            criado_em = parse_datetime(criado_em)
+            id_formulario = int(id_formulario)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Cursor inválido")
+        if criado_em is None:
+            raise NotFound("Cursor inválido")
+        return criado_em, id_formulario
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by('-criado_em', '-id')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            criado_em, id_formulario = self.decodificar_cursor(cursor)
+            queryset = queryset.filter(
+                Q(criado_em__lt=criado_em) | Q(criado_em=criado_em, id__lt=id_formulario)
+            )
+
+        # Busca um registro a mais para saber se existe uma próxima página
+        formularios = list(queryset[:page_size + 1])
+        tem_proxima = len(formularios) > page_size
+        formularios = formularios[:page_size]
+
+        self.proximo_cursor = self.codificar_cursor(formularios[-1]) if tem_proxima else None
+        return formularios
+
+    def get_next_link(self):
+        if not self.proximo_cursor:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.proximo_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data
+        })
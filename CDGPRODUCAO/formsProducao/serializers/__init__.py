@@ -4,4 +4,5 @@ from .pensi_serializers import PensiSerializer
 from .elite_serializers import EliteSerializer
 from .coleguium_serializers import coleguiumSerializer
 from .unidade_serializers import UnidadeSerializer, UnidadeCreateSerializer
-from .arquivopdf_serializers import ArquivoPDFSerializer, ArquivoPDFCreateSerializer
\ No newline at end of file
+from .arquivopdf_serializers import ArquivoPDFSerializer, ArquivoPDFCreateSerializer
+from .upload_job_serializers import UploadJobSerializer, UploadJobArquivoSerializer
\ No newline at end of file
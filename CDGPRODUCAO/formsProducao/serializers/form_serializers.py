@@ -1,7 +1,7 @@
 from rest_framework import serializers
 import json
 import logging
-import logging
+from django.db.models import Prefetch
 from formsProducao.models.formulario import Formulario
 from formsProducao.models.unidade import Unidade
 from formsProducao.models.arquivopdf import ArquivoPDF
@@ -32,14 +32,26 @@ class FormularioBaseSerializer(serializers.ModelSerializer):
         write_only=True
     )
     usuario_info = UserBasicInfoSerializer(source='usuario', read_only=True)
-    unidades = UnidadeCreateSerializer(many=True, required=False)
-    unidades_info = UnidadeSerializer(source='unidades', many=True, read_only=True)
+    # Na leitura, as unidades são serializadas com o UnidadeSerializer em to_representation
+    unidades = UnidadeCreateSerializer(many=True, required=False, write_only=True)
     arquivos_pdf = ArquivoPDFSerializer(many=True, read_only=True)
     
     class Meta:
         model = Formulario
         fields = '__all__'
-        read_only_fields = ('cod_op', 'criado_em', 'atualizado_em', 'usuario_info', 'arquivos_pdf')
+        read_only_fields = ('cod_op', 'tipo', 'criado_em', 'atualizado_em', 'usuario_info', 'arquivos_pdf')
+    
+    @staticmethod
+    def preparar_queryset(queryset):
+        """
+        Carrega antecipadamente os relacionamentos usados na serialização
+        (usuário, unidades e arquivos PDF), para que a listagem faça um número
+        constante de consultas independentemente da quantidade de formulários.
+        """
+        return queryset.select_related('usuario').prefetch_related(
+            Prefetch('unidades', queryset=Unidade.objects.order_by('nome')),
+            Prefetch('arquivos_pdf', queryset=ArquivoPDF.objects.order_by('-criado_em')),
+        )
     def to_internal_value(self, data):
         """
         Pré-processamento dos dados antes da validação.
@@ -171,14 +183,13 @@ class FormularioBaseSerializer(serializers.ModelSerializer):
         return instance
     def to_representation(self, instance):
         """
-        Customiza a representação para incluir as unidades e arquivos PDF
+        Customiza a representação para incluir as unidades com o nome legível.
+        Os arquivos PDF já vêm do campo arquivos_pdf; com preparar_queryset, ambos
+        são lidos do cache de prefetch, sem novas consultas.
         """
         representation = super().to_representation(instance)
         
         # Adiciona as unidades
         representation['unidades'] = UnidadeSerializer(instance.unidades.all(), many=True).data
         
-        # Adiciona os arquivos PDF
-        representation['arquivos_pdf'] = ArquivoPDFSerializer(instance.arquivos_pdf.all(), many=True).data
-        
         return representation
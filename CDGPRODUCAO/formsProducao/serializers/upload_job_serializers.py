@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from formsProducao.models.upload_job import UploadJob, UploadJobArquivo
+
+
+class UploadJobArquivoSerializer(serializers.ModelSerializer):
+    """
+    Serializer para o progresso de cada arquivo de um job de upload.
+    """
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progresso = serializers.IntegerField(read_only=True)
+    web_view_link = serializers.URLField(source='arquivo_pdf.web_view_link', read_only=True, default=None)
+    
+    class Meta:
+        model = UploadJobArquivo
+        fields = ('id', 'nome', 'status', 'status_display', 'tamanho', 'bytes_enviados',
+                  'progresso', 'erro', 'arquivo_pdf', 'web_view_link', 'atualizado_em')
+        read_only_fields = fields
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer para o status de um job de upload assíncrono.
+    """
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    arquivos = UploadJobArquivoSerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = UploadJob
+        fields = ('id', 'tipo', 'status', 'status_display', 'tentativas', 'erro',
+                  'criado_em', 'iniciado_em', 'concluido_em', 'arquivos')
+        read_only_fields = fields
@@ -3,4 +3,7 @@ from .google_drive_service import BaseFormularioGoogleDriveService
 from .zerohum_service import ZeroHumService
 from .pensi_service import PensiService
 from .elite_service import EliteService
-from .coleguium_service import coleguiumService
\ No newline at end of file
+from .coleguium_service import coleguiumService
+from .upload_job_service import UploadJobService
+from .formulario_cache_service import FormularioCacheService
+from .exportacao_service import ExportacaoFormulariosService
\ No newline at end of file
@@ -0,0 +1,58 @@
+import logging
+from django.conf import settings
+from django.db.models import Prefetch
+from formsProducao.models.unidade import Unidade
+
+logger = logging.getLogger(__name__)
+
+
+class ExportacaoFormulariosService:
+    """
+    Exportação de formulários em CSV ou NDJSON (config/exportacao.py).
+
+    Os formulários são lidos com iterator(chunk_size=EXPORTACAO_TAMANHO_LOTE),
+    com o usuário no join e as unidades em uma consulta de prefetch por lote, sem
+    carregar a exportação inteira em memória.
+
+    No CSV as unidades vêm resumidas em uma coluna ("Nome: quantidade; ..."); no
+    NDJSON, como lista.
+    """
+    COLUNAS = (
+        'id', 'cod_op', 'tipo', 'titulo', 'nome', 'email', 'usuario', 'data_entrega',
+        'formato', 'cor_impressao', 'impressao', 'gramatura', 'papel_adesivo', 'tipo_adesivo',
+        'grampos', 'espiral', 'capa_pvc', 'observacoes', 'unidades', 'quantidade_total',
+        'criado_em', 'atualizado_em',
+    )
+
+    @staticmethod
+    def ordenar(queryset):
+        """Ordem da exportação: a da listagem, dos mais recentes para os mais antigos."""
+        return queryset.order_by('-criado_em', '-id')
+
+    @classmethod
+    def registro(cls, formulario, formato_csv=False):
+        """Dict exportado de um formulário (com o usuário e as unidades pré-carregados)."""
+        registro = {coluna: getattr(formulario, coluna, None) for coluna in cls.COLUNAS}
+        unidades = [
+            {'nome': unidade.get_nome_display(), 'quantidade': unidade.quantidade}
+            for unidade in formulario.unidades.all()
+        ]
+        registro['usuario'] = formulario.usuario.get_username() if formulario.usuario else None
+        registro['quantidade_total'] = sum(unidade['quantidade'] for unidade in unidades)
+        if formato_csv:
+            registro['unidades'] = '; '.join(f"{unidade['nome']}: {unidade['quantidade']}" for unidade in unidades)
+        else:
+            registro['unidades'] = unidades
+        return registro
+
+    @classmethod
+    def registros(cls, queryset, formato_csv=False, tamanho_lote=None):
+        """
+        Percorre os formulários do queryset em lotes, gerando um registro por formulário.
+        """
+        tamanho_lote = tamanho_lote or settings.EXPORTACAO_TAMANHO_LOTE
+        queryset = queryset.select_related('usuario').prefetch_related(
+            Prefetch('unidades', queryset=Unidade.objects.order_by('nome'))
+        )
+        for formulario in queryset.iterator(chunk_size=tamanho_lote):
+            yield cls.registro(formulario, formato_csv)
@@ -1,12 +1,13 @@
 # filepath: c:\Users\Arthur Reis\Documents\PROJETOCASADAGRAFICA\CDGPRODUCAOBACK\CDGPRODUCAO\formsProducao\services\form_services.py
 import os
-import uuid
 import json
 import logging
 from django.utils import timezone
 from django.conf import settings
 from formsProducao.utils.drive import GoogleDriveService
 from formsProducao.models.formulario import Formulario
+from formsProducao.models.sequencia_cod_op import SequenciaCodOp
+from formsProducao.services.formulario_cache_service import FormularioCacheService
 
 logger = logging.getLogger(__name__)
 
@@ -16,14 +17,27 @@ class FormularioService:
     Fornece métodos comuns para todos os tipos de formulários.
     """
     
+    @staticmethod
+    def alocar_cod_op(prefixo):
+        """
+        Aloca um código de operação único com o prefixo informado.
+        
+        Formato: prefixo + ano + mês + dia + número sequencial do dia (4 dígitos,
+        ex: ZH202601150001), alocado atomicamente pela SequenciaCodOp.
+        """
+        hoje = timezone.now().date()
+        while True:
+            numero = SequenciaCodOp.proximo_numero(prefixo, hoje)
+            cod_op = f"{prefixo}{hoje.strftime('%Y%m%d')}{numero:04d}"
+            # Códigos antigos (aleatórios) ou criados manualmente podem já ocupar o número
+            if not Formulario.objects.filter(cod_op=cod_op).exists():
+                return cod_op
+            logger.warning(f"Código de operação {cod_op} já existe, alocando o próximo")
+    
     @staticmethod
     def gerar_cod_op():
         """Gera um código de operação único para cada formulário."""
-        # Formato: ZH + ano + mês + dia + 4 dígitos aleatórios
-        agora = timezone.now()
-        prefixo = agora.strftime('%Y%m%d')
-        aleatorio = str(uuid.uuid4().int)[:4]
-        return f"ZH{prefixo}{aleatorio}"
+        return FormularioService.alocar_cod_op('ZH')
     
     @staticmethod
     def salvar_pdf_local(conteudo_pdf, nome_arquivo):
@@ -85,6 +99,9 @@ class FormularioService:
             # Salva as alterações
             formulario.save()
             
+            # A representação em cache do formulário ficou desatualizada
+            FormularioCacheService.invalidar(formulario.cod_op)
+            
             return formulario
             
         except Exception as e:
@@ -0,0 +1,83 @@
+import logging
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class FormularioCacheService:
+    """
+    Cache da representação serializada dos formulários, por cod_op.
+
+    Usado pela consulta de um formulário específico (GET /<tipo>/<cod_op>/), que é
+    chamada repetidamente pelas telas da produção. A entrada é removida sempre que
+    o formulário, as suas unidades ou os seus arquivos PDF mudam pelos serviços.
+
+    Cada entrada guarda também a versão (o ETag calculado do atualizado_em) com que
+    foi gerada; uma entrada de outra versão é descartada na leitura. Assim, uma
+    alteração feita fora dos serviços (admin, save() direto) não devolve o corpo
+    antigo junto com o ETag novo.
+
+    Os contadores de acertos e falhas ficam no próprio cache, então são
+    compartilhados entre os processos quando o backend também é (file ou redis).
+    """
+    PREFIXO_CHAVE = 'formulario:v2'
+    CHAVE_ACERTOS = 'formulario:cache:acertos'
+    CHAVE_FALHAS = 'formulario:cache:falhas'
+
+    @classmethod
+    def chave(cls, cod_op):
+        return f"{cls.PREFIXO_CHAVE}:{cod_op}"
+
+    @staticmethod
+    def _incrementar(chave):
+        try:
+            # add só cria o contador se ele ainda não existir; os contadores não expiram
+            cache.add(chave, 0, timeout=None)
+            cache.incr(chave)
+        except ValueError:
+            # O contador foi removido do cache entre o add e o incr
+            cache.set(chave, 1, timeout=None)
+
+    @classmethod
+    def obter(cls, cod_op, versao):
+        """
+        Retorna a representação em cache do formulário, ou None se não estiver no
+        cache ou se tiver sido gerada para outra versão.
+        """
+        entrada = cache.get(cls.chave(cod_op))
+        dados = None
+        if entrada is not None and entrada.get('versao') == versao:
+            dados = entrada['dados']
+        cls._incrementar(cls.CHAVE_ACERTOS if dados is not None else cls.CHAVE_FALHAS)
+        return dados
+
+    @classmethod
+    def salvar(cls, cod_op, versao, dados):
+        """Guarda a representação serializada do formulário com a versão usada para gerá-la."""
+        cache.set(
+            cls.chave(cod_op),
+            {'versao': versao, 'dados': dados},
+            timeout=settings.FORMULARIO_CACHE_TIMEOUT
+        )
+
+    @classmethod
+    def invalidar(cls, cod_op):
+        """Remove o formulário do cache (chamado após qualquer alteração)."""
+        if not cod_op:
+            return
+        cache.delete(cls.chave(cod_op))
+        logger.debug(f"Cache do formulário {cod_op} invalidado")
+
+    @classmethod
+    def estatisticas(cls):
+        """Contadores de acertos e falhas do cache de formulários."""
+        acertos = cache.get(cls.CHAVE_ACERTOS, 0)
+        falhas = cache.get(cls.CHAVE_FALHAS, 0)
+        total = acertos + falhas
+        return {
+            'backend': settings.CACHE_BACKEND,
+            'acertos': acertos,
+            'falhas': falhas,
+            'taxa_acertos': round(acertos / total, 4) if total else None,
+        }
@@ -1,14 +1,21 @@
 import os
-import uuid
 import json
+import shutil
+import time
 import logging
+import threading
 import traceback
+from datetime import datetime, time as datetime_time, timedelta
+from django.db import transaction, IntegrityError
 from django.utils import timezone
 from django.conf import settings
 from formsProducao.utils.drive import GoogleDriveService
+from formsProducao.utils.upload_paralelo import executar_em_paralelo, servico_drive_da_thread
 from formsProducao.models.formulario import Formulario
 from formsProducao.models.arquivopdf import ArquivoPDF
+from formsProducao.models.pasta_drive import PastaDrive
 from formsProducao.services.form_services import FormularioService
+from formsProducao.services.formulario_cache_service import FormularioCacheService
 
 logger = logging.getLogger(__name__)
 
@@ -16,60 +23,415 @@ class BaseFormularioGoogleDriveService(FormularioService):
     """
     Classe base para serviços de formulário que usam o Google Drive
     """
-    # ID da pasta do Google Drive para armazenar os formulários
+    # Nome da pasta do Google Drive para armazenar os formulários
     # Isso deve ser sobrescrito nas classes filhas
-    PASTA_ID = None
     PASTA_NOME = None
     PREFIXO_COD_OP = None  # Deve ser sobrescrito (ex: 'ZH', 'PS', etc.)
+    TIPO_FORMULARIO = None  # Deve ser sobrescrito (ex: 'zerohum', 'pensi', etc.)
+    
+    # Cache do processo com os IDs das pastas do Drive (tipo -> pasta_id), lidos do PastaDrive
+    _pastas_cache = {}
+    _pastas_lock = threading.Lock()
+    
+    # Segundos após os quais a criação de pasta iniciada por outro processo é
+    # considerada abandonada e pode ser assumida
+    TEMPO_LIMITE_CRIACAO_PASTA = 60
     
     @classmethod
     def gerar_cod_op(cls):
         """Gera um código de operação único para cada formulário."""
-        # Formato: Prefixo + ano + mês + dia + 4 dígitos aleatórios
-        agora = timezone.now()
-        prefixo = agora.strftime('%Y%m%d')
-        aleatorio = str(uuid.uuid4().int)[:4]
-        return f"{cls.PREFIXO_COD_OP}{prefixo}{aleatorio}"
+        return cls.alocar_cod_op(cls.PREFIXO_COD_OP)
+    
+    @classmethod
+    def obter_pasta_id(cls):
+        """
+        Retorna o ID da pasta do Google Drive do formulário.
+        
+        Consulta o cache do processo e depois o registro PastaDrive; o Drive só é
+        consultado se a pasta ainda não estiver registrada.
+        
+        Returns:
+            str: ID da pasta, ou None se não foi possível configurá-la
+        """
+        pasta_id = cls._pastas_cache.get(cls.TIPO_FORMULARIO)
+        if pasta_id:
+            return pasta_id
+        
+        pasta_id = PastaDrive.objects.filter(
+            tipo=cls.TIPO_FORMULARIO
+        ).exclude(pasta_id='').values_list('pasta_id', flat=True).first()
+        if pasta_id:
+            cls._pastas_cache[cls.TIPO_FORMULARIO] = pasta_id
+            return pasta_id
+        
+        return cls.setup_pasta_drive()
     
     @classmethod
     def setup_pasta_drive(cls):
         """
-        Configura a pasta do Google Drive para o formulário se ainda não existir.
-        Deve ser chamado na inicialização do aplicativo.
+        Configura a pasta do Google Drive para o formulário se ainda não existir
+        e grava o ID no registro PastaDrive.
+        
+        Apenas um processo procura/cria a pasta no Drive: ele reserva o registro do
+        tipo no banco (o tipo é único) e os demais aguardam o ID ser preenchido, o que
+        evita pastas duplicadas quando vários workers iniciam ao mesmo tempo.
+        
+        Returns:
+            str: ID da pasta, ou None se não foi possível configurá-la
         """
-        try:
-            # Inicializa o serviço do Google Drive
-            drive_service = GoogleDriveService()
-            
-            # Verifica se já temos o ID da pasta
-            if cls.PASTA_ID is not None:
-                logger.info(f"Pasta {cls.PASTA_NOME} já configurada com ID: {cls.PASTA_ID}")
-                return cls.PASTA_ID
-                
-            # Verifica se já existe uma pasta com o nome especificado
-            pastas = drive_service.get_folders()
-            for pasta in pastas:
-                if pasta.get('name') == cls.PASTA_NOME:
-                    cls.PASTA_ID = pasta.get('id')
-                    logger.info(f"Pasta {cls.PASTA_NOME} encontrada com ID: {cls.PASTA_ID}")
-                    return cls.PASTA_ID
+        with cls._pastas_lock:
+            try:
+                registro, reservado = cls._reservar_registro_pasta()
+                if not reservado:
+                    logger.info(f"Pasta {cls.PASTA_NOME} já configurada com ID: {registro.pasta_id}")
+                    cls._pastas_cache[cls.TIPO_FORMULARIO] = registro.pasta_id
+                    return registro.pasta_id
                 
-            # Se não encontrou a pasta, cria uma nova
-            logger.info(f"Pasta {cls.PASTA_NOME} não encontrada. Criando nova pasta...")
-            cls.PASTA_ID = drive_service.create_folder(cls.PASTA_NOME)
-            
-            if cls.PASTA_ID:
-                logger.info(f"Pasta {cls.PASTA_NOME} criada com sucesso. ID: {cls.PASTA_ID}")
-            else:
-                logger.error(f"Falha ao criar pasta {cls.PASTA_NOME} no Google Drive.")
+                try:
+                    pasta_id = cls._buscar_ou_criar_pasta_drive()
+                except Exception:
+                    # Libera o registro para que outro processo possa tentar de novo
+                    PastaDrive.objects.filter(pk=registro.pk, pasta_id='').delete()
+                    raise
                 
-            return cls.PASTA_ID
+                PastaDrive.objects.filter(pk=registro.pk).update(
+                    pasta_id=pasta_id,
+                    nome=cls.PASTA_NOME,
+                    atualizado_em=timezone.now()
+                )
+                cls._pastas_cache[cls.TIPO_FORMULARIO] = pasta_id
+                return pasta_id
                 
+            except Exception as e:
+                logger.error(f"Erro ao configurar pasta {cls.PASTA_NOME} no Google Drive: {str(e)}")
+                logger.error(traceback.format_exc())
+                return None
+    
+    @classmethod
+    def _reservar_registro_pasta(cls):
+        """
+        Obtém o registro PastaDrive do tipo, reservando-o se ainda não existir.
+        
+        Returns:
+            tuple: (registro, reservado). Se reservado for True, este processo deve
+                   procurar/criar a pasta no Drive e preencher o registro.
+        """
+        while True:
+            try:
+                with transaction.atomic():
+                    registro = PastaDrive.objects.create(tipo=cls.TIPO_FORMULARIO, nome=cls.PASTA_NOME)
+                return registro, True
+            except IntegrityError:
+                registro = PastaDrive.objects.get(tipo=cls.TIPO_FORMULARIO)
+            
+            if registro.pasta_id:
+                return registro, False
+            
+            # Outro processo está criando a pasta; se ele abandonou a criação, assume no lugar dele
+            limite = timezone.now() - timedelta(seconds=cls.TEMPO_LIMITE_CRIACAO_PASTA)
+            if registro.atualizado_em < limite:
+                assumido = PastaDrive.objects.filter(
+                    pk=registro.pk,
+                    pasta_id='',
+                    atualizado_em=registro.atualizado_em
+                ).update(atualizado_em=timezone.now())
+                if assumido:
+                    return registro, True
+            
+            time.sleep(0.5)
+    
+    @classmethod
+    def _buscar_ou_criar_pasta_drive(cls):
+        """
+        Procura a pasta do formulário no Google Drive pelo nome e a cria se não existir.
+        
+        Returns:
+            str: ID da pasta no Drive
+        """
+        drive_service = GoogleDriveService()
+        if not drive_service.service:
+            raise ValueError("Não foi possível inicializar o serviço do Google Drive.")
+        
+        # Procurar pela pasta usando o nome
+        query = f"name = '{cls.PASTA_NOME}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+        results = drive_service.service.files().list(
+            q=query,
+            spaces='drive',
+            fields='files(id, name)',
+            supportsAllDrives=True
+        ).execute()
+        
+        folders = results.get('files', [])
+        
+        if folders:
+            # Usa a primeira pasta encontrada
+            pasta_id = folders[0]['id']
+            logger.info(f"Pasta {cls.PASTA_NOME} encontrada no Drive. ID: {pasta_id}")
+            return pasta_id
+        
+        # Cria a pasta se não existir
+        folder_metadata = {
+            'name': cls.PASTA_NOME,
+            'mimeType': 'application/vnd.google-apps.folder'
+        }
+        
+        folder = drive_service.service.files().create(
+            body=folder_metadata,
+            fields='id',
+            supportsAllDrives=True
+        ).execute()
+        
+        pasta_id = folder.get('id')
+        logger.info(f"Pasta {cls.PASTA_NOME} criada no Drive. ID: {pasta_id}")
+        
+        # Configurar permissões da pasta
+        permissions = [
+            {'type': 'anyone', 'role': 'reader'},  # Acesso público para leitura
+            {
+                'type': 'user',
+                'role': 'writer',
+                'emailAddress': 'arthur.casadagrafica@gmail.com'
+            }  # Acesso de edição para o email específico
+        ]
+        
+        for permission in permissions:
+            drive_service.service.permissions().create(
+                fileId=pasta_id,
+                body=permission,
+                fields='id',
+                sendNotificationEmail=False
+            ).execute()
+        
+        return pasta_id
+    
+    @classmethod
+    def listar_formularios(cls, filtros=None):
+        """
+        Lista os formulários deste tipo com filtros opcionais.
+        
+        Args:
+            filtros (dict, optional): Datas (date) de 'data_inicio'/'data_fim' (criação)
+                                      e 'entrega_inicio'/'entrega_fim' (data de entrega)
+            
+        Returns:
+            QuerySet: Formulários do tipo do serviço
+        """
+        queryset = Formulario.objects.filter(tipo=cls.TIPO_FORMULARIO)
+        
+        if filtros:
+            # Filtros de criação comparam criado_em diretamente (sem extrair a data),
+            # para aproveitar o índice (tipo, criado_em, id)
+            if filtros.get('data_inicio'):
+                inicio = timezone.make_aware(datetime.combine(filtros['data_inicio'], datetime_time.min))
+                queryset = queryset.filter(criado_em__gte=inicio)
+            
+            if filtros.get('data_fim'):
+                fim = timezone.make_aware(datetime.combine(filtros['data_fim'] + timedelta(days=1), datetime_time.min))
+                queryset = queryset.filter(criado_em__lt=fim)
+            
+            if filtros.get('entrega_inicio'):
+                queryset = queryset.filter(data_entrega__gte=filtros['entrega_inicio'])
+            
+            if filtros.get('entrega_fim'):
+                queryset = queryset.filter(data_entrega__lte=filtros['entrega_fim'])
+        
+        return queryset
+    
+    @classmethod
+    def criar_formulario(cls, dados_form, usuario=None):
+        """
+        Cria o formulário e suas unidades no banco de dados, sem tratar os PDFs.
+        
+        Args:
+            dados_form (dict): Dados do formulário validados
+            usuario (User, optional): Usuário logado que está enviando o formulário
+            
+        Returns:
+            Formulario: Objeto do formulário criado
+        """
+        # Gera um código de operação único
+        cod_op = cls.gerar_cod_op()
+        
+        # Extrair as unidades dos dados do formulário
+        unidades_data = dados_form.pop('unidades', [])
+        logger.info(f"Tipo de unidades_data: {type(unidades_data)}")
+        logger.info(f"Unidades recebidas: {unidades_data}")
+        
+        # Se não houver unidades, verificar se foi um erro de processamento
+        if not unidades_data:
+            logger.warning("Nenhuma unidade recebida no formulário")
+        
+        # Dados do formulário para salvar
+        form_data = {
+            **dados_form,
+            'cod_op': cod_op,
+            'tipo': cls.TIPO_FORMULARIO
+        }
+        
+        # Se o usuário estiver autenticado, vincula o formulário a ele
+        if usuario and usuario.is_authenticated:
+            form_data['usuario'] = usuario
+        
+        # Salva o formulário no banco de dados
+        formulario = Formulario.objects.create(**form_data)
+        logger.info(f"Formulário {cod_op} criado com sucesso")
+        
+        # Cria as unidades relacionadas ao formulário
+        for unidade_data in unidades_data:
+            if isinstance(unidade_data, dict):
+                unidade = {
+                    'formulario': formulario,
+                    'nome': unidade_data.get('nome'),
+                    'quantidade': unidade_data.get('quantidade', 1)
+                }
+                formulario.unidades.create(**unidade)
+        
+        return formulario
+    
+    @classmethod
+    def processar_formulario_assincrono(cls, dados_form, arquivos_pdf=None, usuario=None):
+        """
+        Salva o formulário e as unidades e coloca os PDFs em um job de upload,
+        sem enviar nada para o Google Drive durante a requisição.
+        
+        Os arquivos são copiados para o spool local antes da transação e enviados
+        depois pelo comando `processar_uploads`; a transação (que aloca o cod_op)
+        só faz as inserções no banco.
+        
+        Args:
+            dados_form (dict): Dados do formulário validados
+            arquivos_pdf (list, optional): Lista de tuplas com (arquivo, nome_arquivo)
+            usuario (User, optional): Usuário logado que está enviando o formulário
+            
+        Returns:
+            tuple: (Formulario, UploadJob)
+        """
+        from formsProducao.services.upload_job_service import UploadJobService
+        
+        try:
+            arquivos_spool = UploadJobService.gravar_spool(arquivos_pdf or [])
+            try:
+                with transaction.atomic():
+                    formulario = cls.criar_formulario(dados_form, usuario)
+                    job = UploadJobService.enfileirar(formulario, cls.TIPO_FORMULARIO, arquivos_spool)
+            except Exception:
+                # A transação foi desfeita; os arquivos do spool não pertencem a nenhum job
+                UploadJobService.remover_spool(arquivos_spool)
+                raise
+            
+            logger.info(f"Formulário {formulario.cod_op} salvo. Uploads enfileirados no job {job.id}")
+            return formulario, job
+            
         except Exception as e:
-            logger.error(f"Erro ao configurar pasta {cls.PASTA_NOME} no Google Drive: {str(e)}")
-            import traceback
+            logger.error(f"Erro ao processar formulário assíncrono: {str(e)}")
             logger.error(traceback.format_exc())
-            return None
+            raise
+    
+    @classmethod
+    def enviar_arquivo_spool(cls, formulario, caminho_arquivo, nome_arquivo, progresso_callback=None):
+        """
+        Envia um PDF já salvo em disco (spool de um job de upload) e cria o ArquivoPDF.
+        
+        Em desenvolvimento local, sem credenciais do Google Drive, o arquivo é
+        movido para a pasta de mídia.
+        
+        Args:
+            formulario (Formulario): Formulário dono do arquivo
+            caminho_arquivo (str): Caminho do arquivo no spool
+            nome_arquivo (str): Nome informado para o arquivo
+            progresso_callback (callable, optional): Recebe (bytes_enviados, tamanho_total)
+            
+        Returns:
+            ArquivoPDF: Registro criado para o arquivo
+        """
+        existe_arquivo_credenciais = os.path.exists(os.path.join(settings.BASE_DIR, 'credentials', 'google_drive_credentials.json'))
+        existe_env_credenciais = bool(os.environ.get("GOOGLE_PRIVATE_KEY") and os.environ.get("GOOGLE_CLIENT_EMAIL"))
+        desenvolvimento_local = not (existe_arquivo_credenciais or existe_env_credenciais)
+        
+        nome_drive = f"{formulario.cod_op}_{nome_arquivo}"
+        
+        if desenvolvimento_local:
+            # Move o arquivo para a pasta de mídia durante o desenvolvimento
+            media_dir = os.path.join(settings.MEDIA_ROOT, 'pdfs')
+            os.makedirs(media_dir, exist_ok=True)
+            shutil.move(caminho_arquivo, os.path.join(media_dir, nome_drive))
+            
+            if progresso_callback:
+                tamanho = os.path.getsize(os.path.join(media_dir, nome_drive))
+                progresso_callback(tamanho, tamanho)
+            
+            arquivo_pdf = ArquivoPDF.objects.create(
+                formulario=formulario,
+                nome=nome_arquivo,
+                arquivo=f"pdfs/{nome_drive}",
+                link_download=f"{settings.MEDIA_URL}pdfs/{nome_drive}"
+            )
+            logger.info(f"Arquivo PDF salvo localmente: {nome_drive}")
+            return arquivo_pdf
+        
+        # Garante que a pasta de destino existe
+        pasta_id = cls.obter_pasta_id()
+        if not pasta_id:
+            raise ValueError("Não foi possível criar ou encontrar a pasta no Google Drive")
+        
+        drive_service = GoogleDriveService()
+        upload_result = drive_service.upload_pdf(
+            caminho_arquivo,
+            nome_drive,
+            pasta_id,
+            progresso_callback=progresso_callback
+        )
+        
+        if not upload_result or 'id' not in upload_result:
+            raise ValueError(f"Falha no upload do arquivo '{nome_arquivo}' para o Google Drive")
+        
+        arquivo_pdf = ArquivoPDF.objects.create(
+            formulario=formulario,
+            nome=nome_arquivo,
+            link_download=upload_result.get('webContentLink', ''),
+            web_view_link=upload_result.get('webViewLink', ''),
+            json_link=json.dumps(upload_result)
+        )
+        logger.info(f"Arquivo PDF enviado para o Google Drive: {upload_result.get('webViewLink', '')}")
+        
+        # O arquivo do spool não é mais necessário
+        try:
+            os.remove(caminho_arquivo)
+        except Exception as e:
+            logger.warning(f"Não foi possível remover o arquivo do spool: {e}")
+        
+        return arquivo_pdf
+    
+    @classmethod
+    def enviar_arquivos_drive(cls, arquivos, interromper_em_falha=True):
+        """
+        Envia vários PDFs para a pasta do formulário no Google Drive em paralelo.
+        
+        Os uploads (e as permissões de cada arquivo) rodam no pool de upload do
+        processo, limitados por DRIVE_UPLOAD_MAX_CONCORRENCIA_REQUISICAO. Nenhum
+        registro é gravado no banco aqui; isso fica a cargo de quem chama.
+        
+        Args:
+            arquivos (list): Lista de tuplas com (arquivo, nome_no_drive)
+            interromper_em_falha (bool): Se True, não inicia novos uploads após uma falha
+            
+        Returns:
+            list: Tuplas (upload_result, erro) na mesma ordem dos arquivos
+        """
+        # Garante que a pasta de destino existe antes de disparar os uploads
+        pasta_id = cls.obter_pasta_id()
+        if not pasta_id:
+            raise ValueError("Não foi possível criar ou encontrar a pasta no Google Drive")
+        
+        def enviar(item):
+            arquivo, nome_drive = item
+            # O arquivo recebido é enviado direto para o Drive, sem cópia em disco
+            upload_result = servico_drive_da_thread().upload_pdf(arquivo, nome_drive, pasta_id)
+            if not upload_result or 'id' not in upload_result:
+                raise ValueError(f"Falha no upload do arquivo '{nome_drive}' para o Google Drive")
+            return upload_result
+        
+        return executar_em_paralelo(enviar, arquivos, interromper_em_falha=interromper_em_falha)
     
     @classmethod
     def processar_formulario(cls, dados_form, arquivos_pdf=None, usuario=None):
@@ -95,53 +457,22 @@ class BaseFormularioGoogleDriveService(FormularioService):
             desenvolvimento_local = not (existe_arquivo_credenciais or existe_env_credenciais)
             logger.info(f"Modo de desenvolvimento local: {desenvolvimento_local}")
             
-            # Gera um código de operação único
-            cod_op = cls.gerar_cod_op()
-            
-            # Extrair as unidades dos dados do formulário
-            unidades_data = dados_form.pop('unidades', [])
-            logger.info(f"Tipo de unidades_data: {type(unidades_data)}")
-            logger.info(f"Unidades recebidas: {unidades_data}")
-            
-            # Se não houver unidades, verificar se foi um erro de processamento
-            if not unidades_data:
-                logger.warning("Nenhuma unidade recebida no formulário")
-            
-            # Dados do formulário para salvar
-            form_data = {
-                **dados_form,
-                'cod_op': cod_op
-            }
-            
-            # Se o usuário estiver autenticado, vincula o formulário a ele
-            if usuario and usuario.is_authenticated:
-                form_data['usuario'] = usuario
-            
-            # Salva o formulário no banco de dados
-            formulario = Formulario.objects.create(**form_data)
-            logger.info(f"Formulário {cod_op} criado com sucesso")
-            
-            # Cria as unidades relacionadas ao formulário
-            for unidade_data in unidades_data:
-                if isinstance(unidade_data, dict):
-                    unidade = {
-                        'formulario': formulario,
-                        'nome': unidade_data.get('nome'),
-                        'quantidade': unidade_data.get('quantidade', 1)
-                    }
-                    formulario.unidades.create(**unidade)
+            # Salva o formulário e as unidades no banco de dados
+            formulario = cls.criar_formulario(dados_form, usuario)
+            cod_op = formulario.cod_op
             
             # Processa os arquivos PDF
             if arquivos_pdf:
-                # Se tiver arquivos PDF para processar
+                arquivos_validos = []
                 for arquivo, nome_arquivo in arquivos_pdf:
                     if not arquivo:
                         logger.warning(f"Arquivo PDF vazio ou inválido para {nome_arquivo}")
                         continue
-                        
-                    # Processa o upload do arquivo para o Drive ou salva localmente
-                    if desenvolvimento_local:
-                        # Salva localmente durante o desenvolvimento
+                    arquivos_validos.append((arquivo, nome_arquivo))
+                
+                if desenvolvimento_local:
+                    # Salva localmente durante o desenvolvimento
+                    for arquivo, nome_arquivo in arquivos_validos:
                         caminho_local = cls.salvar_pdf_local(arquivo, f"{cls.PASTA_NOME}_{cod_op}.pdf")
                         
                         # Cria registro do ArquivoPDF
@@ -151,41 +482,27 @@ class BaseFormularioGoogleDriveService(FormularioService):
                             arquivo=caminho_local
                         )
                         logger.info(f"Arquivo PDF salvo localmente: {caminho_local}")
-                    else:
-                        # Inicializa o serviço do Drive
-                        drive_service = GoogleDriveService()
-                        
-                        # Garante que a pasta de destino existe
-                        if not cls.PASTA_ID:
-                            cls.setup_pasta_drive()
-                        
-                        # Salva o arquivo temporariamente
-                        temp_file_path = cls.salvar_pdf_local(arquivo, f"{cls.PASTA_NOME}_{cod_op}_{nome_arquivo}.pdf")
+                else:
+                    # Faz os uploads para o Google Drive em paralelo
+                    resultados = cls.enviar_arquivos_drive(
+                        [(arquivo, f"{cod_op}_{nome_arquivo}.pdf") for arquivo, nome_arquivo in arquivos_validos],
+                        interromper_em_falha=False
+                    )
+                    
+                    # Cria os registros do ArquivoPDF para os uploads concluídos
+                    for (arquivo, nome_arquivo), (upload_result, erro) in zip(arquivos_validos, resultados):
+                        if erro or not upload_result:
+                            logger.error(f"Erro ao enviar o arquivo PDF '{nome_arquivo}': {erro}")
+                            continue
                         
-                        # Faz upload para o Google Drive
-                        if temp_file_path:
-                            upload_result = drive_service.upload_pdf(
-                                temp_file_path, 
-                                f"{cod_op}_{nome_arquivo}.pdf", 
-                                cls.PASTA_ID
-                            )
-                            
-                            # Cria o registro do ArquivoPDF
-                            if upload_result and 'id' in upload_result:
-                                arquivo_pdf = ArquivoPDF.objects.create(
-                                    formulario=formulario,
-                                    nome=nome_arquivo,
-                                    link_download=upload_result.get('webContentLink', ''),
-                                    web_view_link=upload_result.get('webViewLink', ''),
-                                    json_link=json.dumps(upload_result)
-                                )
-                                logger.info(f"Arquivo PDF enviado para o Google Drive: {upload_result.get('webViewLink', '')}")
-                            
-                            # Apaga o arquivo temporário
-                            try:
-                                os.remove(temp_file_path)
-                            except Exception as e:
-                                logger.warning(f"Não foi possível remover o arquivo temporário: {e}")
+                        arquivo_pdf = ArquivoPDF.objects.create(
+                            formulario=formulario,
+                            nome=nome_arquivo,
+                            link_download=upload_result.get('webContentLink', ''),
+                            web_view_link=upload_result.get('webViewLink', ''),
+                            json_link=json.dumps(upload_result)
+                        )
+                        logger.info(f"Arquivo PDF enviado para o Google Drive: {upload_result.get('webViewLink', '')}")
             
             return formulario
             
@@ -245,14 +562,16 @@ class BaseFormularioGoogleDriveService(FormularioService):
             
             # Processa os novos arquivos PDF se houver
             if arquivos_pdf:
+                arquivos_validos = []
                 for arquivo, nome_arquivo in arquivos_pdf:
                     if not arquivo:
                         logger.warning(f"Arquivo PDF vazio ou inválido para {nome_arquivo}")
                         continue
-                    
-                    # Processa o upload do arquivo para o Drive ou salva localmente
-                    if desenvolvimento_local:
-                        # Salva localmente durante o desenvolvimento
+                    arquivos_validos.append((arquivo, nome_arquivo))
+                
+                if desenvolvimento_local:
+                    # Salva localmente durante o desenvolvimento
+                    for arquivo, nome_arquivo in arquivos_validos:
                         caminho_local = cls.salvar_pdf_local(arquivo, f"{cls.PASTA_NOME}_{formulario.cod_op}_{nome_arquivo}.pdf")
                         
                         # Cria registro do ArquivoPDF
@@ -262,41 +581,30 @@ class BaseFormularioGoogleDriveService(FormularioService):
                             arquivo=caminho_local
                         )
                         logger.info(f"Arquivo PDF salvo localmente: {caminho_local}")
-                    else:
-                        # Inicializa o serviço do Drive
-                        drive_service = GoogleDriveService()
-                        
-                        # Garante que a pasta de destino existe
-                        if not cls.PASTA_ID:
-                            cls.setup_pasta_drive()
-                        
-                        # Salva o arquivo temporariamente
-                        temp_file_path = cls.salvar_pdf_local(arquivo, f"{cls.PASTA_NOME}_{formulario.cod_op}_{nome_arquivo}.pdf")
+                else:
+                    # Faz os uploads para o Google Drive em paralelo
+                    resultados = cls.enviar_arquivos_drive(
+                        [(arquivo, f"{formulario.cod_op}_{nome_arquivo}.pdf") for arquivo, nome_arquivo in arquivos_validos],
+                        interromper_em_falha=False
+                    )
+                    
+                    # Cria os registros do ArquivoPDF para os uploads concluídos
+                    for (arquivo, nome_arquivo), (upload_result, erro) in zip(arquivos_validos, resultados):
+                        if erro or not upload_result:
+                            logger.error(f"Erro ao enviar o arquivo PDF '{nome_arquivo}': {erro}")
+                            continue
                         
-                        # Faz upload para o Google Drive
-                        if temp_file_path:
-                            upload_result = drive_service.upload_pdf(
-                                temp_file_path, 
-                                f"{formulario.cod_op}_{nome_arquivo}.pdf", 
-                                cls.PASTA_ID
-                            )
-                            
-                            # Cria o registro do ArquivoPDF
-                            if upload_result and 'id' in upload_result:
-                                arquivo_pdf = ArquivoPDF.objects.create(
-                                    formulario=formulario,
-                                    nome=nome_arquivo,
-                                    link_download=upload_result.get('webContentLink', ''),
-                                    web_view_link=upload_result.get('webViewLink', ''),
-                                    json_link=json.dumps(upload_result)
-                                )
-                                logger.info(f"Arquivo PDF enviado para o Google Drive: {upload_result.get('webViewLink', '')}")
-                            
-                            # Apaga o arquivo temporário
-                            try:
-                                os.remove(temp_file_path)
-                            except Exception as e:
-                                logger.warning(f"Não foi possível remover o arquivo temporário: {e}")
+                        arquivo_pdf = ArquivoPDF.objects.create(
+                            formulario=formulario,
+                            nome=nome_arquivo,
+                            link_download=upload_result.get('webContentLink', ''),
+                            web_view_link=upload_result.get('webViewLink', ''),
+                            json_link=json.dumps(upload_result)
+                        )
+                        logger.info(f"Arquivo PDF enviado para o Google Drive: {upload_result.get('webViewLink', '')}")
+            
+            # A representação em cache do formulário ficou desatualizada
+            FormularioCacheService.invalidar(formulario.cod_op)
             
             return formulario
             
@@ -13,9 +13,9 @@ class PensiService(BaseFormularioGoogleDriveService):
     """
     Serviço específico para o formulário Pensi
     """
-    PASTA_ID = None
     PASTA_NOME = "Pensi"
     PREFIXO_COD_OP = "PS"
+    TIPO_FORMULARIO = "pensi"
     
     @classmethod
     def processar_formulario(cls, dados_form, arquivo_pdf=None, usuario=None):
@@ -36,7 +36,8 @@ class PensiService(BaseFormularioGoogleDriveService):
             # Dados do formulário para salvar
             form_data = {
                 **dados_form,
-                'cod_op': cod_op
+                'cod_op': cod_op,
+                'tipo': cls.TIPO_FORMULARIO
             }
             
             # Se estivermos em modo de desenvolvimento local
@@ -67,53 +68,45 @@ class PensiService(BaseFormularioGoogleDriveService):
             # Se não estiver em desenvolvimento local, tenta fazer upload para o Google Drive
             if not desenvolvimento_local and arquivo_pdf:
                 try:
-                    # Salva o arquivo temporariamente para fazer o upload
                     nome_arquivo = f"{cls.PASTA_NOME}_{cod_op}.pdf"
-                    caminho_local = cls.salvar_pdf_local(arquivo_pdf, nome_arquivo)
                     
-                    if caminho_local:
-                        # Configura a pasta no Google Drive se necessário
-                        if cls.PASTA_ID is None:
-                            cls.setup_pasta_drive()
-                            
-                        # Faz upload para o Google Drive
-                        from formsProducao.utils.drive import GoogleDriveService
-                        drive_service = GoogleDriveService()
-                        resultado_upload = drive_service.upload_pdf(
-                            caminho_local, 
-                            nome_arquivo,
-                            cls.PASTA_ID
-                        )
+                    # Obtém a pasta no Google Drive (configurando-a se necessário)
+                    pasta_id = cls.obter_pasta_id()
+                    
+                    # Faz upload para o Google Drive direto do conteúdo recebido
+                    from formsProducao.utils.drive import GoogleDriveService
+                    drive_service = GoogleDriveService()
+                    resultado_upload = drive_service.upload_pdf(
+                        arquivo_pdf, 
+                        nome_arquivo,
+                        pasta_id
+                    )
+                    
+                    # Log do resultado do upload
+                    logger.info(f"Resultado do upload para o Google Drive: {resultado_upload}")
+                    if resultado_upload:
+                        # Atualiza o formulário com os links
+                        download_link = resultado_upload.get('download_link')
+                        web_view_link = resultado_upload.get('web_link')
+                        logger.info(f"Link de download: {download_link}")
+                        logger.info(f"Link de visualização: {web_view_link}")
+                        formulario.link_download = download_link
+                        formulario.web_view_link = web_view_link
+                        
+                        # Cria um JSON com os detalhes do formulário
+                        dados_json = {
+                            'cod_op': cod_op,
+                            'nome': dados_form.get('nome'),
+                            'email': dados_form.get('email'),
+                            'unidade': dados_form.get('unidade_nome'),
+                            'titulo': dados_form.get('titulo'),
+                            'data_entrega': str(dados_form.get('data_entrega')),
+                            'link_pdf': download_link,
+                            'link_visualizacao': web_view_link
+                        }
                         
-                        # Log do resultado do upload
-                        logger.info(f"Resultado do upload para o Google Drive: {resultado_upload}")
-                        if resultado_upload:
-                            # Atualiza o formulário com os links
-                            download_link = resultado_upload.get('download_link')
-                            web_view_link = resultado_upload.get('web_link')
-                            logger.info(f"Link de download: {download_link}")
-                            logger.info(f"Link de visualização: {web_view_link}")
-                            formulario.link_download = download_link
-                            formulario.web_view_link = web_view_link
-                            
-                            # Cria um JSON com os detalhes do formulário
-                            dados_json = {
-                                'cod_op': cod_op,
-                                'nome': dados_form.get('nome'),
-                                'email': dados_form.get('email'),
-                                'unidade': dados_form.get('unidade_nome'),
-                                'titulo': dados_form.get('titulo'),
-                                'data_entrega': str(dados_form.get('data_entrega')),
-                                'link_pdf': download_link,
-                                'link_visualizacao': web_view_link
-                            }
-                            
-                            formulario.json_link = json.dumps(dados_json)
-                            formulario.save()
-                            
-                        # Remove o arquivo temporário
-                        if os.path.exists(caminho_local):
-                            os.remove(caminho_local)
+                        formulario.json_link = json.dumps(dados_json)
+                        formulario.save()
                 except Exception as e:
                     logger.error(f"Erro ao fazer upload para o Google Drive: {str(e)}")
                     # Mas não falha se o upload não funcionar, já que o arquivo já foi salvo localmente
@@ -0,0 +1,267 @@
+import os
+import uuid
+import logging
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from formsProducao.models.upload_job import UploadJob, UploadJobArquivo
+from formsProducao.utils.upload_paralelo import executar_em_paralelo
+from formsProducao.services.formulario_cache_service import FormularioCacheService
+
+logger = logging.getLogger(__name__)
+
+
+class UploadJobService:
+    """
+    Serviço para os jobs de upload assíncrono dos PDFs dos formulários.
+
+    A requisição apenas grava os PDFs no spool local e cria o job; o comando
+    `processar_uploads` reserva os jobs pendentes e faz os uploads para o Google Drive.
+    """
+
+    @staticmethod
+    def obter_servico(tipo):
+        """Retorna a classe de serviço responsável por um tipo de formulário."""
+        from formsProducao.services import ZeroHumService, PensiService, EliteService, coleguiumService
+
+        servicos = {
+            servico.TIPO_FORMULARIO: servico
+            for servico in (ZeroHumService, PensiService, EliteService, coleguiumService)
+        }
+        if tipo not in servicos:
+            raise ValueError(f"Tipo de formulário desconhecido: {tipo}")
+        return servicos[tipo]
+
+    @staticmethod
+    def diretorio_spool():
+        """Retorna (e cria, se necessário) o diretório de spool dos uploads."""
+        diretorio = str(settings.FORMULARIO_UPLOAD_SPOOL_DIR)
+        os.makedirs(diretorio, exist_ok=True)
+        return diretorio
+
+    @classmethod
+    def gravar_spool(cls, arquivos_pdf):
+        """
+        Grava os PDFs recebidos no spool local.
+
+        Deve ser chamado antes de abrir a transação que cria o formulário: a cópia
+        dos arquivos pode demorar, e dentro da transação ela manteria bloqueada a
+        sequência de cod_op (e, no SQLite, todas as escritas no banco).
+
+        Args:
+            arquivos_pdf (list): Lista de tuplas com (arquivo, nome_arquivo)
+
+        Returns:
+            list: Tuplas (caminho_spool, nome_arquivo, tamanho) dos arquivos gravados
+        """
+        diretorio = cls.diretorio_spool()
+        gravados = []
+
+        try:
+            for arquivo, nome_arquivo in arquivos_pdf:
+                if not arquivo:
+                    logger.warning(f"Arquivo PDF vazio ou inválido para {nome_arquivo}")
+                    continue
+
+                # Nome único no spool, para não colidir entre requisições
+                caminho = os.path.join(diretorio, f"upload_{uuid.uuid4().hex}.pdf")
+                with open(caminho, 'wb') as destino:
+                    if hasattr(arquivo, 'chunks'):
+                        arquivo.seek(0)
+                        for chunk in arquivo.chunks():
+                            destino.write(chunk)
+                    else:
+                        destino.write(arquivo)
+                gravados.append((caminho, nome_arquivo, os.path.getsize(caminho)))
+        except Exception:
+            cls.remover_spool(gravados)
+            raise
+
+        return gravados
+
+    @staticmethod
+    def remover_spool(arquivos_spool):
+        """Remove do spool os arquivos gravados por `gravar_spool` (ex.: a transação falhou)."""
+        for caminho, _, _ in arquivos_spool:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    @classmethod
+    def enfileirar(cls, formulario, tipo, arquivos_spool):
+        """
+        Cria um job de upload com os PDFs já gravados no spool (`gravar_spool`).
+
+        Deve ser chamado dentro da mesma transação que cria o formulário, para que
+        o worker só enxergue o job junto com o formulário. Só faz inserções no banco.
+
+        Args:
+            formulario (Formulario): Formulário dono dos arquivos
+            tipo (str): Tipo do formulário (TIPO_FORMULARIO do serviço)
+            arquivos_spool (list): Tuplas (caminho_spool, nome_arquivo, tamanho)
+
+        Returns:
+            UploadJob: Job criado
+        """
+        job = UploadJob.objects.create(formulario=formulario, tipo=tipo)
+        UploadJobArquivo.objects.bulk_create([
+            UploadJobArquivo(job=job, nome=nome_arquivo, caminho_spool=caminho, tamanho=tamanho)
+            for caminho, nome_arquivo, tamanho in arquivos_spool
+        ])
+        return job
+
+    @staticmethod
+    def reservar_proximo_job():
+        """
+        Reserva o job pendente mais antigo para este worker.
+
+        A reserva é um UPDATE condicional no status, então dois workers nunca
+        processam o mesmo job, mesmo sem SELECT FOR UPDATE (SQLite).
+
+        Returns:
+            UploadJob: Job reservado, ou None se não houver jobs pendentes
+        """
+        while True:
+            job = UploadJob.objects.filter(status=UploadJob.STATUS_PENDENTE).order_by('criado_em', 'id').first()
+            if job is None:
+                return None
+
+            reservado = UploadJob.objects.filter(
+                pk=job.pk,
+                status=UploadJob.STATUS_PENDENTE
+            ).update(
+                status=UploadJob.STATUS_PROCESSANDO,
+                tentativas=F('tentativas') + 1,
+                iniciado_em=timezone.now(),
+                atualizado_em=timezone.now()
+            )
+            if reservado:
+                job.refresh_from_db()
+                return job
+
+    @staticmethod
+    def liberar_jobs_travados(minutos):
+        """
+        Devolve para a fila os jobs que ficaram em processamento por tempo demais
+        (por exemplo, quando o worker foi interrompido no meio do upload).
+
+        Returns:
+            int: Quantidade de jobs liberados
+        """
+        limite = timezone.now() - timedelta(minutes=minutos)
+        return UploadJob.objects.filter(
+            status=UploadJob.STATUS_PROCESSANDO,
+            iniciado_em__lt=limite
+        ).update(status=UploadJob.STATUS_PENDENTE, atualizado_em=timezone.now())
+
+    @classmethod
+    def processar_job(cls, job):
+        """
+        Envia para o Google Drive os arquivos ainda não enviados de um job
+        e cria os registros de ArquivoPDF.
+
+        Se algum arquivo falhar, o job volta para a fila até atingir
+        FORMULARIO_UPLOAD_MAX_TENTATIVAS; os arquivos já concluídos não são reenviados.
+
+        Returns:
+            bool: True se todos os arquivos do job foram enviados
+        """
+        servico = cls.obter_servico(job.tipo)
+        formulario = job.formulario
+        
+        def enviar(arquivo_job):
+            UploadJobArquivo.objects.filter(pk=arquivo_job.pk).update(
+                status=UploadJob.STATUS_PROCESSANDO,
+                erro=None,
+                atualizado_em=timezone.now()
+            )
+
+            def progresso(bytes_enviados, tamanho_total, pk=arquivo_job.pk):
+                UploadJobArquivo.objects.filter(pk=pk).update(
+                    bytes_enviados=bytes_enviados,
+                    atualizado_em=timezone.now()
+                )
+
+            try:
+                arquivo_pdf = servico.enviar_arquivo_spool(
+                    formulario,
+                    arquivo_job.caminho_spool,
+                    arquivo_job.nome,
+                    progresso_callback=progresso
+                )
+                UploadJobArquivo.objects.filter(pk=arquivo_job.pk).update(
+                    status=UploadJob.STATUS_CONCLUIDO,
+                    bytes_enviados=arquivo_job.tamanho,
+                    arquivo_pdf=arquivo_pdf,
+                    atualizado_em=timezone.now()
+                )
+                # O formulário ganhou um novo ArquivoPDF
+                FormularioCacheService.invalidar(formulario.cod_op)
+            except Exception as e:
+                logger.error(f"Erro no upload do arquivo '{arquivo_job.nome}' do job {job.id}: {str(e)}")
+                logger.error(traceback.format_exc())
+                UploadJobArquivo.objects.filter(pk=arquivo_job.pk).update(
+                    status=UploadJob.STATUS_ERRO,
+                    erro=str(e),
+                    atualizado_em=timezone.now()
+                )
+                raise
+
+        # Os arquivos do job são enviados em paralelo no pool de upload do processo
+        arquivos_job = list(job.arquivos.exclude(status=UploadJob.STATUS_CONCLUIDO))
+        resultados = executar_em_paralelo(enviar, arquivos_job, interromper_em_falha=False)
+        erros = [
+            f"{arquivo_job.nome}: {str(erro)}"
+            for arquivo_job, (_, erro) in zip(arquivos_job, resultados)
+            if erro
+        ]
+
+        if not erros:
+            job.status = UploadJob.STATUS_CONCLUIDO
+            job.erro = None
+            job.concluido_em = timezone.now()
+            job.save(update_fields=['status', 'erro', 'concluido_em', 'atualizado_em'])
+            logger.info(f"Job de upload {job.id} concluído (formulário {formulario.cod_op})")
+            return True
+
+        # Volta para a fila enquanto houver tentativas disponíveis
+        if job.tentativas < settings.FORMULARIO_UPLOAD_MAX_TENTATIVAS:
+            job.status = UploadJob.STATUS_PENDENTE
+        else:
+            job.status = UploadJob.STATUS_ERRO
+            job.concluido_em = timezone.now()
+        job.erro = "\n".join(erros)
+        job.save(update_fields=['status', 'erro', 'concluido_em', 'atualizado_em'])
+        logger.warning(f"Job de upload {job.id} falhou na tentativa {job.tentativas}: {job.erro}")
+        return False
+
+    @classmethod
+    def processar_pendentes(cls, limite=None):
+        """
+        Processa jobs pendentes até esvaziar a fila ou atingir o limite.
+
+        Returns:
+            int: Quantidade de jobs processados
+        """
+        processados = 0
+        while limite is None or processados < limite:
+            job = cls.reservar_proximo_job()
+            if job is None:
+                break
+
+            try:
+                cls.processar_job(job)
+            except Exception as e:
+                logger.error(f"Erro inesperado ao processar o job {job.id}: {str(e)}")
+                logger.error(traceback.format_exc())
+                UploadJob.objects.filter(pk=job.pk).update(
+                    status=UploadJob.STATUS_ERRO,
+                    erro=str(e),
+                    atualizado_em=timezone.now()
+                )
+            processados += 1
+
+        return processados
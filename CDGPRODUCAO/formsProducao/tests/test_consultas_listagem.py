@@ -0,0 +1,82 @@
+import os
+import sys
+import logging
+
+# Configura o ambiente Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.contrib.auth.models import User
+from formsProducao.models import Formulario, Unidade, ArquivoPDF
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TIPO_TESTE = 'zerohum'
+PREFIXO_TESTE = 'ZHQTESTE'
+
+def criar_formularios(quantidade, usuario):
+    """Cria formulários de teste com unidades e arquivos PDF"""
+    for i in range(quantidade):
+        formulario = Formulario.objects.create(
+            cod_op=f"{PREFIXO_TESTE}{Formulario.objects.count()}",
+            tipo=TIPO_TESTE,
+            nome='Teste Consultas',
+            usuario=usuario
+        )
+        Unidade.objects.create(formulario=formulario, nome='ARARUAMA', quantidade=1)
+        Unidade.objects.create(formulario=formulario, nome='CABO_FRIO', quantidade=2)
+        ArquivoPDF.objects.create(formulario=formulario, nome=f'teste_{i}.pdf')
+
+def contar_consultas_listagem(client, page_size):
+    """Retorna a quantidade de consultas feitas por uma página da listagem"""
+    with CaptureQueriesContext(connection) as consultas:
+        response = client.get(f'/api/formularios/{TIPO_TESTE}/?page_size={page_size}')
+    assert response.status_code == 200, f"Status inesperado: {response.status_code} - {response.data}"
+    return len(consultas), len(response.data['results'])
+
+def test_consultas_listagem():
+    """Verifica se a listagem faz um número constante de consultas"""
+    logger.info("Testando a quantidade de consultas da listagem de formulários...")
+
+    usuario, usuario_criado = User.objects.get_or_create(username='teste_consultas_listagem')
+    # ALLOWED_HOSTS não inclui o host padrão do cliente de teste ('testserver')
+    client = APIClient(SERVER_NAME='localhost')
+    client.force_authenticate(usuario)
+
+    try:
+        criar_formularios(5, usuario)
+        consultas_5, itens_5 = contar_consultas_listagem(client, 5)
+        logger.info(f"   {itens_5} formulários: {consultas_5} consultas")
+
+        criar_formularios(45, usuario)
+        consultas_50, itens_50 = contar_consultas_listagem(client, 50)
+        logger.info(f"   {itens_50} formulários: {consultas_50} consultas")
+
+        assert itens_5 == 5 and itens_50 == 50, f"Páginas com tamanho inesperado: {itens_5} e {itens_50}"
+        assert consultas_5 == consultas_50, (
+            f"A quantidade de consultas cresce com o número de formulários: {consultas_5} e {consultas_50}"
+        )
+        logger.info("✅ A quantidade de consultas não depende do número de formulários")
+        return True
+    finally:
+        # Remove os dados de teste
+        Formulario.objects.filter(cod_op__startswith=PREFIXO_TESTE).delete()
+        if usuario_criado:
+            usuario.delete()
+
+if __name__ == "__main__":
+    logger.info("Iniciando teste de consultas da listagem...")
+
+    resultado = test_consultas_listagem()
+
+    logger.info("Teste concluído!")
@@ -0,0 +1,93 @@
+import os
+import sys
+import logging
+
+# Configura o ambiente Django
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+django.setup()
+
+from rest_framework.test import APIClient
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from formsProducao.models import Formulario, ArquivoPDF, UploadJobArquivo
+from formsProducao.services import UploadJobService
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PDF_TESTE = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<</Type/Catalog/Pages 2 0 R>>\nendobj\ntrailer\n<</Root 1 0 R>>\n%%EOF\n'
+
+def remover_dados_teste(cod_op, usuario, usuario_criado):
+    """
+    Remove o formulário (com unidades, PDFs e jobs), os arquivos do spool, as cópias
+    locais dos PDFs (sem credenciais do Drive) e o usuário de teste
+    """
+    if cod_op:
+        for caminho in UploadJobArquivo.objects.filter(job__formulario__cod_op=cod_op).values_list('caminho_spool', flat=True):
+            if caminho and os.path.exists(caminho):
+                os.remove(caminho)
+        for arquivo_pdf in ArquivoPDF.objects.filter(formulario__cod_op=cod_op).exclude(arquivo=''):
+            arquivo_pdf.arquivo.delete(save=False)
+        Formulario.objects.filter(cod_op=cod_op).delete()
+    if usuario_criado:
+        usuario.delete()
+
+def test_upload_assincrono():
+    """Testa o envio de formulário com upload assíncrono e a consulta de progresso"""
+    logger.info("Testando envio de formulário com upload assíncrono...")
+
+    usuario, usuario_criado = User.objects.get_or_create(username='teste_upload_assincrono')
+    # ALLOWED_HOSTS não inclui o host padrão do cliente de teste ('testserver')
+    client = APIClient(SERVER_NAME='localhost')
+    client.force_authenticate(usuario)
+    cod_op = None
+
+    dados = {
+        'nome': 'Teste Upload Assíncrono',
+        'email': 'teste@exemplo.com',
+        'titulo': 'Documento de Teste',
+        'data_entrega': '2030-01-01',
+        'unidades': '[{"nome": "ARARUAMA", "quantidade": 1}]',
+        'arquivos': [
+            SimpleUploadedFile('teste_1.pdf', PDF_TESTE, content_type='application/pdf'),
+            SimpleUploadedFile('teste_2.pdf', PDF_TESTE, content_type='application/pdf'),
+        ]
+    }
+
+    try:
+        response = client.post('/api/formularios/zerohum/?assincrono=true', dados, format='multipart')
+        assert response.status_code == 202, f"Status inesperado: {response.status_code} - {response.data}"
+
+        cod_op = response.data['formulario']['cod_op']
+        logger.info(f"✅ Formulário {cod_op} aceito. Job: {response.data['job_id']}")
+
+        # Processa a fila como o comando processar_uploads faria
+        processados = UploadJobService.processar_pendentes()
+        logger.info(f"   Jobs processados: {processados}")
+
+        response = client.get(f'/api/formularios/zerohum/{cod_op}/uploads/')
+        assert response.status_code == 200, f"Status inesperado: {response.status_code} - {response.data}"
+        for job in response.data['jobs']:
+            for arquivo in job['arquivos']:
+                logger.info(f"   {arquivo['nome']}: {arquivo['status']} ({arquivo['progresso']}%)")
+
+        assert response.data['total_arquivos'] == 2, f"Total de arquivos inesperado: {response.data['total_arquivos']}"
+        assert response.data['arquivos_concluidos'] == response.data['total_arquivos'], "Nem todos os arquivos foram enviados"
+        logger.info("✅ Todos os arquivos foram enviados")
+
+        return response.data
+    finally:
+        remover_dados_teste(cod_op, usuario, usuario_criado)
+
+if __name__ == "__main__":
+    logger.info("Iniciando teste de upload assíncrono...")
+
+    resultado = test_upload_assincrono()
+
+    logger.info("Teste concluído!")
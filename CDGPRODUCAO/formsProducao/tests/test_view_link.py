@@ -92,7 +92,7 @@ def test_form_submission_with_view_link():
             if formulario.web_view_link:
                 logger.info(f"📁 Arquivo salvo no Google Drive e acessível via link: {formulario.web_view_link}")
                 logger.info(f"   Pasta do formulário: {ZeroHumService.PASTA_NOME}")
-                logger.info(f"   ID da pasta: {ZeroHumService.PASTA_ID}")
+                logger.info(f"   ID da pasta: {ZeroHumService.obter_pasta_id()}")
                 logger.info(f"   Email do usuário que precisa ter acesso: arthur.casadagrafica@gmail.com")
                 
                 # Verificando as permissões do arquivo
@@ -2,21 +2,36 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from formsProducao.views import ZeroHumView, PensiView, EliteView, ColeguiumView
+from formsProducao.views import (
+    ZeroHumView, PensiView, EliteView, ColeguiumView, UploadStatusView, FormularioCacheEstatisticasView,
+    ExportarFormulariosView
+)
+from formsProducao.services import ZeroHumService, PensiService, EliteService, coleguiumService
 
 urlpatterns = [
     # Rotas para o formulário ZeroHum
     path('zerohum/', ZeroHumView.as_view(), name='zerohum-formulario'),
+    path('zerohum/exportar/', ExportarFormulariosView.as_view(service_class=ZeroHumService), name='zerohum-exportar'),
     path('zerohum/<str:cod_op>/', ZeroHumView.as_view(), name='zerohum-detalhe'),
+    path('zerohum/<str:cod_op>/uploads/', UploadStatusView.as_view(service_class=ZeroHumService), name='zerohum-uploads'),
     
     # Rotas para o formulário Pensi
     path('pensi/', PensiView.as_view(), name='pensi-formulario'),
+    path('pensi/exportar/', ExportarFormulariosView.as_view(service_class=PensiService), name='pensi-exportar'),
     path('pensi/<str:cod_op>/', PensiView.as_view(), name='pensi-detalhe'),
+    path('pensi/<str:cod_op>/uploads/', UploadStatusView.as_view(service_class=PensiService), name='pensi-uploads'),
     
     # Rotas para o formulário Elite
     path('elite/', EliteView.as_view(), name='elite-formulario'),
+    path('elite/exportar/', ExportarFormulariosView.as_view(service_class=EliteService), name='elite-exportar'),
     path('elite/<str:cod_op>/', EliteView.as_view(), name='elite-detalhe'),
+    path('elite/<str:cod_op>/uploads/', UploadStatusView.as_view(service_class=EliteService), name='elite-uploads'),
       # Rotas para o formulário Coleguium
     path('coleguium/', ColeguiumView.as_view(), name='coleguium-formulario'),
+    path('coleguium/exportar/', ExportarFormulariosView.as_view(service_class=coleguiumService), name='coleguium-exportar'),
     path('coleguium/<str:cod_op>/', ColeguiumView.as_view(), name='coleguium-detalhe'),
+    path('coleguium/<str:cod_op>/uploads/', UploadStatusView.as_view(service_class=coleguiumService), name='coleguium-uploads'),
+    
+    # Estatísticas do cache de formulários
+    path('cache/estatisticas/', FormularioCacheEstatisticasView.as_view(), name='formularios-cache-estatisticas'),
 ]
\ No newline at end of file
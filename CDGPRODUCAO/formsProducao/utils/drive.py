@@ -1,73 +1,146 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload, MediaUpload
+import io
 import os
 import json
 import logging
 from django.conf import settings
+from formsProducao.utils.drive_clientes import registro_clientes_drive
 
 logger = logging.getLogger(__name__)
 
+# Tamanho de cada chunk do upload resumable (precisa ser múltiplo de 256KB)
+TAMANHO_CHUNK_UPLOAD = 1024 * 1024
+
+
+class MediaIteradorUpload(MediaUpload):
+    """
+    Upload resumable a partir de um iterador de chunks de bytes (ex: UploadedFile.chunks()),
+    sem gravar o arquivo em disco.
+
+    Só os bytes ainda não confirmados pelo Drive ficam em memória (no máximo
+    dois chunks), então o conteúdo não precisa caber inteiro na memória.
+    """
+
+    def __init__(self, iterador, mimetype='application/pdf', chunksize=TAMANHO_CHUNK_UPLOAD):
+        super().__init__()
+        self._iterador = iter(iterador)
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._buffer = bytearray()
+        self._inicio_buffer = 0
+        self._posicao_lida = 0
+        self._fim = False
+
+    def _ler_ate(self, posicao):
+        """Consome o iterador até o buffer alcançar a posição (ou o fim do conteúdo)."""
+        while not self._fim and self._inicio_buffer + len(self._buffer) < posicao:
+            try:
+                self._buffer.extend(next(self._iterador))
+            except StopIteration:
+                self._fim = True
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        # Lê o próximo chunk (e um byte a mais) antes do envio para saber se ele é o
+        # último; assim o tamanho total vai no mesmo chunk que termina o arquivo
+        self._ler_ate(self._posicao_lida + self._chunksize + 1)
+        if self._fim:
+            return self._inicio_buffer + len(self._buffer)
+        return None
+
+    def resumable(self):
+        return True
+
+    def getbytes(self, begin, length):
+        if begin < self._inicio_buffer:
+            raise ValueError("Não é possível reenviar bytes já confirmados de um iterador")
+
+        # Descarta o que o Drive já confirmou
+        del self._buffer[:begin - self._inicio_buffer]
+        self._inicio_buffer = begin
+
+        self._ler_ate(begin + length)
+        dados = bytes(self._buffer[:length])
+        self._posicao_lida = begin + len(dados)
+        return dados
+
+    def has_stream(self):
+        return False
+
+
+def criar_media_upload(conteudo, mimetype='application/pdf'):
+    """
+    Cria o objeto de mídia do upload resumable a partir do conteúdo recebido.
+
+    Args:
+        conteudo: Caminho do arquivo (str), bytes, UploadedFile do Django,
+                  objeto file-like com suporte a seek ou iterador de chunks de bytes
+
+    Returns:
+        MediaUpload: Mídia pronta para ser enviada com files().create
+    """
+    if isinstance(conteudo, (str, os.PathLike)):
+        if not os.path.exists(conteudo):
+            raise FileNotFoundError(f"Arquivo não encontrado: {conteudo}")
+        return MediaFileUpload(conteudo, mimetype=mimetype, resumable=True, chunksize=TAMANHO_CHUNK_UPLOAD)
+
+    if isinstance(conteudo, (bytes, bytearray)):
+        return MediaIoBaseUpload(io.BytesIO(conteudo), mimetype=mimetype, resumable=True, chunksize=TAMANHO_CHUNK_UPLOAD)
+
+    # UploadedFile do Django: lê direto dos chunks recebidos na requisição
+    if hasattr(conteudo, 'chunks'):
+        conteudo.seek(0)
+        return MediaIteradorUpload(conteudo.chunks(chunk_size=TAMANHO_CHUNK_UPLOAD), mimetype=mimetype)
+
+    if hasattr(conteudo, 'read') and hasattr(conteudo, 'seek'):
+        conteudo.seek(0)
+        return MediaIoBaseUpload(conteudo, mimetype=mimetype, resumable=True, chunksize=TAMANHO_CHUNK_UPLOAD)
+
+    return MediaIteradorUpload(conteudo, mimetype=mimetype)
+
+
 class GoogleDriveService:
     """
     Serviço para integração com o Google Drive API.
     """
     def __init__(self):
         self.credentials = None
-        self.service = None
         self.initialize_service()
         
+    @property
+    def service(self):
+        """Cliente da API do Drive da thread atual, vindo do registro do processo."""
+        return registro_clientes_drive.obter_cliente()
+        
     def initialize_service(self):
         """
         Inicializa o serviço do Google Drive usando as credenciais do arquivo .env.
+        
+        O cliente, a sessão HTTP e o token são compartilhados pelo processo
+        (ver RegistroClientesDrive), então criar um GoogleDriveService é barato.
         """
-        try:
-            # Escopo necessário para acesso ao Drive
-            SCOPES = ['https://www.googleapis.com/auth/drive']
-            
-            # Cria o dict de credenciais a partir das variáveis de ambiente
-            credentials_dict = {
-                "type": os.environ.get("GOOGLE_SERVICE_ACCOUNT_TYPE"),
-                "project_id": os.environ.get("GOOGLE_PROJECT_ID"),
-                "private_key_id": os.environ.get("GOOGLE_PRIVATE_KEY_ID"),
-                "private_key": os.environ.get("GOOGLE_PRIVATE_KEY").replace('\\n', '\n'),
-                "client_email": os.environ.get("GOOGLE_CLIENT_EMAIL"),
-                "client_id": os.environ.get("GOOGLE_CLIENT_ID"),
-                "auth_uri": os.environ.get("GOOGLE_AUTH_URI"),
-                "token_uri": os.environ.get("GOOGLE_TOKEN_URI"),
-                "auth_provider_x509_cert_url": os.environ.get("GOOGLE_AUTH_PROVIDER_X509_CERT_URL"),
-                "client_x509_cert_url": os.environ.get("GOOGLE_CLIENT_X509_CERT_URL"),
-                "universe_domain": os.environ.get("GOOGLE_UNIVERSE_DOMAIN")
-            }
-            
-            # Log para verificar se as credenciais estão sendo carregadas corretamente
-            if not credentials_dict["private_key"] or not credentials_dict["client_email"]:
-                logger.error("Credenciais do Google Drive não foram carregadas corretamente do arquivo .env")
-                logger.error(f"Private Key disponível: {'Sim' if credentials_dict['private_key'] else 'Não'}")
-                logger.error(f"Client Email disponível: {'Sim' if credentials_dict['client_email'] else 'Não'}")
-                return
-                
-            # Carrega as credenciais a partir do dicionário
-            self.credentials = service_account.Credentials.from_service_account_info(
-                credentials_dict, scopes=SCOPES)
-                
-            # Constrói o serviço
-            self.service = build('drive', 'v3', credentials=self.credentials)
-            logger.info("Serviço do Google Drive inicializado com sucesso.")
-        except Exception as e:
-            logger.error(f"Erro ao inicializar o serviço do Google Drive: {str(e)}")
-            # Detalhar o erro para facilitar o diagnóstico
-            import traceback
-            logger.error(traceback.format_exc())
-    def upload_pdf(self, file_path, file_name, folder_id=None):
+        self.credentials = registro_clientes_drive.credenciais
+        
+    def upload_pdf(self, conteudo, file_name, folder_id=None, progresso_callback=None):
         """
         Faz upload de um arquivo PDF para o Google Drive e configura as permissões adequadas.
         
+        O conteúdo é enviado direto para a sessão de upload resumable, sem arquivo
+        temporário intermediário.
+        
         Args:
-            file_path (str): Caminho local do arquivo PDF
+            conteudo: Caminho local do arquivo PDF, bytes, UploadedFile, objeto
+                      file-like ou iterador de chunks de bytes
             file_name (str): Nome do arquivo no Google Drive
             folder_id (str, optional): ID da pasta no Google Drive. Se não fornecido, 
                                       faz upload para a raiz.
+            progresso_callback (callable, optional): Chamado a cada chunk enviado com
+                                      (bytes_enviados, tamanho_total)
         
         Returns:
             dict: Informações do arquivo enviado, incluindo ID e links
@@ -80,8 +153,8 @@ class GoogleDriveService:
             if not self.service:
                 raise Exception("Não foi possível inicializar o serviço do Google Drive.")
         
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        if isinstance(conteudo, (str, os.PathLike)) and not os.path.exists(conteudo):
+            raise FileNotFoundError(f"Arquivo não encontrado: {conteudo}")
         
         try:
             # Preparar metadados do arquivo
@@ -93,21 +166,27 @@ class GoogleDriveService:
             if folder_id:
                 file_metadata['parents'] = [folder_id]
             
-            # Configurar upload
-            media = MediaFileUpload(
-                file_path,
-                mimetype='application/pdf',
-                resumable=True,
-                chunksize=1024*1024  # 1MB por chunk para melhor controle
-            )
+            # Configurar upload (1MB por chunk para melhor controle)
+            media = criar_media_upload(conteudo)
             
             # Criar arquivo no Drive com todos os campos necessários
-            file = self.service.files().create(
+            request = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, webViewLink, webContentLink, name, mimeType, size, createdTime, modifiedTime',
                 supportsAllDrives=True
-            ).execute()
+            )
+            
+            # Envia chunk a chunk para poder reportar o progresso
+            file = None
+            while file is None:
+                status_upload, file = request.next_chunk()
+                if progresso_callback:
+                    if file is not None:
+                        tamanho_total = media.size() or int(file.get('size') or 0)
+                        progresso_callback(tamanho_total, tamanho_total)
+                    elif status_upload:
+                        progresso_callback(status_upload.resumable_progress, status_upload.total_size)
             
             file_id = file.get('id')
             if not file_id:
@@ -123,13 +202,25 @@ class GoogleDriveService:
                 }  # Acesso de edição para o email específico
             ]
             
+            # As permissões vão em uma única requisição em lote, em vez de uma chamada por permissão
+            erros_permissao = []
+            
+            def verificar_permissao(request_id, response, exception):
+                if exception is not None:
+                    erros_permissao.append(exception)
+            
+            batch = self.service.new_batch_http_request(callback=verificar_permissao)
             for permission in permissions:
-                self.service.permissions().create(
+                batch.add(self.service.permissions().create(
                     fileId=file_id,
                     body=permission,
                     fields='id',
                     sendNotificationEmail=False
-                ).execute()
+                ))
+            batch.execute()
+            
+            if erros_permissao:
+                raise Exception(f"Falha ao configurar permissões do arquivo: {erros_permissao[0]}")
             
             # Gerar e verificar links
             web_view_link = file.get('webViewLink')
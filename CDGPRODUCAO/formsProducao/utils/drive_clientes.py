@@ -0,0 +1,149 @@
+import os
+import copy
+import json
+import logging
+import threading
+import traceback
+import httplib2
+import google_auth_httplib2
+from google.oauth2 import service_account
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+logger = logging.getLogger(__name__)
+
+# Escopo necessário para acesso ao Drive
+SCOPES = ['https://www.googleapis.com/auth/drive']
+
+# Timeout (segundos) das conexões HTTP com a API do Drive
+TIMEOUT_HTTP = 120
+
+
+class CredenciaisCompartilhadas(service_account.Credentials):
+    """
+    Credenciais da conta de serviço compartilhadas por todas as threads do processo.
+
+    O token só é renovado quando expira (ou quando a API responde 401), e uma
+    única thread faz a renovação de cada vez; as outras reaproveitam o token novo.
+    """
+
+    _lock_renovacao = threading.Lock()
+
+    def refresh(self, request):
+        token_anterior = self.token
+        with self._lock_renovacao:
+            # Outra thread já renovou o token enquanto esta esperava
+            if self.token != token_anterior and self.valid:
+                return
+            super().refresh(request)
+            registro_clientes_drive.registrar_renovacao_token()
+
+
+class RegistroClientesDrive:
+    """
+    Registro dos clientes da API do Google Drive do processo.
+
+    - O documento de discovery da API é carregado uma única vez, a partir da cópia
+      estática que acompanha o googleapiclient (sem requisição de discovery).
+    - As credenciais são criadas uma vez e compartilhadas entre as threads.
+    - Cada thread tem o seu próprio cliente e a sua própria sessão HTTP autorizada
+      (o httplib2 não é thread-safe), reaproveitada entre as chamadas para manter
+      a conexão TLS aberta (keep-alive).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._documento_discovery = None
+        self._credenciais = None
+        self.clientes_construidos = 0
+        self.tokens_renovados = 0
+
+    @staticmethod
+    def _carregar_credenciais():
+        """Cria as credenciais da conta de serviço a partir das variáveis de ambiente."""
+        credentials_dict = {
+            "type": os.environ.get("GOOGLE_SERVICE_ACCOUNT_TYPE"),
+            "project_id": os.environ.get("GOOGLE_PROJECT_ID"),
+            "private_key_id": os.environ.get("GOOGLE_PRIVATE_KEY_ID"),
+            "private_key": (os.environ.get("GOOGLE_PRIVATE_KEY") or '').replace('\\n', '\n'),
+            "client_email": os.environ.get("GOOGLE_CLIENT_EMAIL"),
+            "client_id": os.environ.get("GOOGLE_CLIENT_ID"),
+            "auth_uri": os.environ.get("GOOGLE_AUTH_URI"),
+            "token_uri": os.environ.get("GOOGLE_TOKEN_URI"),
+            "auth_provider_x509_cert_url": os.environ.get("GOOGLE_AUTH_PROVIDER_X509_CERT_URL"),
+            "client_x509_cert_url": os.environ.get("GOOGLE_CLIENT_X509_CERT_URL"),
+            "universe_domain": os.environ.get("GOOGLE_UNIVERSE_DOMAIN")
+        }
+
+        # Log para verificar se as credenciais estão sendo carregadas corretamente
+        if not credentials_dict["private_key"] or not credentials_dict["client_email"]:
+            logger.error("Credenciais do Google Drive não foram carregadas corretamente do arquivo .env")
+            logger.error(f"Private Key disponível: {'Sim' if credentials_dict['private_key'] else 'Não'}")
+            logger.error(f"Client Email disponível: {'Sim' if credentials_dict['client_email'] else 'Não'}")
+            return None
+
+        return CredenciaisCompartilhadas.from_service_account_info(credentials_dict, scopes=SCOPES)
+
+    @property
+    def credenciais(self):
+        """Credenciais compartilhadas do processo (None se não estiverem configuradas)."""
+        if self._credenciais is None:
+            with self._lock:
+                if self._credenciais is None:
+                    self._credenciais = self._carregar_credenciais()
+        return self._credenciais
+
+    def _obter_documento_discovery(self):
+        if self._documento_discovery is None:
+            with self._lock:
+                if self._documento_discovery is None:
+                    self._documento_discovery = json.loads(discovery_cache.get_static_doc('drive', 'v3'))
+        return self._documento_discovery
+
+    def obter_cliente(self):
+        """
+        Retorna o cliente da API do Drive da thread atual, construindo-o na primeira chamada.
+
+        Returns:
+            Resource: Cliente da API do Drive, ou None se não for possível inicializá-lo
+        """
+        cliente = getattr(self._local, 'cliente', None)
+        if cliente is not None:
+            return cliente
+
+        try:
+            credenciais = self.credenciais
+            if credenciais is None:
+                return None
+
+            http = google_auth_httplib2.AuthorizedHttp(credenciais, http=httplib2.Http(timeout=TIMEOUT_HTTP))
+            # A construção do cliente altera o documento de discovery, então cada
+            # cliente recebe a sua própria cópia
+            cliente = build_from_document(copy.deepcopy(self._obter_documento_discovery()), http=http)
+        except Exception as e:
+            logger.error(f"Erro ao inicializar o serviço do Google Drive: {str(e)}")
+            logger.error(traceback.format_exc())
+            return None
+
+        self._local.cliente = cliente
+        with self._lock:
+            self.clientes_construidos += 1
+        logger.info("Serviço do Google Drive inicializado com sucesso.")
+        return cliente
+
+    def registrar_renovacao_token(self):
+        with self._lock:
+            self.tokens_renovados += 1
+        logger.info("Token de acesso do Google Drive renovado")
+
+    def estatisticas(self):
+        """Contadores do registro, para monitoramento."""
+        return {
+            'clientes_construidos': self.clientes_construidos,
+            'tokens_renovados': self.tokens_renovados,
+        }
+
+
+# Registro único do processo
+registro_clientes_drive = RegistroClientesDrive()
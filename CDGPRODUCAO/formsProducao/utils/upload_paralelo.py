@@ -0,0 +1,90 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Pool de threads compartilhado pelo processo inteiro. O tamanho do pool é o
+# limite de uploads simultâneos por processo (DRIVE_UPLOAD_MAX_CONCORRENCIA_PROCESSO).
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor():
+    """Retorna o pool de threads de upload do processo, criando-o na primeira chamada."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DRIVE_UPLOAD_MAX_CONCORRENCIA_PROCESSO,
+                    thread_name_prefix='drive-upload'
+                )
+    return _executor
+
+
+def servico_drive_da_thread():
+    """
+    Retorna um GoogleDriveService para a thread atual.
+
+    O cliente HTTP da API do Google não é thread-safe; o GoogleDriveService usa o
+    cliente da própria thread, mantido pelo registro de clientes do processo.
+    """
+    from formsProducao.utils.drive import GoogleDriveService
+
+    return GoogleDriveService()
+
+
+def executar_em_paralelo(funcao, itens, limite=None, interromper_em_falha=True):
+    """
+    Executa `funcao(item)` para cada item no pool de upload do processo.
+
+    No máximo `limite` itens desta chamada ficam em execução ao mesmo tempo
+    (padrão: DRIVE_UPLOAD_MAX_CONCORRENCIA_REQUISICAO).
+
+    Args:
+        funcao (callable): Função executada para cada item
+        itens (list): Itens a processar
+        limite (int, optional): Máximo de itens simultâneos desta chamada
+        interromper_em_falha (bool): Se True, depois da primeira falha os itens
+                                     que ainda não começaram não são executados
+
+    Returns:
+        list: Tuplas (resultado, erro) na mesma ordem dos itens. Itens não
+              executados por causa de uma falha anterior têm resultado e erro None.
+    """
+    itens = list(itens)
+    if not itens:
+        return []
+
+    limite = limite or settings.DRIVE_UPLOAD_MAX_CONCORRENCIA_REQUISICAO
+    semaforo = threading.BoundedSemaphore(limite)
+    falhou = threading.Event()
+    resultados = [(None, None)] * len(itens)
+
+    def tarefa(indice, item):
+        try:
+            resultados[indice] = (funcao(item), None)
+        except Exception as e:
+            logger.error(f"Erro na tarefa de upload {indice}: {str(e)}")
+            resultados[indice] = (None, e)
+            falhou.set()
+        finally:
+            semaforo.release()
+            # Conexões abertas por esta thread (ex: atualização de progresso) não são
+            # fechadas pelos sinais de fim de requisição do Django
+            connections.close_all()
+
+    executor = obter_executor()
+    futures = []
+    for indice, item in enumerate(itens):
+        semaforo.acquire()
+        if interromper_em_falha and falhou.is_set():
+            semaforo.release()
+            break
+        futures.append(executor.submit(tarefa, indice, item))
+
+    wait(futures)
+    return resultados
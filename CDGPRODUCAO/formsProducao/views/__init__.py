@@ -2,4 +2,7 @@ from .base_view import BaseFormularioView
 from .zerohum import ZeroHumView
 from .pensi import PensiView
 from .elite import EliteView
-from .coleguium import ColeguiumView
\ No newline at end of file
+from .coleguium import ColeguiumView
+from .upload_status import UploadStatusView
+from .cache_estatisticas import FormularioCacheEstatisticasView
+from .exportacao import ExportarFormulariosView
\ No newline at end of file
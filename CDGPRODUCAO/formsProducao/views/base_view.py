@@ -1,15 +1,73 @@
 # filepath: c:\Users\Arthur Reis\Documents\PROJETOCASADAGRAFICA\CDGPRODUCAOBACK\CDGPRODUCAO\formsProducao\views\base_view.py
 import logging
 import json
+from django.conf import settings
+from django.urls import reverse
+from django.utils.dateparse import parse_date
+from django.db.models import Count, Max
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.authentication import TokenAuthentication, SessionAuthentication
+from formsProducao.pagination import FormularioCursorPagination
+from formsProducao.services.formulario_cache_service import FormularioCacheService
+from config.etag import calcular_etag, resposta_nao_modificada
+from busca.services.busca_service import BuscaService
 
 logger = logging.getLogger(__name__)
 
-class BaseFormularioView(APIView):
+class FiltroFormulariosMixin:
+    """
+    Filtros da listagem de formulários, usados também pela exportação: datas
+    (FILTROS_DATA, no formato AAAA-MM-DD) e busca textual (?q=).
+    A view deve definir `service_class`.
+    """
+    # Parâmetros de data aceitos na listagem
+    FILTROS_DATA = ('data_inicio', 'data_fim', 'entrega_inicio', 'entrega_fim')
+    
+    def filtrar_formularios(self, request, busca_completa=False):
+        """
+        Formulários do tipo da view que atendem aos filtros da requisição.
+        
+        Args:
+            busca_completa (bool): Mantém todos os formulários encontrados pela
+                busca, sem o limite de resultados nem o ranking (exportações)
+        
+        Returns:
+            tuple: (QuerySet, IDs encontrados pela busca em ordem de relevância,
+                    ou None sem ?q= ou com busca_completa)
+        
+        Raises:
+            ValidationError: Data em formato inválido
+        """
+        filtros = {}
+        for parametro in self.FILTROS_DATA:
+            valor = request.query_params.get(parametro)
+            if not valor:
+                continue
+            try:
+                data = parse_date(valor)
+            except ValueError:
+                data = None
+            if data is None:
+                raise ValidationError({"detail": f"Data inválida em '{parametro}'. Use o formato AAAA-MM-DD."})
+            filtros[parametro] = data
+        
+        formularios = self.service_class.listar_formularios(filtros)
+        
+        # Busca textual (?q=): filtra pelo índice de busca
+        texto = request.query_params.get('q', '').strip()
+        if not texto:
+            return formularios, None
+        if busca_completa:
+            return formularios.filter(BuscaService.filtro(BuscaService.TIPO_FORMULARIO, texto)), None
+        ids = BuscaService.buscar(BuscaService.TIPO_FORMULARIO, texto)
+        return formularios.filter(pk__in=ids), ids
+
+
+class BaseFormularioView(FiltroFormulariosMixin, APIView):
     """
     View base para todos os formulários de produção.
     Fornece operações CRUD comuns para implementação em views específicas.
@@ -19,6 +77,21 @@ class BaseFormularioView(APIView):
     # A definir nas subclasses
     serializer_class = None
     service_class = None
+    
+    pagination_class = FormularioCursorPagination
+    
+    def upload_assincrono(self, request):
+        """
+        Indica se os PDFs devem ser enviados em segundo plano.
+        
+        Usa FORMULARIO_UPLOAD_ASSINCRONO, podendo ser sobrescrito por requisição
+        com o parâmetro ?assincrono=true ou ?assincrono=false.
+        """
+        valor = request.query_params.get('assincrono')
+        if valor is not None:
+            return valor.lower() in ('1', 'true', 'sim')
+        return settings.FORMULARIO_UPLOAD_ASSINCRONO
+    
     def post(self, request, *args, **kwargs):
         """
         Cria um novo formulário.
@@ -114,6 +187,26 @@ class BaseFormularioView(APIView):
                 dados_validados.pop('arquivos_nomes')
             
             logger.debug(f"Dados validados após limpeza: {dados_validados}")
+            
+            # Modo assíncrono: salva o formulário, enfileira os PDFs e responde 202
+            if arquivos_pdf and self.upload_assincrono(request):
+                formulario, job = self.service_class.processar_formulario_assincrono(
+                    dados_form=dados_validados,
+                    arquivos_pdf=arquivos_pdf,
+                    usuario=usuario_atual
+                )
+                
+                status_url = reverse(
+                    f"{self.service_class.TIPO_FORMULARIO}-uploads",
+                    kwargs={'cod_op': formulario.cod_op}
+                )
+                resposta_serializer = self.serializer_class(formulario)
+                return Response({
+                    "job_id": job.id,
+                    "status": job.status,
+                    "status_url": request.build_absolute_uri(status_url),
+                    "formulario": resposta_serializer.data
+                }, status=status.HTTP_202_ACCEPTED)
               
             # Chama o serviço para processar o formulário e salvar
             formulario = self.service_class.processar_formulario(
@@ -148,8 +241,8 @@ class BaseFormularioView(APIView):
         from formsProducao.models.formulario import Formulario
         
         try:
-            # Verifica se a classe do serializador foi definida
-            if not self.serializer_class:
+            # Verifica se as classes necessárias foram definidas
+            if not self.serializer_class or not self.service_class:
                 return Response(
                     {"detail": "View não configurada corretamente"},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -157,20 +250,70 @@ class BaseFormularioView(APIView):
                 
             # Se um código de operação for fornecido, retorna esse formulário específico
             if cod_op:
+                # O ETag vem do atualizado_em do formulário, que também muda quando
+                # um PDF é adicionado ou removido
+                versao = Formulario.objects.filter(cod_op=cod_op).values_list('id', 'atualizado_em').first()
+                if versao is None:
+                    return Response(
+                        {"detail": f"Formulário com código {cod_op} não encontrado"},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                etag = calcular_etag('formulario', *versao)
+                nao_modificado = resposta_nao_modificada(request, etag)
+                if nao_modificado is not None:
+                    return nao_modificado
+                
+                # Consulta primeiro a representação em cache, válida só se gerada
+                # para o mesmo ETag
+                dados = FormularioCacheService.obter(cod_op, etag)
+                if dados is not None:
+                    return Response(dados, headers={'ETag': etag})
+                
                 try:
-                    formulario = Formulario.objects.get(cod_op=cod_op)
+                    formulario = self.serializer_class.preparar_queryset(Formulario.objects).get(cod_op=cod_op)
                     serializer = self.serializer_class(formulario)
-                    return Response(serializer.data)
+                    FormularioCacheService.salvar(cod_op, etag, serializer.data)
+                    return Response(serializer.data, headers={'ETag': etag})
                 except Formulario.DoesNotExist:
                     return Response(
                         {"detail": f"Formulário com código {cod_op} não encontrado"},
                         status=status.HTTP_404_NOT_FOUND
                     )
             
-            # Caso contrário, lista todos os formulários (poderia adicionar paginação aqui)
-            formularios = Formulario.objects.all().order_by('-criado_em')
-            serializer = self.serializer_class(formularios, many=True)
-            return Response(serializer.data)
+            # Caso contrário, lista os formulários do tipo da view, paginados por cursor
+            try:
+                formularios, ids = self.filtrar_formularios(request)
+            except ValidationError as e:
+                return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+            
+            # ETag da página: total e último atualizado_em dos formulários filtrados,
+            # mais os parâmetros da requisição (cursor, page_size e filtros)
+            versao = formularios.aggregate(total=Count('id'), ultimo=Max('atualizado_em'))
+            etag = calcular_etag('formularios', request.get_full_path(), versao['total'], versao['ultimo'])
+            nao_modificado = resposta_nao_modificada(request, etag)
+            if nao_modificado is not None:
+                return nao_modificado
+            
+            paginador = self.pagination_class()
+            if ids is not None:
+                # Resultados da busca em uma única página, do mais relevante para o menos
+                pagina = list(
+                    self.serializer_class.preparar_queryset(formularios)
+                    .order_by(BuscaService.ordem_ranking(ids))[:paginador.get_page_size(request)]
+                )
+                serializer = self.serializer_class(pagina, many=True)
+                return Response({'next': None, 'results': serializer.data}, headers={'ETag': etag})
+            
+            pagina = paginador.paginate_queryset(
+                self.serializer_class.preparar_queryset(formularios), request, view=self
+            )
+            serializer = self.serializer_class(pagina, many=True)
+            resposta = paginador.get_paginated_response(serializer.data)
+            resposta['ETag'] = etag
+            return resposta
+            
+        except NotFound as e:
+            return Response({"detail": str(e.detail)}, status=status.HTTP_404_NOT_FOUND)
             
         except Exception as e:
             logger.exception(f"Erro ao consultar formulários: {str(e)}")
@@ -265,7 +408,10 @@ class BaseFormularioView(APIView):
                 formulario,
                 dados_validados,
                 arquivos_pdf if arquivos_pdf else None
-            )# Retorna os dados atualizados
+            )
+            FormularioCacheService.invalidar(cod_op)
+            
+            # Retorna os dados atualizados
             resposta_serializer = self.serializer_class(formulario)
             return Response({
                 "detail": "Formulário atualizado com sucesso",
@@ -301,6 +447,7 @@ class BaseFormularioView(APIView):
                 
             # Exclui o formulário
             formulario.delete()
+            FormularioCacheService.invalidar(cod_op)
             
             # Retorna uma resposta de sucesso
             return Response(
@@ -0,0 +1,14 @@
+import logging
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from formsProducao.services.formulario_cache_service import FormularioCacheService
+
+logger = logging.getLogger(__name__)
+
+class FormularioCacheEstatisticasView(APIView):
+    """
+    View para consultar os contadores de acertos e falhas do cache de formulários.
+    """
+    def get(self, request, *args, **kwargs):
+        return Response(FormularioCacheService.estatisticas())
@@ -0,0 +1,48 @@
+import logging
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from config.exportacao import FORMATO_CSV, FORMATOS, resposta_exportacao
+from formsProducao.services.exportacao_service import ExportacaoFormulariosService
+from formsProducao.views.base_view import FiltroFormulariosMixin
+
+logger = logging.getLogger(__name__)
+
+
+class ExportarFormulariosView(FiltroFormulariosMixin, APIView):
+    """
+    Exporta os formulários de um tipo em CSV ou NDJSON (?formato=csv|ndjson,
+    padrão csv), com os mesmos filtros de data e busca (?q=) da listagem. Com
+    ?q= são exportados todos os formulários encontrados, dos mais recentes para
+    os mais antigos (sem o limite nem o ranking da busca).
+
+    Os formulários são lidos do banco em lotes e cada linha é enviada assim que
+    lida (ver ExportacaoFormulariosService). O tipo vem do service_class passado
+    em as_view() nas rotas.
+    """
+    service_class = None
+
+    def get(self, request, *args, **kwargs):
+        formato = request.query_params.get('formato') or FORMATO_CSV
+        if formato not in FORMATOS:
+            return Response(
+                {"detail": f"Formato inválido. Use um destes: {', '.join(FORMATOS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            formularios, _ = self.filtrar_formularios(request, busca_completa=True)
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
+
+        registros = ExportacaoFormulariosService.registros(
+            ExportacaoFormulariosService.ordenar(formularios),
+            formato_csv=formato == FORMATO_CSV
+        )
+        return resposta_exportacao(
+            formato,
+            ExportacaoFormulariosService.COLUNAS,
+            registros,
+            f'formularios_{self.service_class.TIPO_FORMULARIO}'
+        )
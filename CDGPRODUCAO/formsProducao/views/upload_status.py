@@ -0,0 +1,52 @@
+import logging
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from formsProducao.models.formulario import Formulario
+from formsProducao.models.upload_job import UploadJob
+from formsProducao.serializers import UploadJobSerializer
+
+logger = logging.getLogger(__name__)
+
+class UploadStatusView(APIView):
+    """
+    View para consultar o andamento dos uploads assíncronos de um formulário.
+    Retorna os jobs do formulário com o progresso de cada arquivo.
+    """
+    # A definir nas rotas (ex: UploadStatusView.as_view(service_class=ZeroHumService))
+    service_class = None
+    
+    def get(self, request, cod_op, *args, **kwargs):
+        """
+        Lista os jobs de upload do formulário com o progresso por arquivo.
+        """
+        try:
+            try:
+                formulario = Formulario.objects.get(cod_op=cod_op)
+            except Formulario.DoesNotExist:
+                return Response(
+                    {"detail": f"Formulário com código {cod_op} não encontrado"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            jobs = formulario.upload_jobs.prefetch_related('arquivos__arquivo_pdf').order_by('-criado_em')
+            if self.service_class and self.service_class.TIPO_FORMULARIO:
+                jobs = jobs.filter(tipo=self.service_class.TIPO_FORMULARIO)
+            
+            arquivos = [arquivo for job in jobs for arquivo in job.arquivos.all()]
+            concluidos = sum(1 for arquivo in arquivos if arquivo.status == UploadJob.STATUS_CONCLUIDO)
+            
+            return Response({
+                "cod_op": formulario.cod_op,
+                "total_arquivos": len(arquivos),
+                "arquivos_concluidos": concluidos,
+                "jobs": UploadJobSerializer(jobs, many=True).data
+            })
+            
+        except Exception as e:
+            logger.exception(f"Erro ao consultar uploads do formulário: {str(e)}")
+            return Response(
+                {"detail": "Ocorreu um erro ao consultar os uploads do formulário"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     WebhookConfig, WebhookEndpointConfig, Webhook, 
-    Pedido, StatusPedido, WebhookStatusEnviado
+    Pedido, ItemPedido, HistoricoStatusPedido, StatusPedido, WebhookStatusEnviado,
+    WebhookStatusPendente
 )
 
 @admin.register(WebhookConfig)
@@ -14,7 +15,7 @@ class WebhookConfigAdmin(admin.ModelAdmin):
 
 @admin.register(WebhookEndpointConfig)
 class WebhookEndpointConfigAdmin(admin.ModelAdmin):
-    list_display = ('nome', 'url', 'ativo', 'auto_enviar', 'criado_em')
+    list_display = ('nome', 'url', 'ativo', 'auto_enviar', 'timeout_segundos', 'criado_em')
     list_filter = ('ativo', 'auto_enviar')
     search_fields = ('nome', 'url')
     readonly_fields = ('criado_em', 'atualizado_em')
@@ -24,8 +25,8 @@ class WebhookEndpointConfigAdmin(admin.ModelAdmin):
 class WebhookAdmin(admin.ModelAdmin):
     list_display = ('id', 'evento', 'verificado', 'recebido_em')
     list_filter = ('evento', 'verificado')
-    search_fields = ('evento', 'payload')
-    readonly_fields = ('recebido_em',)
+    search_fields = ('evento', 'payload', '=payload_sha256')
+    readonly_fields = ('recebido_em', 'payload_sha256')
 
 
 @admin.register(StatusPedido)
@@ -35,12 +36,30 @@ class StatusPedidoAdmin(admin.ModelAdmin):
     search_fields = ('nome', 'descricao')
 
 
+class ItemPedidoInline(admin.TabularInline):
+    model = ItemPedido
+    extra = 0
+    fields = ('ordem', 'nome', 'sku', 'quantidade', 'id_sku', 'design_capa_frente', 'mockup_capa_frente')
+
+
+class HistoricoStatusPedidoInline(admin.TabularInline):
+    model = HistoricoStatusPedido
+    extra = 0
+    can_delete = False
+    fields = ('alterado_em', 'status_anterior', 'status_novo')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Pedido)
 class PedidoAdmin(admin.ModelAdmin):
     list_display = ('numero_pedido', 'nome_cliente', 'valor_pedido', 'status', 'criado_em')
     list_filter = ('status',)
     search_fields = ('numero_pedido', 'nome_cliente', 'email_cliente', 'documento_cliente')
     readonly_fields = ('criado_em', 'atualizado_em')
+    inlines = [ItemPedidoInline, HistoricoStatusPedidoInline]
     fieldsets = (
         ('Informações do Pedido', {
             'fields': (
@@ -75,7 +94,16 @@ class PedidoAdmin(admin.ModelAdmin):
 
 @admin.register(WebhookStatusEnviado)
 class WebhookStatusEnviadoAdmin(admin.ModelAdmin):
-    list_display = ('pedido', 'status', 'url_destino', 'sucesso', 'codigo_http', 'enviado_em')
+    list_display = ('pedido', 'status', 'url_destino', 'sucesso', 'codigo_http', 'tentativa_numero', 'enviado_em')
     list_filter = ('sucesso', 'status')
     search_fields = ('pedido__numero_pedido', 'url_destino')
     readonly_fields = ('enviado_em', 'tentativa_numero')
+
+
+@admin.register(WebhookStatusPendente)
+class WebhookStatusPendenteAdmin(admin.ModelAdmin):
+    list_display = ('pedido', 'endpoint', 'status', 'situacao', 'tentativas', 'proxima_tentativa_em')
+    list_filter = ('situacao', 'endpoint')
+    search_fields = ('pedido__numero_pedido',)
+    raw_id_fields = ('pedido',)
+    readonly_fields = ('criado_em', 'atualizado_em')
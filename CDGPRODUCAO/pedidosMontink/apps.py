@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PedidosmontinkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pedidosMontink'
+
+    def ready(self):
+        # Registra os sinais que invalidam o cache de configurações
+        from . import signals  # noqa: F401
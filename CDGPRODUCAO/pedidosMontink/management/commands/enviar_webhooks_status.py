@@ -0,0 +1,67 @@
+import time
+import logging
+from django.core.management.base import BaseCommand
+from pedidosMontink.services.envio_status_service import EnvioStatusService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Envia os webhooks de status pendentes (WebhookStatusPendente), com novas tentativas para as falhas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='Continua verificando a fila em vez de sair quando não houver envios vencidos'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2,
+            help='Segundos entre verificações da fila no modo contínuo (padrão: 2)'
+        )
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=None,
+            help='Quantidade de envios reservados por vez (padrão: PEDIDOS_STATUS_WEBHOOK_TAMANHO_LOTE)'
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=None,
+            help='Quantidade máxima de envios por verificação'
+        )
+        parser.add_argument(
+            '--liberar-travados',
+            action='store_true',
+            help='Devolve para a fila os envios que ficaram em andamento (use apenas sem outros workers rodando)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Enviando webhooks de status...')
+
+        if options['liberar_travados']:
+            liberados = EnvioStatusService.liberar_travados()
+            if liberados:
+                self.stdout.write(self.style.WARNING(
+                    f'{liberados} envio(s) travado(s) devolvido(s) para a fila'
+                ))
+
+        while True:
+            enviados, falhas = EnvioStatusService.processar_pendentes(
+                tamanho_lote=options['tamanho_lote'],
+                limite=options['limite']
+            )
+            if enviados:
+                self.stdout.write(self.style.SUCCESS(f'{enviados} webhook(s) enviado(s)'))
+            if falhas:
+                self.stdout.write(self.style.WARNING(f'{falhas} falha(s) de envio'))
+
+            if not options['continuo']:
+                break
+
+            if not enviados and not falhas:
+                time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS('Envio de webhooks de status concluído.'))
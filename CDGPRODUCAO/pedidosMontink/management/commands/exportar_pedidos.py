@@ -0,0 +1,65 @@
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from config.exportacao import FORMATO_CSV, FORMATOS, gravar_exportacao
+from pedidosMontink.services.exportacao_service import ExportacaoPedidosService
+from pedidosMontink.services.pedido_service import PedidoService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Exporta pedidos em CSV ou NDJSON, com os mesmos filtros da listagem, lendo o banco em lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--formato',
+            choices=FORMATOS,
+            default=FORMATO_CSV,
+            help='Formato do arquivo (padrão: csv)'
+        )
+        parser.add_argument(
+            '--saida',
+            default=None,
+            help='Arquivo de saída (padrão: saída padrão)'
+        )
+        parser.add_argument('--numero-pedido', default=None, help='Filtro por número do pedido')
+        parser.add_argument('--sku', default=None, help='Filtro por SKU de qualquer item do pedido')
+        parser.add_argument(
+            '--modo-busca',
+            choices=PedidoService.MODOS_BUSCA,
+            default=None,
+            help='Modo de busca de número do pedido e SKU (padrão: prefixo)'
+        )
+        parser.add_argument('--status', default=None, help='Filtro por ID do status')
+        parser.add_argument('--data-inicio', default=None, help='Pedidos criados a partir desta data')
+        parser.add_argument('--data-fim', default=None, help='Pedidos criados até esta data')
+        parser.add_argument('--q', default=None, help='Busca textual pelo índice de busca')
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=None,
+            help='Quantidade de pedidos lidos por consulta (padrão: EXPORTACAO_TAMANHO_LOTE)'
+        )
+
+    def handle(self, *args, **options):
+        filtros = {
+            'numero_pedido': options['numero_pedido'],
+            'sku': options['sku'],
+            'modo_busca': options['modo_busca'],
+            'status': options['status'],
+            'data_inicio': options['data_inicio'],
+            'data_fim': options['data_fim'],
+        }
+        queryset = ExportacaoPedidosService.filtrar(filtros, options['q'])
+        registros = ExportacaoPedidosService.registros(queryset, tamanho_lote=options['tamanho_lote'])
+
+        if not options['saida']:
+            total = gravar_exportacao(self.stdout, options['formato'], ExportacaoPedidosService.COLUNAS, registros)
+            self.stderr.write(f'{total} pedido(s) exportado(s)')
+            return
+
+        try:
+            with open(options['saida'], 'w', encoding='utf-8', newline='') as arquivo:
+                total = gravar_exportacao(arquivo, options['formato'], ExportacaoPedidosService.COLUNAS, registros)
+        except OSError as e:
+            raise CommandError(f'Não foi possível gravar {options["saida"]}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'{total} pedido(s) exportado(s) para {options["saida"]}'))
@@ -0,0 +1,65 @@
+import time
+import logging
+from django.core.management.base import BaseCommand
+from pedidosMontink.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Cria os pedidos dos webhooks da Montink recebidos no modo assíncrono (PEDIDOS_WEBHOOK_ASSINCRONO)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--continuo',
+            action='store_true',
+            help='Continua verificando a fila em vez de sair quando ela estiver vazia'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2,
+            help='Segundos entre verificações da fila no modo contínuo (padrão: 2)'
+        )
+        parser.add_argument(
+            '--tamanho-lote',
+            type=int,
+            default=None,
+            help='Quantidade de webhooks gravados por transação (padrão: PEDIDOS_WEBHOOK_TAMANHO_LOTE)'
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=None,
+            help='Quantidade máxima de webhooks processados por verificação'
+        )
+        parser.add_argument(
+            '--liberar-travados',
+            action='store_true',
+            help='Devolve para a fila os webhooks que ficaram em processamento (use apenas sem outros workers rodando)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Processando webhooks de pedidos...')
+
+        if options['liberar_travados']:
+            liberados = WebhookService.liberar_webhooks_travados()
+            if liberados:
+                self.stdout.write(self.style.WARNING(
+                    f'{liberados} webhook(s) travado(s) devolvido(s) para a fila'
+                ))
+
+        while True:
+            processados = WebhookService.processar_webhooks_na_fila(
+                tamanho_lote=options['tamanho_lote'],
+                limite=options['limite']
+            )
+            if processados:
+                self.stdout.write(self.style.SUCCESS(f'{processados} webhook(s) processado(s)'))
+
+            if not options['continuo']:
+                break
+
+            if not processados:
+                time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS('Processamento de webhooks concluído.'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:39
+
+import hashlib
+from django.db import migrations, models
+
+
+def preencher_payload_sha256(apps, schema_editor):
+    """Calcula o digest dos webhooks já recebidos."""
+    Webhook = apps.get_model('pedidosMontink', 'Webhook')
+    lote = []
+    for webhook in Webhook.objects.filter(payload_sha256='').only('id', 'payload').iterator(chunk_size=500):
+        webhook.payload_sha256 = hashlib.sha256((webhook.payload or '').encode('utf-8')).hexdigest()
+        lote.append(webhook)
+        if len(lote) >= 500:
+            Webhook.objects.bulk_update(lote, ['payload_sha256'])
+            lote = []
+    if lote:
+        Webhook.objects.bulk_update(lote, ['payload_sha256'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0002_webhook_erro_webhook_processado_webhook_status_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='payload_sha256',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='SHA-256 do payload, para detectar reenvios', max_length=64),
+        ),
+        migrations.RunPython(preencher_payload_sha256, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:46
+
+import json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _produtos_do_payload(payload):
+    """Lista de produtos do payload original do webhook, ou None se não for possível lê-la."""
+    try:
+        produtos = json.loads(payload or '').get('produtos')
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(produtos, list) or not produtos:
+        return None
+    if not all(isinstance(produto, dict) and produto.get('nome') and produto.get('sku') for produto in produtos):
+        return None
+    return produtos
+
+
+def criar_itens_dos_pedidos(apps, schema_editor):
+    """
+    Cria os itens dos pedidos já recebidos. Os produtos vêm do payload guardado no
+    webhook do pedido (recuperando os que antes eram descartados); quando o payload
+    não pode ser lido, o item é criado a partir dos campos de produto do pedido.
+    """
+    Pedido = apps.get_model('pedidosMontink', 'Pedido')
+    ItemPedido = apps.get_model('pedidosMontink', 'ItemPedido')
+    lote = []
+    pedidos = Pedido.objects.select_related('webhook').order_by('id').iterator(chunk_size=500)
+    for pedido in pedidos:
+        produtos = _produtos_do_payload(pedido.webhook.payload)
+        if produtos is None:
+            lote.append(ItemPedido(
+                pedido_id=pedido.id, ordem=0,
+                nome=pedido.nome_produto, sku=pedido.sku, quantidade=pedido.quantidade,
+                id_sku=pedido.id_sku, arquivo_pdf=pedido.arquivo_pdf_produto,
+                design_capa_frente=pedido.design_capa_frente, design_capa_verso=pedido.design_capa_verso,
+                mockup_capa_frente=pedido.mockup_capa_frente, mockup_capa_costas=pedido.mockup_capa_costas,
+            ))
+        else:
+            for ordem, produto in enumerate(produtos):
+                designs = produto.get('designs') or {}
+                mockups = produto.get('mockups') or {}
+                lote.append(ItemPedido(
+                    pedido_id=pedido.id, ordem=ordem,
+                    nome=produto['nome'], sku=produto['sku'], quantidade=produto.get('quantidade') or 1,
+                    id_sku=produto.get('id_sku'), arquivo_pdf=produto.get('arquivo_pdf'),
+                    design_capa_frente=designs.get('capa_frente', ''), design_capa_verso=designs.get('capa_verso'),
+                    mockup_capa_frente=mockups.get('capa_frente', ''), mockup_capa_costas=mockups.get('capa_costas'),
+                ))
+        if len(lote) >= 500:
+            ItemPedido.objects.bulk_create(lote)
+            lote = []
+    if lote:
+        ItemPedido.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0003_webhook_payload_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemPedido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ordem', models.PositiveIntegerField(default=0, help_text='Posição do produto na lista recebida')),
+                ('nome', models.CharField(max_length=255)),
+                ('sku', models.CharField(db_index=True, max_length=100)),
+                ('quantidade', models.IntegerField()),
+                ('id_sku', models.IntegerField(blank=True, null=True)),
+                ('arquivo_pdf', models.URLField(blank=True, null=True)),
+                ('design_capa_frente', models.URLField()),
+                ('design_capa_verso', models.URLField(blank=True, null=True)),
+                ('mockup_capa_frente', models.URLField()),
+                ('mockup_capa_costas', models.URLField(blank=True, null=True)),
+                ('pedido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='itens', to='pedidosMontink.pedido')),
+            ],
+            options={
+                'verbose_name': 'Item de Pedido',
+                'verbose_name_plural': 'Itens de Pedido',
+                'db_table': 'pedidos_itens',
+                'ordering': ['pedido_id', 'ordem'],
+                'constraints': [models.UniqueConstraint(fields=('pedido', 'ordem'), name='item_pedido_ordem_unica')],
+            },
+        ),
+        migrations.RunPython(criar_itens_dos_pedidos, migrations.RunPython.noop),
+    ]
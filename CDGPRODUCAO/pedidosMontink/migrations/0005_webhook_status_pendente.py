@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:48
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0004_item_pedido'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookStatusPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status_id', models.IntegerField()),
+                ('status', models.CharField(max_length=50)),
+                ('data_evento', models.DateTimeField(help_text='Data da alteração de status enviada no payload')),
+                ('situacao', models.CharField(choices=[('pendente', 'Pendente'), ('enviando', 'Enviando'), ('enviado', 'Enviado'), ('falhou', 'Falhou')], default='pendente', max_length=10)),
+                ('tentativas', models.IntegerField(default=0)),
+                ('proxima_tentativa_em', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ultimo_erro', models.TextField(blank=True, null=True)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='webhooks_pendentes', to='pedidosMontink.webhookendpointconfig')),
+                ('pedido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='webhooks_pendentes', to='pedidosMontink.pedido')),
+            ],
+            options={
+                'verbose_name': 'Webhook de Status Pendente',
+                'verbose_name_plural': 'Webhooks de Status Pendentes',
+                'ordering': ['proxima_tentativa_em', 'id'],
+                'indexes': [models.Index(fields=['situacao', 'proxima_tentativa_em'], name='webhook_pendente_fila_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0005_webhook_status_pendente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookendpointconfig',
+            name='timeout_segundos',
+            field=models.FloatField(default=10, help_text='Tempo máximo de espera pela resposta deste endpoint, em segundos'),
+        ),
+    ]
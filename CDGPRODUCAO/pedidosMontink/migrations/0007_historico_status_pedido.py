@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0006_webhookendpointconfig_timeout'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoricoStatusPedido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alterado_em', models.DateTimeField(default=django.utils.timezone.now)),
+                ('pedido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historico_status', to='pedidosMontink.pedido')),
+                ('status_anterior', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='pedidosMontink.statuspedido')),
+                ('status_novo', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='pedidosMontink.statuspedido')),
+            ],
+            options={
+                'verbose_name': 'Histórico de Status do Pedido',
+                'verbose_name_plural': 'Históricos de Status dos Pedidos',
+                'ordering': ['-alterado_em', '-id'],
+                'indexes': [models.Index(fields=['pedido', 'alterado_em'], name='historico_status_pedido_idx')],
+            },
+        ),
+    ]
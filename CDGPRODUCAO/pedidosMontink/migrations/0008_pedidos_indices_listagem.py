@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0007_historico_status_pedido'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['status', 'criado_em'], name='pedidos_status_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['criado_em'], name='pedidos_criado_em_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['sku'], name='pedidos_sku_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pedidosMontink', '0008_pedidos_indices_listagem'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='webhookstatuspendente',
+            name='situacao',
+            field=models.CharField(choices=[('pendente', 'Pendente'), ('enviando', 'Enviando'), ('enviado', 'Enviado'), ('falhou', 'Falhou'), ('obsoleto', 'Obsoleto')], default='pendente', max_length=10),
+        ),
+    ]
@@ -1,11 +1,17 @@
 from .webhook_pedido import Pedido, StatusPedido
+from .item_pedido import ItemPedido
+from .historico_status_pedido import HistoricoStatusPedido
 from .webhook_config import WebhookEndpointConfig, WebhookConfig, Webhook, WebhookStatusEnviado
+from .webhook_status_pendente import WebhookStatusPendente
 
 __all__ = [
     'WebhookEndpointConfig',
     'WebhookConfig',
     'Webhook', 
     'Pedido',
+    'ItemPedido',
     'StatusPedido',
+    'HistoricoStatusPedido',
     'WebhookStatusEnviado',
+    'WebhookStatusPendente',
 ]
@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils import timezone
+
+
+class HistoricoStatusPedido(models.Model):
+    """
+    Registro de cada alteração de status de um pedido.
+    """
+    pedido = models.ForeignKey('Pedido', on_delete=models.CASCADE, related_name='historico_status')
+    status_anterior = models.ForeignKey(
+        'StatusPedido', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    status_novo = models.ForeignKey('StatusPedido', on_delete=models.PROTECT, related_name='+')
+    alterado_em = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Pedido {self.pedido_id}: {self.status_anterior_id} -> {self.status_novo_id}"
+
+    class Meta:
+        verbose_name = "Histórico de Status do Pedido"
+        verbose_name_plural = "Históricos de Status dos Pedidos"
+        ordering = ['-alterado_em', '-id']
+        indexes = [
+            models.Index(fields=['pedido', 'alterado_em'], name='historico_status_pedido_idx'),
+        ]
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class ItemPedido(models.Model):
+    """
+    Produto de um pedido.
+
+    Cada produto recebido no webhook (lista `produtos`) vira um item, na ordem em
+    que veio no payload. Os dados de endereço e cliente ficam só no Pedido.
+    """
+    pedido = models.ForeignKey('Pedido', on_delete=models.CASCADE, related_name='itens')
+    ordem = models.PositiveIntegerField(default=0, help_text="Posição do produto na lista recebida")
+
+    # Dados do produto
+    nome = models.CharField(max_length=255)
+    sku = models.CharField(max_length=100, db_index=True)
+    quantidade = models.IntegerField()
+    id_sku = models.IntegerField(null=True, blank=True)
+    arquivo_pdf = models.URLField(null=True, blank=True)
+
+    # Design
+    design_capa_frente = models.URLField()
+    design_capa_verso = models.URLField(blank=True, null=True)
+
+    # Mockup
+    mockup_capa_frente = models.URLField()
+    mockup_capa_costas = models.URLField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.nome} ({self.sku}) x{self.quantidade}"
+
+    class Meta:
+        db_table = 'pedidos_itens'
+        verbose_name = "Item de Pedido"
+        verbose_name_plural = "Itens de Pedido"
+        ordering = ['pedido_id', 'ordem']
+        constraints = [
+            models.UniqueConstraint(fields=['pedido', 'ordem'], name='item_pedido_ordem_unica'),
+        ]
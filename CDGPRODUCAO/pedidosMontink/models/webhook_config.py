@@ -1,3 +1,4 @@
+import hashlib
 from django.db import models
 from .webhook_pedido import Pedido
 
@@ -24,6 +25,10 @@ class WebhookEndpointConfig(models.Model):
         blank=True, null=True, 
         help_text="Cabeçalhos adicionais em formato JSON (por exemplo: {'X-Custom': 'Value'})"
     )
+    timeout_segundos = models.FloatField(
+        default=10,
+        help_text="Tempo máximo de espera pela resposta deste endpoint, em segundos"
+    )
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
     
@@ -56,6 +61,19 @@ class Webhook(models.Model):
     status_code = models.IntegerField(null=True, blank=True, help_text="Código de status HTTP do processamento")
     erro = models.TextField(null=True, blank=True, help_text="Mensagem de erro, se houver")
     processado = models.BooleanField(default=False, help_text="Indica se o webhook foi processado com sucesso")
+    payload_sha256 = models.CharField(max_length=64, blank=True, default='', db_index=True, help_text="SHA-256 do payload, para detectar reenvios")
+
+    @staticmethod
+    def calcular_sha256(payload):
+        """Calcula o SHA-256 (hex) do payload, em bytes ou texto."""
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def save(self, *args, **kwargs):
+        if not self.payload_sha256 and self.payload:
+            self.payload_sha256 = self.calcular_sha256(self.payload)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         if self.status_code:
@@ -34,7 +34,7 @@ class Pedido(models.Model):
     telefone_info_adicional = models.CharField(max_length=20)
     email_info_adicional = models.EmailField()
 
-    # Dados do produto (limitado a 1 produto por pedido – necessário se for uma única tabela)
+    # Dados do primeiro produto (resumo para listagens; todos os produtos ficam em ItemPedido)
     nome_produto = models.CharField(max_length=255)
     sku = models.CharField(max_length=100)
     quantidade = models.IntegerField()
@@ -59,6 +59,12 @@ class Pedido(models.Model):
     class Meta:
         db_table = 'pedidos'  # define o nome fixo da tabela
         ordering = ['-criado_em']
+        indexes = [
+            # Listagem filtrada por status e período, ordenada por criado_em
+            models.Index(fields=['status', 'criado_em'], name='pedidos_status_criado_idx'),
+            models.Index(fields=['criado_em'], name='pedidos_criado_em_idx'),
+            models.Index(fields=['sku'], name='pedidos_sku_idx'),
+        ]
 
 
 from django.db import models
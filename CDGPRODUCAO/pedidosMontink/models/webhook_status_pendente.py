@@ -0,0 +1,51 @@
+from django.db import models
+from django.utils import timezone
+
+
+class WebhookStatusPendente(models.Model):
+    """
+    Fila (outbox) dos webhooks de status a enviar.
+
+    Uma linha por pedido e endpoint é gravada na mesma transação que altera o
+    status do pedido; o envio é feito depois pelo comando `enviar_webhooks_status`,
+    que registra cada tentativa em WebhookStatusEnviado e reagenda as falhas.
+    """
+    SITUACAO_PENDENTE = 'pendente'
+    SITUACAO_ENVIANDO = 'enviando'
+    SITUACAO_ENVIADO = 'enviado'
+    SITUACAO_FALHOU = 'falhou'
+    # Substituído por um status mais recente do mesmo pedido para o mesmo endpoint
+    SITUACAO_OBSOLETO = 'obsoleto'
+    SITUACOES = [
+        (SITUACAO_PENDENTE, 'Pendente'),
+        (SITUACAO_ENVIANDO, 'Enviando'),
+        (SITUACAO_ENVIADO, 'Enviado'),
+        (SITUACAO_FALHOU, 'Falhou'),
+        (SITUACAO_OBSOLETO, 'Obsoleto'),
+    ]
+
+    pedido = models.ForeignKey('Pedido', on_delete=models.CASCADE, related_name='webhooks_pendentes')
+    endpoint = models.ForeignKey('WebhookEndpointConfig', on_delete=models.CASCADE, related_name='webhooks_pendentes')
+
+    # Status no momento da alteração (o pedido pode mudar de novo antes do envio)
+    status_id = models.IntegerField()
+    status = models.CharField(max_length=50)
+    data_evento = models.DateTimeField(help_text="Data da alteração de status enviada no payload")
+
+    situacao = models.CharField(max_length=10, choices=SITUACOES, default=SITUACAO_PENDENTE)
+    tentativas = models.IntegerField(default=0)
+    proxima_tentativa_em = models.DateTimeField(default=timezone.now)
+    ultimo_erro = models.TextField(null=True, blank=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Status {self.status} do pedido {self.pedido_id} para {self.endpoint_id} - {self.situacao}"
+
+    class Meta:
+        verbose_name = "Webhook de Status Pendente"
+        verbose_name_plural = "Webhooks de Status Pendentes"
+        ordering = ['proxima_tentativa_em', 'id']
+        indexes = [
+            models.Index(fields=['situacao', 'proxima_tentativa_em'], name='webhook_pendente_fila_idx'),
+        ]
@@ -0,0 +1,153 @@
+import base64
+import binascii
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .services.pedido_service import PedidoService
+
+
+class PedidoPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PedidoCursorPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) da listagem de pedidos (?paginacao=cursor).
+
+    Cada página é buscada a partir da posição (campo de ordenação, id) do último
+    pedido da página anterior, sem OFFSET, então o custo não cresce com a
+    profundidade da página. Aceita as ordenações de ORDENACOES (padrão: -criado_em).
+
+    O total é opcional (?total=nenhum|estimado|exato, padrão nenhum); ver
+    PedidoService.contar_pedidos.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+
+    # ordering aceito -> (campo da posição, decrescente)
+    ORDENACOES = {
+        '-criado_em': ('criado_em', True),
+        'criado_em': ('criado_em', False),
+        '-status__ordem': ('status__ordem', True),
+        'status__ordem': ('status__ordem', False),
+    }
+    ordenacao_padrao = '-criado_em'
+
+    # Parâmetros que não mudam o conjunto filtrado (não entram na chave do total)
+    PARAMETROS_PAGINACAO = ('cursor', 'page', 'page_size', 'paginacao', 'total', 'ordering')
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    @classmethod
+    def chave_filtros(cls, request):
+        """Combinação de filtros da requisição, usada como chave do total em cache."""
+        return sorted(
+            (parametro, valor)
+            for parametro, valores in request.query_params.lists()
+            if parametro not in cls.PARAMETROS_PAGINACAO
+            for valor in valores
+        )
+
+    @staticmethod
+    def valor_posicao(pedido, campo):
+        valor = pedido
+        for parte in campo.split('__'):
+            valor = getattr(valor, parte)
+        return valor.isoformat() if campo == 'criado_em' else valor
+
+    @staticmethod
+    def codificar_cursor(ordenacao, valor, id_pedido):
+        """Codifica a posição de um pedido como cursor opaco."""
+        posicao = json.dumps([ordenacao, valor, id_pedido])
+        return base64.urlsafe_b64encode(posicao.encode()).decode()
+
+    @staticmethod
+    def decodificar_cursor(cursor, ordenacao):
+        """Decodifica um cursor em (valor, id), conferindo se foi gerado para a mesma ordenação."""
+        try:
+            ordenacao_cursor, valor, id_pedido = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            id_pedido = int(id_pedido)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise NotFound("Cursor inválido")
+        if ordenacao_cursor != ordenacao:
+            raise NotFound("Cursor inválido para esta ordenação")
+        if ordenacao.lstrip('-') == 'criado_em':
+            valor = parse_datetime(valor) if isinstance(valor, str) else None
+            if valor is None:
+                raise NotFound("Cursor inválido")
+        return valor, id_pedido
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        ordenacao = request.query_params.get('ordering') or self.ordenacao_padrao
+        if ordenacao not in self.ORDENACOES:
+            raise ValidationError({
+                "erro": f"ordering não suportado na paginação por cursor. Use um destes: {', '.join(self.ORDENACOES)}"
+            })
+        modo_total = request.query_params.get(self.total_query_param) or PedidoService.TOTAL_NENHUM
+        if modo_total not in PedidoService.MODOS_TOTAL:
+            raise ValidationError({
+                "erro": f"total inválido. Use um destes: {', '.join(PedidoService.MODOS_TOTAL)}"
+            })
+
+        # O total considera todos os pedidos filtrados, não só os depois do cursor
+        self.total = PedidoService.contar_pedidos(queryset, self.chave_filtros(request), modo_total)
+
+        campo, decrescente = self.ORDENACOES[ordenacao]
+        sentido = '-' if decrescente else ''
+        queryset = queryset.order_by(f'{sentido}{campo}', f'{sentido}id')
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            valor, id_pedido = self.decodificar_cursor(cursor, ordenacao)
+            comparacao = 'lt' if decrescente else 'gt'
+            # O limite redundante (<= ou >=) permite ao banco iniciar a leitura do
+            # índice na posição do cursor; só com o OR ele percorreria o índice desde o início
+            queryset = queryset.filter(**{f'{campo}__{comparacao}e': valor}).filter(
+                Q(**{f'{campo}__{comparacao}': valor}) | Q(**{campo: valor, f'id__{comparacao}': id_pedido})
+            )
+
+        # Busca um registro a mais para saber se existe uma próxima página
+        pedidos = list(queryset[:page_size + 1])
+        tem_proxima = len(pedidos) > page_size
+        pedidos = pedidos[:page_size]
+
+        self.proximo_cursor = None
+        if tem_proxima:
+            ultimo = pedidos[-1]
+            self.proximo_cursor = self.codificar_cursor(ordenacao, self.valor_posicao(ultimo, campo), ultimo.id)
+        return pedidos
+
+    def get_next_link(self):
+        if not self.proximo_cursor:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.proximo_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'total': self.total,
+            'results': data
+        })
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from ..models.webhook_pedido import Pedido, StatusPedido
+from ..models.item_pedido import ItemPedido
 
 
 class StatusPedidoSerializer(serializers.ModelSerializer):
@@ -8,9 +9,24 @@ class StatusPedidoSerializer(serializers.ModelSerializer):
         fields = ['id', 'nome', 'descricao', 'cor_css', 'ordem']
 
 
+class ItemPedidoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ItemPedido
+        fields = [
+            'id', 'ordem', 'nome', 'sku', 'quantidade', 'id_sku', 'arquivo_pdf',
+            'design_capa_frente', 'design_capa_verso', 'mockup_capa_frente',
+            'mockup_capa_costas'
+        ]
+
+
 class PedidoSerializer(serializers.ModelSerializer):
+    """
+    Serializer completo do pedido, com os itens.
+    Use com um queryset que faça prefetch_related('itens') (ver PedidoService).
+    """
     status_nome = serializers.CharField(source='status.nome', read_only=True)
     status_cor = serializers.CharField(source='status.cor_css', read_only=True)
+    itens = ItemPedidoSerializer(many=True, read_only=True)
     
     class Meta:
         model = Pedido
@@ -23,22 +39,39 @@ class PedidoSerializer(serializers.ModelSerializer):
             'nome_info_adicional', 'telefone_info_adicional', 'email_info_adicional',
             'nome_produto', 'sku', 'quantidade', 'id_sku', 'arquivo_pdf_produto',
             'design_capa_frente', 'design_capa_verso', 'mockup_capa_frente',
-            'mockup_capa_costas', 'criado_em', 'atualizado_em'
+            'mockup_capa_costas', 'itens', 'criado_em', 'atualizado_em'
         ]
         read_only_fields = ['criado_em', 'atualizado_em']
 
 
 class PedidoListSerializer(serializers.ModelSerializer):
     """
-    Serializer simplificado para listagem de pedidos
+    Serializer simplificado para listagem de pedidos.
+    total_itens e quantidade_total vêm das anotações de PedidoService.listar_pedidos.
     """
     status_nome = serializers.CharField(source='status.nome', read_only=True)
     status_cor = serializers.CharField(source='status.cor_css', read_only=True)
+    itens = ItemPedidoSerializer(many=True, read_only=True)
+    total_itens = serializers.IntegerField(read_only=True)
+    quantidade_total = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Pedido
         fields = [
             'id', 'titulo', 'valor_pedido', 'numero_pedido', 'nome_cliente',
             'email_cliente', 'status', 'status_nome', 'status_cor',
-            'nome_produto', 'sku', 'quantidade', 'metodo_envio', 'criado_em', 'atualizado_em'
-        ]
\ No newline at end of file
+            'nome_produto', 'sku', 'quantidade', 'itens', 'total_itens', 'quantidade_total',
+            'metodo_envio', 'criado_em', 'atualizado_em'
+        ]
+
+
+class ColunaQuadroSerializer(serializers.Serializer):
+    """
+    Coluna do quadro de pedidos (QuadroPedidosService.montar_quadro): o status,
+    os totais do status e os primeiros pedidos.
+    """
+    status = StatusPedidoSerializer(read_only=True)
+    total = serializers.IntegerField(read_only=True)
+    valor_total = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    quantidade_total = serializers.IntegerField(read_only=True)
+    pedidos = PedidoListSerializer(many=True, read_only=True)
@@ -1,2 +1,6 @@
 from .webhook_service import *
 from .pedido_service import *
+from .configuracao_cache_service import *
+from .envio_status_service import *
+from .quadro_pedidos_service import *
+from .exportacao_service import *
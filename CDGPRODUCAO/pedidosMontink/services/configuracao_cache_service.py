@@ -0,0 +1,112 @@
+import logging
+import threading
+from django.core.cache import cache
+from django.db import transaction
+from pedidosMontink.models import WebhookConfig, WebhookEndpointConfig, StatusPedido
+
+logger = logging.getLogger(__name__)
+
+
+class ConfiguracaoCacheService:
+    """
+    Cache no processo das configurações que quase nunca mudam e são lidas a cada
+    webhook recebido ou status alterado: a WebhookConfig ativa, o status
+    "Pedido Novo" e os endpoints de envio de status.
+
+    Os valores ficam na memória do processo, junto com o número de versão em que
+    foram carregados. A versão atual fica no cache do Django e é incrementada pelos
+    sinais post_save/post_delete desses modelos (pedidosMontink/signals.py); quando
+    um processo percebe que a versão mudou, descarta os seus valores e os recarrega.
+    Com o cache 'locmem' a versão só é vista pelo próprio processo; com 'file' ou
+    'redis' as alterações feitas em um processo invalidam todos os outros.
+
+    Alterações feitas com queryset.update() não disparam sinais; nesse caso chame
+    `invalidar()` manualmente.
+    """
+    CHAVE_VERSAO = 'pedidos:configuracao:versao'
+
+    _lock = threading.Lock()
+    _valores = {}
+    _versao = None
+
+    @classmethod
+    def _versao_atual(cls):
+        versao = cache.get(cls.CHAVE_VERSAO)
+        if versao is None:
+            # add só cria a versão se nenhum outro processo a criou antes
+            cache.add(cls.CHAVE_VERSAO, 1, timeout=None)
+            versao = cache.get(cls.CHAVE_VERSAO, 1)
+        return versao
+
+    @classmethod
+    def obter(cls, chave, carregar):
+        """
+        Retorna o valor da chave, chamando `carregar()` se ele não estiver em cache
+        ou se a versão tiver mudado.
+        """
+        versao = cls._versao_atual()
+        with cls._lock:
+            if versao != cls._versao:
+                cls._valores = {}
+                cls._versao = versao
+            if chave in cls._valores:
+                return cls._valores[chave]
+
+        valor = carregar()
+        with cls._lock:
+            # Não guarda um valor carregado antes de uma invalidação concorrente
+            if cls._versao == versao:
+                cls._valores[chave] = valor
+        return valor
+
+    @classmethod
+    def invalidar(cls):
+        """
+        Descarta as configurações em cache em todos os processos, depois do commit
+        da transação atual (ou imediatamente, fora de uma transação).
+
+        Incrementar a versão antes do commit deixaria outro processo recarregar a
+        linha antiga e guardá-la com a versão nova, sem expirar até a próxima alteração.
+        """
+        transaction.on_commit(cls._incrementar_versao)
+
+    @classmethod
+    def _incrementar_versao(cls):
+        try:
+            cache.add(cls.CHAVE_VERSAO, 1, timeout=None)
+            cache.incr(cls.CHAVE_VERSAO)
+        except ValueError:
+            # A versão foi removida do cache entre o add e o incr
+            cache.set(cls.CHAVE_VERSAO, 1, timeout=None)
+        with cls._lock:
+            cls._valores = {}
+            cls._versao = None
+        logger.debug("Cache de configurações de pedidos invalidado")
+
+    @classmethod
+    def obter_webhook_config(cls):
+        """WebhookConfig ativa, ou None se não houver."""
+        return cls.obter('webhook_config', lambda: WebhookConfig.objects.filter(ativo=True).first())
+
+    @classmethod
+    def obter_status_pedido_novo(cls):
+        """Status "Pedido Novo", criando-o se ainda não existir."""
+        def carregar():
+            status_novo, _ = StatusPedido.objects.get_or_create(
+                nome="Pedido Novo",
+                defaults={
+                    'descricao': "Pedido recém recebido via webhook",
+                    'cor_css': "#3498db",
+                    'ordem': 1,
+                }
+            )
+            return status_novo
+        return cls.obter('status_pedido_novo', carregar)
+
+    @classmethod
+    def obter_endpoints_status(cls):
+        """Endpoints ativos que recebem automaticamente as alterações de status."""
+        return cls.obter(
+            'endpoints_status',
+            lambda: list(WebhookEndpointConfig.objects.filter(ativo=True, auto_enviar=True))
+        )
@@ -0,0 +1,378 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from pedidosMontink.models import WebhookStatusEnviado, WebhookStatusPendente
+from pedidosMontink.services.configuracao_cache_service import ConfiguracaoCacheService
+
+logger = logging.getLogger(__name__)
+
+
+class EnvioStatusService:
+    """
+    Envio dos webhooks de status pela fila WebhookStatusPendente (outbox).
+
+    `enfileirar` é chamado dentro da transação que altera o status, então a
+    alteração e os envios pendentes são gravados juntos e a requisição HTTP não
+    espera pelos endpoints. O comando `enviar_webhooks_status` reserva os envios
+    pendentes, faz as requisições fora de qualquer transação, registra cada
+    tentativa em WebhookStatusEnviado e reagenda as falhas com espera exponencial.
+
+    As requisições de um lote são feitas em paralelo (até
+    PEDIDOS_STATUS_WEBHOOK_MAX_THREADS threads), com uma requests.Session por host
+    mantida no processo, para reaproveitar as conexões (keep-alive). Só as
+    requisições HTTP rodam nas threads; as gravações no banco ficam na thread
+    que chamou.
+    """
+    _lock = threading.Lock()
+    _sessoes = {}
+
+    @classmethod
+    def obter_sessao(cls, url):
+        """Sessão HTTP compartilhada do host (esquema + host + porta) da URL."""
+        partes = urlsplit(url)
+        chave = (partes.scheme, partes.netloc)
+        sessao = cls._sessoes.get(chave)
+        if sessao is None:
+            with cls._lock:
+                sessao = cls._sessoes.get(chave)
+                if sessao is None:
+                    sessao = requests.Session()
+                    adaptador = HTTPAdapter(pool_maxsize=settings.PEDIDOS_STATUS_WEBHOOK_MAX_THREADS)
+                    sessao.mount('http://', adaptador)
+                    sessao.mount('https://', adaptador)
+                    cls._sessoes[chave] = sessao
+        return sessao
+
+    @classmethod
+    def postar(cls, url, payload_json, headers, timeout):
+        """
+        Faz o POST de um webhook. Não acessa o banco, então pode rodar em outra thread.
+
+        Returns:
+            tuple: (sucesso, codigo_http, resposta)
+        """
+        try:
+            response = cls.obter_sessao(url).post(url, data=payload_json, headers=headers, timeout=timeout)
+            return response.ok, response.status_code, response.text[:1000]  # Limitamos o tamanho da resposta
+        except requests.RequestException as e:
+            return False, None, str(e)
+
+    @classmethod
+    def postar_em_paralelo(cls, requisicoes):
+        """
+        Faz os POSTs em paralelo; o tempo total é o do endpoint mais lento.
+
+        Args:
+            requisicoes (list): Tuplas (url, payload_json, headers, timeout)
+
+        Returns:
+            list: Resultados de `postar`, na mesma ordem das requisições
+        """
+        if len(requisicoes) <= 1:
+            return [cls.postar(*requisicao) for requisicao in requisicoes]
+        threads = min(len(requisicoes), settings.PEDIDOS_STATUS_WEBHOOK_MAX_THREADS)
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='webhook-status') as executor:
+            return list(executor.map(lambda requisicao: cls.postar(*requisicao), requisicoes))
+
+    @staticmethod
+    def enfileirar(pedidos, novo_status):
+        """
+        Grava um envio pendente por pedido e endpoint ativo de envio automático.
+
+        Os envios ainda pendentes dos mesmos pedidos são substituídos: cada endpoint
+        recebe só o status mais recente de cada pedido, mesmo que o status mude
+        várias vezes antes do envio (ou durante as novas tentativas). Um envio em
+        andamento não é removido aqui; se ele falhar, não é mais tentado (ver
+        `registrar_tentativa` e `reservar_pendentes`).
+
+        Args:
+            pedidos (iterable): Pedidos que mudaram de status (já salvos)
+            novo_status (StatusPedido): Novo status dos pedidos
+
+        Returns:
+            int: Quantidade de envios enfileirados
+        """
+        endpoints = ConfiguracaoCacheService.obter_endpoints_status()
+        if not endpoints:
+            return 0
+
+        pedidos = list(pedidos)
+        WebhookStatusPendente.objects.filter(
+            pedido_id__in=[pedido.id for pedido in pedidos],
+            endpoint__in=endpoints,
+            situacao=WebhookStatusPendente.SITUACAO_PENDENTE
+        ).delete()
+
+        agora = timezone.now()
+        pendentes = WebhookStatusPendente.objects.bulk_create([
+            WebhookStatusPendente(
+                pedido=pedido,
+                endpoint=endpoint,
+                status_id=novo_status.id,
+                status=novo_status.nome,
+                data_evento=pedido.atualizado_em or agora,
+                proxima_tentativa_em=agora
+            )
+            for pedido in pedidos
+            for endpoint in endpoints
+        ])
+        return len(pendentes)
+
+    @staticmethod
+    def envios_do_mesmo_pedido():
+        """
+        Outros envios do mesmo pedido para o mesmo endpoint que o envio de
+        OuterRef. O id indica a ordem: um id maior é de um status mais recente.
+        """
+        return WebhookStatusPendente.objects.filter(
+            pedido_id=OuterRef('pedido_id'),
+            endpoint_id=OuterRef('endpoint_id')
+        )
+
+    @staticmethod
+    def calcular_espera(tentativa):
+        """Segundos até a próxima tentativa depois da falha de número `tentativa`."""
+        espera = settings.PEDIDOS_STATUS_WEBHOOK_BACKOFF_BASE * (2 ** (tentativa - 1))
+        return min(espera, settings.PEDIDOS_STATUS_WEBHOOK_BACKOFF_MAXIMO)
+
+    @staticmethod
+    def montar_requisicao(endpoint, numero_pedido, status_id, status, data_evento, headers=None):
+        """
+        Monta o payload (texto JSON) e os headers do envio, no formato esperado
+        pelos endpoints: data, access_token e json, nesta ordem.
+
+        Args:
+            headers (dict): Headers já montados para o endpoint (ver `montar_headers`)
+
+        Returns:
+            tuple: (payload_json, headers)
+        """
+        if headers is None:
+            headers = EnvioStatusService.montar_headers(endpoint)
+        payload = {
+            "data": data_evento.isoformat(),
+            "access_token": endpoint.access_token or "",
+            "json": {
+                "casa_grafica_id": str(numero_pedido),
+                "status_id": status_id,
+                "status": status
+            }
+        }
+        return json.dumps(payload), headers
+
+    @staticmethod
+    def montar_headers(endpoint):
+        """Headers das requisições para o endpoint (autenticação e headers adicionais)."""
+        headers = {
+            'Content-Type': 'application/json',
+        }
+        if endpoint.token_autenticacao:
+            headers['Authorization'] = f'Bearer {endpoint.token_autenticacao}'
+        if endpoint.headers_adicionais:
+            try:
+                headers.update(json.loads(endpoint.headers_adicionais))
+            except json.JSONDecodeError:
+                logger.error(f"Headers adicionais inválidos para o endpoint {endpoint.nome}")
+        return headers
+
+    @staticmethod
+    def entregar(pendente):
+        """
+        Faz uma tentativa de envio de um único webhook pendente.
+
+        Returns:
+            bool: True se o endpoint aceitou o webhook
+        """
+        return EnvioStatusService.entregar_lote([pendente])[0]
+
+    @staticmethod
+    def entregar_lote(pendentes):
+        """
+        Faz uma tentativa de envio de cada webhook pendente, em paralelo, registra
+        os resultados em WebhookStatusEnviado e atualiza os envios pendentes
+        (enviados, reagendados ou falhos).
+
+        Returns:
+            list: Um bool por envio, True se o endpoint aceitou o webhook
+        """
+        requisicoes = []
+        ativos = []
+        headers_por_endpoint = {}
+        for pendente in pendentes:
+            endpoint = pendente.endpoint
+            # Headers montados uma vez por endpoint no lote
+            if endpoint.id not in headers_por_endpoint:
+                headers_por_endpoint[endpoint.id] = EnvioStatusService.montar_headers(endpoint)
+            payload_json, headers = EnvioStatusService.montar_requisicao(
+                endpoint, pendente.pedido.numero_pedido, pendente.status_id,
+                pendente.status, pendente.data_evento, headers=headers_por_endpoint[endpoint.id]
+            )
+            pendente.payload_json = payload_json
+            if endpoint.ativo:
+                requisicoes.append((endpoint.url, payload_json, headers, endpoint.timeout_segundos))
+                ativos.append(pendente)
+
+        respostas = dict(zip((pendente.pk for pendente in ativos), EnvioStatusService.postar_em_paralelo(requisicoes)))
+        return [
+            EnvioStatusService.registrar_tentativa(
+                pendente, *respostas.get(pendente.pk, (False, None, "Endpoint desativado"))
+            )
+            for pendente in pendentes
+        ]
+
+    @staticmethod
+    def registrar_tentativa(pendente, sucesso, codigo_http, resposta):
+        """
+        Registra o resultado de uma tentativa de envio e reagenda o envio em caso de falha.
+
+        Returns:
+            bool: `sucesso`
+        """
+        endpoint = pendente.endpoint
+        tentativa = pendente.tentativas + 1
+        WebhookStatusEnviado.objects.create(
+            pedido_id=pendente.pedido_id,
+            status=pendente.status,
+            url_destino=endpoint.url,
+            payload=pendente.payload_json,
+            resposta=resposta,
+            codigo_http=codigo_http,
+            sucesso=sucesso,
+            tentativa_numero=tentativa
+        )
+
+        pendente.tentativas = tentativa
+        if sucesso:
+            pendente.situacao = WebhookStatusPendente.SITUACAO_ENVIADO
+            pendente.ultimo_erro = None
+            logger.info(f"Webhook de status do pedido #{pendente.pedido_id} enviado para {endpoint.nome}")
+        else:
+            pendente.ultimo_erro = f"HTTP {codigo_http}: {resposta[:500]}" if codigo_http else resposta
+            substituido = WebhookStatusPendente.objects.filter(
+                pedido_id=pendente.pedido_id, endpoint_id=pendente.endpoint_id, id__gt=pendente.id
+            ).exists()
+            if substituido:
+                # O status mudou durante o envio; uma nova tentativa poderia chegar
+                # depois do status mais recente e sobrescrevê-lo no endpoint
+                pendente.situacao = WebhookStatusPendente.SITUACAO_OBSOLETO
+                logger.info(
+                    f"Webhook de status do pedido #{pendente.pedido_id} para {endpoint.nome} "
+                    f"não será reenviado: há um status mais recente na fila"
+                )
+            elif not endpoint.ativo or tentativa >= settings.PEDIDOS_STATUS_WEBHOOK_MAX_TENTATIVAS:
+                pendente.situacao = WebhookStatusPendente.SITUACAO_FALHOU
+                logger.error(
+                    f"Webhook de status do pedido #{pendente.pedido_id} para {endpoint.nome} "
+                    f"desistido após {tentativa} tentativa(s): {pendente.ultimo_erro}"
+                )
+            else:
+                espera = EnvioStatusService.calcular_espera(tentativa)
+                pendente.situacao = WebhookStatusPendente.SITUACAO_PENDENTE
+                pendente.proxima_tentativa_em = timezone.now() + timedelta(seconds=espera)
+                logger.warning(
+                    f"Falha ao enviar webhook de status do pedido #{pendente.pedido_id} para {endpoint.nome} "
+                    f"(tentativa {tentativa}); nova tentativa em {espera}s"
+                )
+        pendente.save(update_fields=['situacao', 'tentativas', 'proxima_tentativa_em', 'ultimo_erro', 'atualizado_em'])
+        return sucesso
+
+    @staticmethod
+    def reservar_pendentes(tamanho_lote):
+        """
+        Reserva para este worker até `tamanho_lote` envios com a tentativa vencida.
+
+        Cada reserva é um UPDATE condicional na situação, então dois workers nunca
+        enviam o mesmo webhook, mesmo sem SELECT FOR UPDATE (SQLite).
+
+        Para que cada endpoint termine com o status mais recente de cada pedido, os
+        envios que já têm um envio mais novo do mesmo pedido e endpoint viram
+        obsoletos, e um envio só é reservado depois que o envio anterior do mesmo
+        pedido e endpoint terminou.
+
+        Returns:
+            list: Envios reservados, com pedido e endpoint carregados
+        """
+        mesmo_pedido = EnvioStatusService.envios_do_mesmo_pedido()
+        vencidos = WebhookStatusPendente.objects.filter(
+            situacao=WebhookStatusPendente.SITUACAO_PENDENTE,
+            proxima_tentativa_em__lte=timezone.now()
+        )
+        vencidos.filter(Exists(mesmo_pedido.filter(id__gt=OuterRef('id')))).update(
+            situacao=WebhookStatusPendente.SITUACAO_OBSOLETO
+        )
+        ids = list(
+            vencidos.exclude(Exists(mesmo_pedido.filter(
+                id__lt=OuterRef('id'), situacao=WebhookStatusPendente.SITUACAO_ENVIANDO
+            ))).order_by('proxima_tentativa_em', 'id').values_list('id', flat=True)[:tamanho_lote]
+        )
+        reservados = [
+            pendente_id for pendente_id in ids
+            if WebhookStatusPendente.objects.filter(
+                pk=pendente_id, situacao=WebhookStatusPendente.SITUACAO_PENDENTE
+            ).update(situacao=WebhookStatusPendente.SITUACAO_ENVIANDO)
+        ]
+        return list(
+            WebhookStatusPendente.objects.filter(pk__in=reservados)
+            .select_related('pedido', 'endpoint')
+            .order_by('proxima_tentativa_em', 'id')
+        )
+
+    @staticmethod
+    def liberar_travados():
+        """
+        Devolve para a fila os envios que ficaram em andamento (por exemplo, quando
+        o worker foi interrompido). Só deve ser usado sem outros workers rodando.
+
+        Returns:
+            int: Quantidade de envios liberados
+        """
+        return WebhookStatusPendente.objects.filter(
+            situacao=WebhookStatusPendente.SITUACAO_ENVIANDO
+        ).update(situacao=WebhookStatusPendente.SITUACAO_PENDENTE)
+
+    @staticmethod
+    def processar_pendentes(tamanho_lote=None, limite=None):
+        """
+        Envia os webhooks pendentes em lotes até não haver tentativas vencidas ou
+        atingir o limite.
+
+        Returns:
+            tuple: (enviados, falhas)
+        """
+        tamanho_lote = tamanho_lote or settings.PEDIDOS_STATUS_WEBHOOK_TAMANHO_LOTE
+        enviados = falhas = 0
+        while limite is None or enviados + falhas < limite:
+            if limite is not None:
+                tamanho_lote = min(tamanho_lote, limite - enviados - falhas)
+            pendentes = EnvioStatusService.reservar_pendentes(tamanho_lote)
+            if not pendentes:
+                break
+
+            try:
+                resultados = EnvioStatusService.entregar_lote(pendentes)
+            except Exception as e:
+                # Erro inesperado: devolve o lote para a fila para não deixar envios travados
+                logger.error(f"Erro ao enviar o lote de webhooks de status: {str(e)}")
+                WebhookStatusPendente.objects.filter(
+                    pk__in=[pendente.pk for pendente in pendentes],
+                    situacao=WebhookStatusPendente.SITUACAO_ENVIANDO
+                ).update(
+                    situacao=WebhookStatusPendente.SITUACAO_PENDENTE,
+                    proxima_tentativa_em=timezone.now() + timedelta(
+                        seconds=EnvioStatusService.calcular_espera(1)
+                    ),
+                    ultimo_erro=str(e)
+                )
+                resultados = [False] * len(pendentes)
+            enviados += sum(1 for sucesso in resultados if sucesso)
+            falhas += sum(1 for sucesso in resultados if not sucesso)
+
+        return enviados, falhas
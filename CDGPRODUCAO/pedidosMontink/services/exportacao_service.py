@@ -0,0 +1,64 @@
+import logging
+from django.conf import settings
+from busca.services.busca_service import BuscaService
+from pedidosMontink.services.pedido_service import PedidoService
+
+logger = logging.getLogger(__name__)
+
+
+class ExportacaoPedidosService:
+    """
+    Exportação de pedidos em CSV ou NDJSON (config/exportacao.py).
+
+    Os pedidos são lidos com iterator(chunk_size=EXPORTACAO_TAMANHO_LOTE): o
+    status vem no join e os itens em uma consulta de prefetch por lote, então a
+    memória usada não depende da quantidade de pedidos exportados.
+
+    No CSV cada pedido é uma linha; no NDJSON o pedido traz também a lista de itens.
+    """
+    COLUNAS = (
+        'id', 'numero_pedido', 'titulo', 'status', 'valor_pedido', 'custo_envio', 'metodo_envio',
+        'nome_cliente', 'documento_cliente', 'email_cliente',
+        'nome_destinatario', 'endereco', 'numero', 'complemento', 'bairro', 'cidade', 'uf', 'cep',
+        'pais', 'telefone_destinatario',
+        'nome_produto', 'sku', 'quantidade', 'total_itens', 'quantidade_total',
+        'criado_em', 'atualizado_em',
+    )
+
+    @staticmethod
+    def filtrar(filtros=None, texto=None):
+        """
+        Pedidos a exportar, com os mesmos filtros de PedidoService.listar_pedidos e
+        a busca textual opcional, dos mais recentes para os mais antigos. A busca
+        mantém todos os pedidos encontrados (BuscaService.filtro).
+        """
+        queryset = PedidoService.listar_pedidos(filtros).order_by('-criado_em', '-id')
+        if texto:
+            queryset = queryset.filter(BuscaService.filtro(BuscaService.TIPO_PEDIDO, texto))
+        return queryset
+
+    @classmethod
+    def registro(cls, pedido):
+        """Dict exportado de um pedido (de listar_pedidos, com os itens pré-carregados)."""
+        registro = {coluna: getattr(pedido, coluna, None) for coluna in cls.COLUNAS}
+        registro['status'] = pedido.status.nome
+        registro['itens'] = [
+            {
+                'nome': item.nome,
+                'sku': item.sku,
+                'quantidade': item.quantidade,
+                'id_sku': item.id_sku,
+                'arquivo_pdf': item.arquivo_pdf,
+            }
+            for item in pedido.itens.all()
+        ]
+        return registro
+
+    @classmethod
+    def registros(cls, queryset, tamanho_lote=None):
+        """
+        Percorre os pedidos do queryset em lotes, gerando um registro por pedido.
+        """
+        tamanho_lote = tamanho_lote or settings.EXPORTACAO_TAMANHO_LOTE
+        for pedido in queryset.iterator(chunk_size=tamanho_lote):
+            yield cls.registro(pedido)
@@ -1,26 +1,71 @@
 from ..models.webhook_pedido import Pedido, StatusPedido
+from ..models.item_pedido import ItemPedido
+from ..models.historico_status_pedido import HistoricoStatusPedido
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
-from ..views.webhook_enviar import WebhookService
+from django.utils import timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 class PedidoService:
+    # Modos de busca por número do pedido e SKU (parâmetro modo_busca)
+    MODO_EXATO = 'exato'
+    MODO_PREFIXO = 'prefixo'
+    MODO_CONTEM = 'contem'
+    MODOS_BUSCA = (MODO_EXATO, MODO_PREFIXO, MODO_CONTEM)
+    
+    # Maior valor de numero_pedido (IntegerField)
+    NUMERO_PEDIDO_MAXIMO = 2147483647
+    
+    # Modos de cálculo do total da listagem paginada por cursor (parâmetro total)
+    TOTAL_NENHUM = 'nenhum'
+    TOTAL_ESTIMADO = 'estimado'
+    TOTAL_EXATO = 'exato'
+    MODOS_TOTAL = (TOTAL_NENHUM, TOTAL_ESTIMADO, TOTAL_EXATO)
+    
     @staticmethod
     def listar_pedidos(filtros=None):
         """
-        Lista todos os pedidos com filtros opcionais
+        Lista todos os pedidos com filtros opcionais.
+        
+        Os itens vêm em uma única consulta extra (prefetch) para a página inteira, e
+        a quantidade de itens e a soma das quantidades são calculadas no banco
+        (total_itens e quantidade_total) com subconsultas, só para os pedidos da
+        página.
+        
+        Número do pedido e SKU são buscados conforme filtros['modo_busca']:
+        'exato', 'prefixo' (padrão) ou 'contem'. Os dois primeiros usam os índices
+        de numero_pedido e de ItemPedido.sku; 'contem' (o comportamento antigo,
+        icontains) percorre a tabela inteira.
         """
-        queryset = Pedido.objects.select_related('status')
+        itens = ItemPedido.objects.filter(pedido=OuterRef('pk')).order_by().values('pedido')
+        queryset = PedidoService.pedidos_com_itens().annotate(
+            total_itens=Coalesce(Subquery(itens.annotate(total=Count('id')).values('total')), 0),
+            quantidade_total=Coalesce(Subquery(itens.annotate(total=Sum('quantidade')).values('total')), 0)
+        )
         
         if filtros:
-            # Implementar filtros conforme necessário
-            if 'numero_pedido' in filtros and filtros['numero_pedido']:
-                queryset = queryset.filter(numero_pedido__icontains=filtros['numero_pedido'])
+            modo = filtros.get('modo_busca') or PedidoService.MODO_PREFIXO
+            
+            numero_pedido = str(filtros.get('numero_pedido') or '').strip()
+            if numero_pedido:
+                queryset = queryset.filter(PedidoService.filtro_numero_pedido(numero_pedido, modo))
             
-            if 'sku' in filtros and filtros['sku']:
-                queryset = queryset.filter(sku__icontains=filtros['sku'])
+            sku = (filtros.get('sku') or '').strip()
+            if sku:
+                # Qualquer item do pedido. IN (subconsulta) para não duplicar linhas e
+                # para o banco partir do índice de ItemPedido.sku
+                queryset = queryset.filter(id__in=ItemPedido.objects.filter(
+                    PedidoService.filtro_texto('sku', sku, modo)
+                ).values('pedido_id'))
             
             if 'status' in filtros and filtros['status']:
                 queryset = queryset.filter(status=filtros['status'])
@@ -33,21 +78,117 @@ class PedidoService:
         
         return queryset
     
+    @staticmethod
+    def filtro_numero_pedido(valor, modo):
+        """
+        Condição de busca por número do pedido.
+        
+        No modo 'prefixo', "123" vira os intervalos 123, 1230-1239, 12300-12399...
+        até o maior número possível, que usam o índice único de numero_pedido
+        (ao contrário de icontains, que converte cada linha para texto).
+        
+        Returns:
+            Q: Condição para Pedido
+        """
+        if modo == PedidoService.MODO_CONTEM:
+            return Q(numero_pedido__icontains=valor)
+        if not valor.isdigit():
+            return Q(pk__in=[])
+        if modo == PedidoService.MODO_EXATO:
+            return Q(numero_pedido=int(valor))
+        
+        # Nenhum número começa com zero (exceto o próprio zero)
+        if valor.startswith('0'):
+            return Q(numero_pedido=0) if int(valor) == 0 else Q(pk__in=[])
+        condicao = Q(pk__in=[])
+        inicio, fim = int(valor), int(valor)
+        while inicio <= PedidoService.NUMERO_PEDIDO_MAXIMO:
+            condicao |= Q(numero_pedido__range=(inicio, min(fim, PedidoService.NUMERO_PEDIDO_MAXIMO)))
+            inicio, fim = inicio * 10, fim * 10 + 9
+        return condicao
+    
+    @staticmethod
+    def filtro_texto(campo, valor, modo):
+        """
+        Condição de busca em um campo de texto indexado (ex.: sku).
+        
+        O modo 'prefixo' usa o intervalo [valor, próximo valor) em vez de LIKE, para
+        o banco poder usar o índice do campo. 'exato' e 'prefixo' diferenciam
+        maiúsculas de minúsculas; 'contem' não.
+        
+        Returns:
+            Q: Condição para o campo
+        """
+        if modo == PedidoService.MODO_CONTEM:
+            return Q(**{f'{campo}__icontains': valor})
+        if modo == PedidoService.MODO_EXATO:
+            return Q(**{campo: valor})
+        limite = valor[:-1] + chr(ord(valor[-1]) + 1)
+        return Q(**{f'{campo}__gte': valor, f'{campo}__lt': limite})
+    
+    @staticmethod
+    def contar_pedidos(queryset, chave_filtros, modo=TOTAL_EXATO):
+        """
+        Total de pedidos de uma listagem filtrada.
+        
+        - 'nenhum': não conta (None).
+        - 'exato': COUNT(*), guardado em cache por PEDIDOS_TOTAL_CACHE_TIMEOUT
+          segundos para cada combinação de filtros (chave_filtros).
+        - 'estimado': no PostgreSQL, a estimativa do planejador (EXPLAIN), sem
+          percorrer a tabela; nos demais bancos, igual a 'exato'.
+        
+        Returns:
+            int ou None: Total de pedidos
+        """
+        if modo == PedidoService.TOTAL_NENHUM:
+            return None
+        if modo == PedidoService.TOTAL_ESTIMADO and connection.vendor == 'postgresql':
+            return PedidoService.estimar_total(queryset)
+        
+        chave = 'pedidos_total:' + hashlib.sha1(json.dumps(chave_filtros).encode()).hexdigest()
+        total = cache.get(chave)
+        if total is None:
+            total = queryset.order_by().count()
+            cache.set(chave, total, settings.PEDIDOS_TOTAL_CACHE_TIMEOUT)
+        return total
+    
+    @staticmethod
+    def estimar_total(queryset):
+        """Quantidade de linhas estimada pelo planejador do PostgreSQL para o queryset."""
+        sql, params = queryset.order_by().values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plano = cursor.fetchone()[0]
+        if isinstance(plano, str):
+            plano = json.loads(plano)
+        return int(plano[0]['Plan']['Plan Rows'])
+    
+    @staticmethod
+    def pedidos_com_itens():
+        """
+        Queryset de pedidos com o status (join) e os itens (prefetch) já carregados
+        """
+        return Pedido.objects.select_related('status').prefetch_related('itens')
+    
     @staticmethod
     def obter_pedido(pedido_id):
         """
         Obtém um pedido específico pelo ID
         """
-        return get_object_or_404(Pedido.objects.select_related('status'), id=pedido_id)    @staticmethod
+        return get_object_or_404(PedidoService.pedidos_com_itens(), id=pedido_id)    @staticmethod
     def atualizar_status_pedido(pedido_id, novo_status_id):
         """
-        Atualiza o status de um pedido e envia webhook para os endpoints configurados.
-        O status só é atualizado se todos os webhooks forem enviados com sucesso.
+        Atualiza o status de um pedido e enfileira os webhooks de status para os
+        endpoints configurados.
+        
+        A alteração e os envios pendentes (WebhookStatusPendente) são gravados na
+        mesma transação; o envio é feito depois pelo comando `enviar_webhooks_status`,
+        com novas tentativas em caso de falha. Assim a transação não fica aberta
+        esperando os endpoints.
         """
-        from django.db import transaction
-        from ..models.webhook_config import WebhookEndpointConfig
+        from .envio_status_service import EnvioStatusService
         
-        pedido = get_object_or_404(Pedido, id=pedido_id)
+        pedido = get_object_or_404(Pedido.objects.select_related('status'), id=pedido_id)
         status_anterior = pedido.status
         novo_status = get_object_or_404(StatusPedido, id=novo_status_id)
         
@@ -55,46 +196,21 @@ class PedidoService:
         if pedido.status.id == novo_status.id:
             logger.info(f"Status do pedido #{pedido_id} não foi alterado (já era {pedido.status.nome})")
             return pedido
-            
-        # Verificar se existem endpoints configurados
-        endpoints = WebhookEndpointConfig.objects.filter(ativo=True, auto_enviar=True)
-        if not endpoints.exists():
-            # Se não há endpoints configurados, atualizamos o status diretamente
-            logger.info(f"Nenhum endpoint de webhook configurado. Atualizando status diretamente.")
+        
+        with transaction.atomic():
             pedido.status = novo_status
             pedido.save(update_fields=['status', 'atualizado_em'])
-            logger.info(f"Status do pedido #{pedido_id} alterado de {status_anterior.nome} para {novo_status.nome}")
-            return pedido
+            HistoricoStatusPedido.objects.create(
+                pedido=pedido, status_anterior=status_anterior, status_novo=novo_status,
+                alterado_em=pedido.atualizado_em
+            )
+            enfileirados = EnvioStatusService.enfileirar([pedido], novo_status)
         
-        try:
-            # Usamos uma transação para garantir atomicidade
-            with transaction.atomic():
-                # Tenta enviar os webhooks primeiro, sem alterar o status
-                resultados = WebhookService.enviar_webhook_status(
-                    pedido=pedido,
-                    novo_status=novo_status,
-                    old_status=status_anterior,
-                    atualizar_pedido=False  # Não atualiza o pedido automaticamente
-                )
-                
-                # Verifica se houve falha em algum endpoint
-                falhas = sum(1 for r in resultados if not r.sucesso)
-                if falhas > 0:
-                    logger.error(f"Falha ao enviar {falhas} webhooks. Status do pedido #{pedido_id} NÃO foi alterado.")
-                    raise Exception(f"Falha ao enviar webhooks para {falhas} endpoints. Status não foi alterado.")
-                
-                # Se todos os webhooks foram enviados com sucesso, atualiza o status
-                pedido.status = novo_status
-                pedido.save(update_fields=['status', 'atualizado_em'])
-                
-                logger.info(f"Status do pedido #{pedido_id} alterado de {status_anterior.nome} para {novo_status.nome}")
-                logger.info(f"Webhooks enviados com sucesso: total={len(resultados)}")
-                
-                return pedido
-                
-        except Exception as e:
-            logger.error(f"Erro ao processar atualização de status do pedido #{pedido_id}: {str(e)}")
-            raise Exception(f"Não foi possível atualizar o status: {str(e)}")
+        logger.info(f"Status do pedido #{pedido_id} alterado de {status_anterior.nome} para {novo_status.nome}")
+        if enfileirados:
+            logger.info(f"Webhooks de status enfileirados: total={enfileirados}")
+        
+        return pedido
     @staticmethod
     def listar_status():
         """
@@ -106,6 +222,11 @@ class PedidoService:
         """
         Atualiza o status de múltiplos pedidos em lote
         
+        Os pedidos são carregados com uma consulta, o status é alterado com um único
+        UPDATE ... WHERE id IN e o histórico e os webhooks pendentes são gravados com
+        bulk_create, tudo na mesma transação. Os webhooks são enviados depois pelo
+        comando `enviar_webhooks_status`.
+        
         Args:
             pedido_ids: Lista de IDs dos pedidos a serem atualizados
             novo_status_id: ID do novo status
@@ -113,6 +234,9 @@ class PedidoService:
         Returns:
             dict: Dicionário com resultados da operação
         """
+        from .envio_status_service import EnvioStatusService
+        from .quadro_pedidos_service import QuadroPedidosService
+        
         if not pedido_ids:
             return {
                 "sucesso": False,
@@ -123,30 +247,72 @@ class PedidoService:
             }
             
         novo_status = get_object_or_404(StatusPedido, id=novo_status_id)
+        
+        # IDs válidos, sem repetições e na ordem recebida
+        ids_validos = []
+        for pedido_id in pedido_ids:
+            try:
+                ids_validos.append(int(pedido_id))
+            except (TypeError, ValueError):
+                continue
+        ids_validos = list(dict.fromkeys(ids_validos))
+        
+        pedidos = Pedido.objects.in_bulk(ids_validos, field_name='id')
+        alterados = [
+            pedido for pedido in pedidos.values()
+            if pedido.status_id != novo_status.id
+        ]
+        
+        if alterados:
+            agora = timezone.now()
+            with transaction.atomic():
+                Pedido.objects.filter(id__in=[pedido.id for pedido in alterados]).update(
+                    status=novo_status, atualizado_em=agora
+                )
+                HistoricoStatusPedido.objects.bulk_create([
+                    HistoricoStatusPedido(
+                        pedido_id=pedido.id, status_anterior_id=pedido.status_id,
+                        status_novo=novo_status, alterado_em=agora
+                    )
+                    for pedido in alterados
+                ])
+                for pedido in alterados:
+                    pedido.status = novo_status
+                    pedido.atualizado_em = agora
+                enfileirados = EnvioStatusService.enfileirar(alterados, novo_status)
+                # update() não dispara o sinal que invalida os totais do quadro
+                QuadroPedidosService.invalidar()
+            logger.info(
+                f"Status de {len(alterados)} pedido(s) alterado para {novo_status.nome}; "
+                f"webhooks de status enfileirados: {enfileirados}"
+            )
+        
         resultados = []
         pedidos_atualizados = 0
         falhas = 0
-        
-        # Processa cada pedido individualmente
         for pedido_id in pedido_ids:
             try:
-                # Usa o método existente para aproveitar o envio de webhooks
-                pedido = PedidoService.atualizar_status_pedido(pedido_id, novo_status_id)
-                resultados.append({
-                    "id": pedido_id,
-                    "numero_pedido": pedido.numero_pedido,
-                    "sucesso": True,
-                    "status_atual": pedido.status.nome,
-                })
-                pedidos_atualizados += 1
-            except Exception as e:
-                logger.error(f"Erro ao atualizar pedido #{pedido_id}: {str(e)}")
+                pedido = pedidos.get(int(pedido_id))
+            except (TypeError, ValueError):
+                pedido = None
+            
+            if pedido is None:
+                logger.error(f"Erro ao atualizar pedido #{pedido_id}: pedido não encontrado")
                 resultados.append({
                     "id": pedido_id,
                     "sucesso": False,
-                    "erro": str(e)
+                    "erro": "Pedido não encontrado"
                 })
                 falhas += 1
+                continue
+            
+            resultados.append({
+                "id": pedido_id,
+                "numero_pedido": pedido.numero_pedido,
+                "sucesso": True,
+                "status_atual": novo_status.nome,
+            })
+            pedidos_atualizados += 1
                 
         return {
             "sucesso": pedidos_atualizados > 0,
@@ -154,4 +320,4 @@ class PedidoService:
             "atualizados": pedidos_atualizados,
             "falhas": falhas,
             "detalhes": resultados
-        }
\ No newline at end of file
+        }
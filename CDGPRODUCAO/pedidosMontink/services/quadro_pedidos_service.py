@@ -0,0 +1,116 @@
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from pedidosMontink.models import Pedido, ItemPedido
+from pedidosMontink.services.pedido_service import PedidoService
+
+logger = logging.getLogger(__name__)
+
+
+class QuadroPedidosService:
+    """
+    Quadro (kanban) de pedidos por status: para cada StatusPedido ativo, o total
+    de pedidos, a soma de valor_pedido e das quantidades dos itens e os primeiros
+    pedidos do status.
+
+    Os totais vêm de uma única consulta agregada (GROUP BY status) e ficam no
+    cache do Django por PEDIDOS_QUADRO_CACHE_TIMEOUT segundos. O cache é
+    invalidado depois do commit sempre que um pedido é criado, removido ou muda de
+    status (pedidosMontink/signals.py e os caminhos em lote de PedidoService e
+    WebhookService). Os pedidos de todas as colunas vêm de uma única consulta.
+    """
+    CHAVE_AGREGADOS = 'pedidos:quadro:agregados'
+
+    @staticmethod
+    def calcular_agregados():
+        """
+        Totais por status com uma consulta agregada.
+
+        Returns:
+            dict: {status_id: {'total', 'valor_total', 'quantidade_total'}}
+        """
+        quantidade_itens = ItemPedido.objects.filter(pedido=OuterRef('pk')).order_by().values('pedido').annotate(
+            total=Sum('quantidade')
+        ).values('total')
+        linhas = (
+            Pedido.objects.order_by()
+            .annotate(quantidade_itens=Coalesce(Subquery(quantidade_itens), 0))
+            .values('status_id')
+            .annotate(
+                total=Count('id'),
+                valor_total=Sum('valor_pedido'),
+                quantidade_total=Sum('quantidade_itens'),
+            )
+        )
+        return {
+            linha['status_id']: {
+                'total': linha['total'],
+                'valor_total': linha['valor_total'],
+                'quantidade_total': linha['quantidade_total'],
+            }
+            for linha in linhas
+        }
+
+    @classmethod
+    def obter_agregados(cls):
+        """Totais por status, do cache ou recalculados."""
+        agregados = cache.get(cls.CHAVE_AGREGADOS)
+        if agregados is None:
+            agregados = cls.calcular_agregados()
+            cache.set(cls.CHAVE_AGREGADOS, agregados, settings.PEDIDOS_QUADRO_CACHE_TIMEOUT)
+        return agregados
+
+    @classmethod
+    def invalidar(cls):
+        """
+        Descarta os totais em cache depois do commit da transação atual, para que
+        nenhuma requisição concorrente recalcule e guarde os valores antigos.
+        """
+        transaction.on_commit(lambda: cache.delete(cls.CHAVE_AGREGADOS))
+
+    @staticmethod
+    def primeiros_pedidos(status_ids, limite):
+        """
+        Os `limite` pedidos mais recentes de cada status, em uma única consulta.
+
+        Cada status entra como uma subconsulta `id IN (... LIMIT n)` que percorre
+        só o começo do índice (status, criado_em). Um ROW_NUMBER() particionado por
+        status teria de numerar todos os pedidos da tabela antes de filtrar.
+
+        Returns:
+            dict: {status_id: [Pedido, ...]}
+        """
+        recentes = Pedido.objects.order_by('-criado_em', '-id').values('id')
+        condicao = Q(pk__in=[])
+        for status_id in status_ids:
+            condicao |= Q(id__in=recentes.filter(status_id=status_id)[:limite])
+        pedidos = PedidoService.listar_pedidos().filter(condicao).order_by('status_id', '-criado_em', '-id')
+
+        colunas = {}
+        for pedido in pedidos:
+            colunas.setdefault(pedido.status_id, []).append(pedido)
+        return colunas
+
+    @classmethod
+    def montar_quadro(cls, limite):
+        """
+        Colunas do quadro, uma por StatusPedido ativo, na ordem dos status.
+
+        Returns:
+            list: Dicts com o status, os totais e os primeiros pedidos
+        """
+        lista_status = list(PedidoService.listar_status())
+        agregados = cls.obter_agregados()
+        colunas = cls.primeiros_pedidos([status.id for status in lista_status], limite)
+        vazio = {'total': 0, 'valor_total': 0, 'quantidade_total': 0}
+        return [
+            {
+                'status': status,
+                **agregados.get(status.id, vazio),
+                'pedidos': colunas.get(status.id, []),
+            }
+            for status in lista_status
+        ]
@@ -1,13 +1,25 @@
 import json
 import hmac
 import hashlib
-from django.db import transaction
+import logging
+import traceback
+from django.db import transaction, IntegrityError
 from django.conf import settings
-from pedidosMontink.models import WebhookConfig, Webhook, Pedido, StatusPedido
-from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+from pedidosMontink.models import Webhook, Pedido, ItemPedido
+from pedidosMontink.serializers.webhook_serializers import WebhookPedidoRequestSerializer
+from pedidosMontink.services.configuracao_cache_service import ConfiguracaoCacheService
+from pedidosMontink.services.quadro_pedidos_service import QuadroPedidosService
+from busca.services.busca_service import BuscaService
+
+logger = logging.getLogger(__name__)
 
 
 class WebhookService:
+    # status_code dos webhooks recebidos no modo assíncrono: na fila e em processamento
+    STATUS_NA_FILA = 202
+    STATUS_PROCESSANDO = 102
+    
     @staticmethod
     def verificar_assinatura(payload_raw, assinatura_recebida, secret_key):
         """
@@ -33,37 +45,38 @@ class WebhookService:
         return hmac.compare_digest(assinatura_calculada, assinatura_recebida)
     
     @staticmethod
-    def processar_webhook_pedido(payload_raw, assinatura_recebida=None):
+    def processar_webhook_pedido(payload_raw, assinatura_recebida=None, enfileirar=False, dados=None):
         """
         Processa um webhook recebido com dados de pedido.
         
         Args:
-            payload_raw (bytes): O payload bruto do webhook
+            payload_raw (bytes): O payload bruto do webhook (usado na assinatura e no registro)
             assinatura_recebida (str): A assinatura recebida no header
+            enfileirar (bool): Se True, apenas verifica a assinatura e registra o
+                webhook na fila; o pedido é criado depois pelo comando `processar_webhooks`
+            dados (dict): Dados já validados pelo WebhookPedidoRequestSerializer; se
+                não forem informados, o payload é convertido e validado aqui
             
         Returns:
-            tuple: (sucesso, mensagem, pedido_id)
+            tuple: (sucesso, mensagem, pedido_id, webhook_id)
         """
         try:
             # Verificar se existe configuração de webhook ativa
             try:
-                config = WebhookConfig.objects.filter(ativo=True).first()
+                config = ConfiguracaoCacheService.obter_webhook_config()
                 if not config:
-                    return False, "Configuração de webhook não encontrada ou inativa", None
+                    return False, "Configuração de webhook não encontrada ou inativa", None, None
             except Exception as e:
-                return False, f"Erro ao buscar configuração de webhook: {str(e)}", None
-              # Converter o payload para JSON
-            try:
-                payload_str = payload_raw.decode('utf-8')
-                payload = json.loads(payload_str)
-                evento = payload.get('evento', 'pedido.novo')
-                
-                # No novo formato, o evento pode não estar presente
-                if not evento and 'produtos' in payload:
-                    evento = 'pedido.novo'  # Assumir um evento padrão se não for fornecido
-                    
-            except json.JSONDecodeError:
-                return False, "Payload inválido: não é um JSON válido", None
+                return False, f"Erro ao buscar configuração de webhook: {str(e)}", None, None
+            
+            # Converter e validar o payload, se a view ainda não o fez
+            if dados is None:
+                dados, erro = WebhookService.validar_payload(payload_raw)
+                if erro:
+                    return False, erro, None, None
+            
+            # No novo formato, o evento pode não estar presente
+            evento = dados.get('evento') or 'pedido.novo'
             
             # Verificar assinatura se fornecida
             assinatura_verificada = False
@@ -74,9 +87,11 @@ class WebhookService:
               # Salvar o webhook recebido
             webhook = Webhook.objects.create(
                 evento=evento,
-                payload=payload_str,
+                payload=payload_raw.decode('utf-8'),
+                payload_sha256=Webhook.calcular_sha256(payload_raw),
                 assinatura=assinatura_recebida,
-                verificado=assinatura_verificada
+                verificado=assinatura_verificada,
+                status_code=WebhookService.STATUS_NA_FILA if enfileirar else None
             )
             
             # Se a assinatura foi fornecida mas é inválida, retornar erro
@@ -86,136 +101,25 @@ class WebhookService:
                 webhook.erro = "Assinatura inválida"
                 webhook.processado = False
                 webhook.save()
-                return False, "Assinatura inválida", None
+                return False, "Assinatura inválida", None, webhook.id
+            
+            if enfileirar:
+                return True, "Webhook recebido e enfileirado para processamento", None, webhook.id
             
             # Processar os dados do pedido
             with transaction.atomic():
-                # Buscar o status "Pedido Novo"
-                try:
-                    status_novo = StatusPedido.objects.get(nome="Pedido Novo")
-                except StatusPedido.DoesNotExist:
-                    # Criar o status se não existir
-                    status_novo = StatusPedido.objects.create(
-                        nome="Pedido Novo",
-                        descricao="Pedido recém recebido via webhook",
-                        cor_css="#3498db",
-                        ordem=1
-                    )
-                  # Extrair dados do pedido do payload
-                # O modelo de JSON novo já está no formato adequado, sem o objeto pedido dentro
-                dados_pedido = payload
-                if not dados_pedido:
-                    return False, "Dados do pedido não encontrados no payload", None
-                
-                # Verificar se o número do pedido já existe
-                numero_pedido = dados_pedido.get('numero_pedido')
-                if not numero_pedido:
-                    return False, "Número do pedido não fornecido", None
-                
-                pedido_existente = Pedido.objects.filter(numero_pedido=numero_pedido).first()
-                if pedido_existente:
-                    return False, f"Pedido com número {numero_pedido} já existe", None
-                
-                # Informações adicionais agora vem em um objeto separado
-                info_adicional = dados_pedido.get('informacoes_adicionais', {})
-                
-                # Endereço de envio agora vem em um objeto separado
-                endereco_envio = dados_pedido.get('endereco_envio', {})
-                
-                # Produtos agora vêm em uma lista (array)
-                produtos = dados_pedido.get('produtos', [])
-                if not produtos:
-                    return False, "Nenhum produto especificado no pedido", None
-                
-                # Pegar o primeiro produto (como no modelo atual só suporta um produto)
-                primeiro_produto = produtos[0]
-                
-                # Extrair designs e mockups do primeiro produto
-                designs = primeiro_produto.get('designs', {})
-                mockups = primeiro_produto.get('mockups', {})
-                
-                # Criar o pedido
-                try:
-                    titulo = f"Pedido #{numero_pedido}"
-                    if primeiro_produto.get('nome'):
-                        titulo = f"{titulo} - {primeiro_produto.get('nome')}"
-                        
-                    pedido = Pedido(
-                        # Dados básicos do pedido
-                        numero_pedido=numero_pedido,
-                        titulo=titulo,
-                        valor_pedido=dados_pedido.get('valor_pedido', 0),
-                        custo_envio=dados_pedido.get('custo_envio'),
-                        etiqueta_envio=dados_pedido.get('etiqueta_envio'),
-                        metodo_envio=dados_pedido.get('metodo_envio'),
-                        
-                        # Dados do cliente
-                        nome_cliente=dados_pedido.get('nome_cliente', ''),
-                        documento_cliente=dados_pedido.get('documento_cliente', ''),
-                        email_cliente=dados_pedido.get('email_cliente', ''),
-                        
-                        # Status e webhook
-                        status=status_novo,
-                        webhook=webhook,
-                        
-                        # Endereço - agora vem do objeto endereco_envio
-                        nome_destinatario=endereco_envio.get('nome_destinatario', ''),
-                        endereco=endereco_envio.get('endereco', ''),
-                        numero=endereco_envio.get('numero', ''),
-                        complemento=endereco_envio.get('complemento'),
-                        cidade=endereco_envio.get('cidade', ''),
-                        uf=endereco_envio.get('uf', ''),
-                        cep=endereco_envio.get('cep', ''),
-                        bairro=endereco_envio.get('bairro', ''),
-                        telefone_destinatario=endereco_envio.get('telefone', ''),
-                        pais=endereco_envio.get('pais', 'Brasil'),
-                        
-                        # Informações adicionais - agora vem do objeto informacoes_adicionais
-                        nome_info_adicional=info_adicional.get('nome', ''),
-                        telefone_info_adicional=info_adicional.get('telefone', ''),
-                        email_info_adicional=info_adicional.get('email', ''),
-                        
-                        # Produto - vem do primeiro produto da lista de produtos
-                        nome_produto=primeiro_produto.get('nome', ''),
-                        sku=primeiro_produto.get('sku', ''),
-                        quantidade=primeiro_produto.get('quantidade', 1),
-                        id_sku=primeiro_produto.get('id_sku'),
-                        arquivo_pdf_produto=primeiro_produto.get('arquivo_pdf'),
-                        
-                        # Design - agora vem do objeto designs dentro do produto
-                        design_capa_frente=designs.get('capa_frente', ''),
-                        design_capa_verso=designs.get('capa_verso'),
-                        
-                        # Mockup - agora vem do objeto mockups dentro do produto
-                        mockup_capa_frente=mockups.get('capa_frente', ''),
-                        mockup_capa_costas=mockups.get('capa_costas')
-                    )
-                    pedido.save()
-                      # Atualizar o webhook com informações de sucesso
-                    webhook.status_code = 201  # Created
-                    webhook.processado = True
-                    webhook.save()
-                    
-                    return True, f"Pedido #{numero_pedido} recebido com sucesso", pedido.id
-                
-                except Exception as e:
-                    # Rollback é automático devido ao uso de transaction.atomic()
-                    erro_msg = f"Erro ao salvar o pedido: {str(e)}"
-                    
-                    # Atualizar o webhook com informações de erro
-                    webhook.status_code = 500  # Internal Server Error
-                    webhook.erro = erro_msg
-                    webhook.processado = False
-                    webhook.save()
-                    
-                    return False, erro_msg, None
+                status_novo = WebhookService.obter_status_pedido_novo()
+                sucesso, mensagem, pedido_id = WebhookService.criar_pedido(webhook, dados, status_novo)
+            return sucesso, mensagem, pedido_id, webhook.id
         
         except Exception as e:
             erro_msg = f"Erro ao processar webhook: {str(e)}"
             
             # Se o webhook já foi criado, atualizá-lo com informações de erro
+            webhook_id = None
             try:
                 if 'webhook' in locals():
+                    webhook_id = webhook.id
                     webhook.status_code = 500  # Internal Server Error
                     webhook.erro = erro_msg
                     webhook.processado = False
@@ -223,4 +127,521 @@ class WebhookService:
             except:
                 pass  # Se não conseguir atualizar o webhook, apenas continue
                 
-            return False, erro_msg, None
\ No newline at end of file
+            return False, erro_msg, None, webhook_id
+
+    @staticmethod
+    def obter_status_pedido_novo():
+        """Retorna o status "Pedido Novo", criando-o se ainda não existir."""
+        return ConfiguracaoCacheService.obter_status_pedido_novo()
+    
+    @staticmethod
+    def validar_payload(payload):
+        """
+        Converte (se necessário) e valida o payload de um webhook de pedido.
+        
+        Args:
+            payload (bytes | str | dict): Payload bruto ou já convertido de JSON
+            
+        Returns:
+            tuple: (dados_validados, mensagem_erro); um dos dois é None
+        """
+        if isinstance(payload, (bytes, str)):
+            try:
+                payload = json.loads(payload)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return None, "Payload inválido: não é um JSON válido"
+        
+        serializer = WebhookPedidoRequestSerializer(data=payload)
+        if not serializer.is_valid():
+            return None, f"Formato de dados inválido: {json.dumps(serializer.errors)}"
+        return serializer.validated_data, None
+    
+    @staticmethod
+    def montar_pedido(dados, status_novo, webhook):
+        """
+        Monta (sem salvar) o pedido a partir dos dados validados pelo
+        WebhookPedidoRequestSerializer.
+        
+        Returns:
+            Pedido: Pedido ainda não salvo
+        """
+        # Informações adicionais, endereço de envio e produtos vêm em objetos separados.
+        # Os campos de produto do pedido guardam o primeiro da lista; todos os
+        # produtos são gravados como ItemPedido (ver `montar_itens`).
+        info_adicional = dados['informacoes_adicionais']
+        endereco_envio = dados['endereco_envio']
+        primeiro_produto = dados['produtos'][0]
+        designs = primeiro_produto['designs']
+        mockups = primeiro_produto['mockups']
+        
+        numero_pedido = dados['numero_pedido']
+        return Pedido(
+            # Dados básicos do pedido
+            numero_pedido=numero_pedido,
+            titulo=f"Pedido #{numero_pedido} - {primeiro_produto['nome']}",
+            valor_pedido=dados['valor_pedido'],
+            custo_envio=dados.get('custo_envio'),
+            etiqueta_envio=dados.get('etiqueta_envio'),
+            metodo_envio=dados.get('metodo_envio'),
+            
+            # Dados do cliente
+            nome_cliente=dados['nome_cliente'],
+            documento_cliente=dados['documento_cliente'],
+            email_cliente=dados['email_cliente'],
+            
+            # Status e webhook
+            status=status_novo,
+            webhook=webhook,
+            
+            # Endereço
+            nome_destinatario=endereco_envio['nome_destinatario'],
+            endereco=endereco_envio['endereco'],
+            numero=endereco_envio['numero'],
+            complemento=endereco_envio.get('complemento'),
+            cidade=endereco_envio['cidade'],
+            uf=endereco_envio['uf'],
+            cep=endereco_envio['cep'],
+            bairro=endereco_envio['bairro'],
+            telefone_destinatario=endereco_envio['telefone'],
+            pais=endereco_envio.get('pais', 'Brasil'),
+            
+            # Informações adicionais
+            nome_info_adicional=info_adicional['nome'],
+            telefone_info_adicional=info_adicional['telefone'],
+            email_info_adicional=info_adicional['email'],
+            
+            # Produto
+            nome_produto=primeiro_produto['nome'],
+            sku=primeiro_produto['sku'],
+            quantidade=primeiro_produto['quantidade'],
+            id_sku=primeiro_produto.get('id_sku'),
+            arquivo_pdf_produto=primeiro_produto.get('arquivo_pdf'),
+            
+            # Design e mockup do produto
+            design_capa_frente=designs['capa_frente'],
+            design_capa_verso=designs.get('capa_verso'),
+            mockup_capa_frente=mockups['capa_frente'],
+            mockup_capa_costas=mockups.get('capa_costas')
+        )
+    
+    @staticmethod
+    def montar_itens(dados, pedido):
+        """
+        Monta (sem salvar) um ItemPedido para cada produto dos dados validados,
+        na ordem recebida.
+        
+        Returns:
+            list: Itens ainda não salvos
+        """
+        itens = []
+        for ordem, produto in enumerate(dados['produtos']):
+            designs = produto['designs']
+            mockups = produto['mockups']
+            itens.append(ItemPedido(
+                pedido=pedido,
+                ordem=ordem,
+                nome=produto['nome'],
+                sku=produto['sku'],
+                quantidade=produto['quantidade'],
+                id_sku=produto.get('id_sku'),
+                arquivo_pdf=produto.get('arquivo_pdf'),
+                design_capa_frente=designs['capa_frente'],
+                design_capa_verso=designs.get('capa_verso'),
+                mockup_capa_frente=mockups['capa_frente'],
+                mockup_capa_costas=mockups.get('capa_costas')
+            ))
+        return itens
+    
+    @staticmethod
+    def criar_pedido(webhook, dados, status_novo):
+        """
+        Cria o pedido de um webhook já registrado.
+        
+        O pedido é inserido direto, sem consultar antes se o número já existe: a
+        restrição única de numero_pedido detecta as entregas repetidas (inclusive
+        as concorrentes), que são tratadas por `_tratar_pedido_existente`.
+        
+        Args:
+            webhook (Webhook): Registro do webhook recebido
+            dados (dict): Dados do pedido validados pelo WebhookPedidoRequestSerializer
+            status_novo (StatusPedido): Status inicial do pedido
+            
+        Returns:
+            tuple: (sucesso, mensagem, pedido_id)
+        """
+        numero_pedido = dados['numero_pedido']
+        try:
+            pedido = WebhookService.montar_pedido(dados, status_novo, webhook)
+            try:
+                with transaction.atomic():
+                    pedido.save()
+                    ItemPedido.objects.bulk_create(WebhookService.montar_itens(dados, pedido))
+            except IntegrityError:
+                existente = (
+                    Pedido.objects.filter(numero_pedido=numero_pedido)
+                    .values('id', 'webhook__payload_sha256').first()
+                )
+                if existente is None:
+                    raise
+                return WebhookService._tratar_pedido_existente(webhook, dados, existente)
+            
+            # Atualizar o webhook com informações de sucesso
+            webhook.status_code = 201  # Created
+            webhook.processado = True
+            webhook.save()
+            
+            return True, f"Pedido #{numero_pedido} recebido com sucesso", pedido.id
+        
+        except Exception as e:
+            erro_msg = f"Erro ao salvar o pedido: {str(e)}"
+            
+            # Atualizar o webhook com informações de erro
+            webhook.status_code = 500  # Internal Server Error
+            webhook.erro = erro_msg
+            webhook.processado = False
+            webhook.save()
+            
+            return False, erro_msg, None
+    
+    @staticmethod
+    def _tratar_pedido_existente(webhook, dados, existente):
+        """
+        Trata a entrega repetida de um pedido que já existe.
+        
+        Sem mudanças no payload (mesmo digest), ou com PEDIDOS_WEBHOOK_ATUALIZAR_DUPLICADOS
+        desativado, nada é alterado. Com a opção ativa e um payload diferente, os
+        dados do pedido são atualizados (o status é mantido).
+        
+        Args:
+            existente (dict): id e webhook__payload_sha256 do pedido existente
+            
+        Returns:
+            tuple: (sucesso, mensagem, pedido_id)
+        """
+        numero_pedido = dados['numero_pedido']
+        payload_alterado = existente['webhook__payload_sha256'] != webhook.payload_sha256
+        
+        if payload_alterado and settings.PEDIDOS_WEBHOOK_ATUALIZAR_DUPLICADOS:
+            WebhookService.atualizar_pedido(existente['id'], dados, webhook)
+            mensagem = f"Pedido #{numero_pedido} atualizado"
+        elif payload_alterado:
+            mensagem = f"Pedido #{numero_pedido} já recebido anteriormente (payload diferente, não atualizado)"
+        else:
+            mensagem = f"Pedido #{numero_pedido} já recebido anteriormente"
+        
+        webhook.status_code = 200  # OK
+        webhook.processado = True
+        webhook.erro = None
+        webhook.save()
+        logger.info(mensagem)
+        
+        return True, mensagem, existente['id']
+    
+    # Campos do pedido que não são substituídos quando uma entrega repetida o atualiza
+    CAMPOS_PRESERVADOS_ATUALIZACAO = ('id', 'status', 'criado_em', 'atualizado_em')
+    
+    @staticmethod
+    def atualizar_pedido(pedido_id, dados, webhook):
+        """Substitui os dados e os itens de um pedido existente pelos de um payload novo, mantendo o status."""
+        pedido = WebhookService.montar_pedido(dados, None, webhook)
+        campos = {
+            campo.attname: getattr(pedido, campo.attname)
+            for campo in Pedido._meta.concrete_fields
+            if campo.name not in WebhookService.CAMPOS_PRESERVADOS_ATUALIZACAO
+        }
+        pedido.pk = pedido_id
+        with transaction.atomic():
+            Pedido.objects.filter(pk=pedido_id).update(atualizado_em=timezone.now(), **campos)
+            ItemPedido.objects.filter(pedido_id=pedido_id).delete()
+            ItemPedido.objects.bulk_create(WebhookService.montar_itens(dados, pedido))
+            # update() e bulk_create não disparam os sinais que atualizam a busca e o quadro
+            BuscaService.indexar_apos_commit(BuscaService.TIPO_PEDIDO, [pedido_id])
+            QuadroPedidosService.invalidar()
+    
+    @staticmethod
+    def processar_lote_webhooks_pedido(itens):
+        """
+        Processa um lote de webhooks de pedido recebidos em uma única requisição.
+        
+        Todos os payloads são convertidos, validados e têm a assinatura verificada
+        antes de qualquer escrita. Os pedidos já existentes são consultados com uma
+        única consulta IN e as entregas repetidas devolvem o pedido existente; os
+        registros de Webhook, Pedido e ItemPedido são inseridos com bulk_create em
+        uma única transação.
+        
+        Args:
+            itens (list): Lista de dicts {'payload': texto JSON do pedido, 'assinatura': str opcional}
+            
+        Returns:
+            list: Um resultado por item, na ordem recebida, com as chaves
+                indice, numero_pedido, sucesso, mensagem, pedido_id e webhook_id
+        """
+        config = ConfiguracaoCacheService.obter_webhook_config()
+        if not config:
+            return [
+                {'indice': indice, 'numero_pedido': None, 'sucesso': False,
+                 'mensagem': "Configuração de webhook não encontrada ou inativa",
+                 'pedido_id': None, 'webhook_id': None}
+                for indice in range(len(itens))
+            ]
+        
+        # 1. Converte, valida e verifica a assinatura de cada payload, sem acessar o banco
+        entradas = []
+        for indice, item in enumerate(itens):
+            payload_str = item.get('payload') if isinstance(item, dict) else None
+            assinatura = item.get('assinatura') if isinstance(item, dict) else None
+            if not isinstance(payload_str, str):
+                payload_str = json.dumps(payload_str) if payload_str is not None else ''
+            payload_raw = payload_str.encode('utf-8')
+            
+            entrada = {
+                'indice': indice,
+                'webhook': Webhook(
+                    evento='pedido.novo',
+                    payload=payload_str,
+                    payload_sha256=Webhook.calcular_sha256(payload_raw),
+                    assinatura=assinatura,
+                    verificado=False
+                ),
+                'dados': None,
+                'mensagem': None,
+            }
+            entradas.append(entrada)
+            
+            try:
+                payload = json.loads(payload_raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                entrada['webhook'].evento = 'erro.json'
+                WebhookService._marcar_falha(entrada, 400, "Payload inválido: não é um JSON válido")
+                continue
+            
+            dados, erro = WebhookService.validar_payload(payload)
+            if erro:
+                entrada['webhook'].evento = 'erro.validacao'
+                WebhookService._marcar_falha(entrada, 400, erro)
+                continue
+            
+            entrada['dados'] = dados
+            entrada['webhook'].evento = dados.get('evento') or 'pedido.novo'
+            if assinatura:
+                entrada['webhook'].verificado = WebhookService.verificar_assinatura(
+                    payload_raw, assinatura, config.secret_key
+                )
+                if not entrada['webhook'].verificado:
+                    WebhookService._marcar_falha(entrada, 401, "Assinatura inválida")
+        
+        # 2. Resolve os pedidos já existentes com uma única consulta IN
+        validas = [entrada for entrada in entradas if entrada['mensagem'] is None]
+        existentes = {
+            existente['numero_pedido']: existente
+            for existente in Pedido.objects.filter(
+                numero_pedido__in={entrada['dados']['numero_pedido'] for entrada in validas}
+            ).values('numero_pedido', 'id', 'webhook__payload_sha256')
+        }
+        a_criar = []
+        a_atualizar = []
+        numeros_no_lote = set()
+        for entrada in validas:
+            numero_pedido = entrada['dados']['numero_pedido']
+            existente = existentes.get(numero_pedido)
+            if numero_pedido in numeros_no_lote:
+                WebhookService._marcar_falha(entrada, 400, f"Pedido com número {numero_pedido} repetido no lote")
+                continue
+            numeros_no_lote.add(numero_pedido)
+            
+            if existente is None:
+                entrada['webhook'].status_code = 201  # Created
+                entrada['webhook'].processado = True
+                a_criar.append(entrada)
+                continue
+            
+            # Entrega repetida: não cria nada e devolve o pedido existente
+            entrada['webhook'].status_code = 200  # OK
+            entrada['webhook'].processado = True
+            entrada['pedido_id'] = existente['id']
+            payload_alterado = existente['webhook__payload_sha256'] != entrada['webhook'].payload_sha256
+            if payload_alterado and settings.PEDIDOS_WEBHOOK_ATUALIZAR_DUPLICADOS:
+                entrada['mensagem'] = f"Pedido #{numero_pedido} atualizado"
+                a_atualizar.append(entrada)
+            elif payload_alterado:
+                entrada['mensagem'] = f"Pedido #{numero_pedido} já recebido anteriormente (payload diferente, não atualizado)"
+            else:
+                entrada['mensagem'] = f"Pedido #{numero_pedido} já recebido anteriormente"
+        
+        # 3. Insere webhooks e pedidos em uma única transação
+        try:
+            with transaction.atomic():
+                Webhook.objects.bulk_create([entrada['webhook'] for entrada in entradas])
+                for entrada in a_atualizar:
+                    WebhookService.atualizar_pedido(entrada['pedido_id'], entrada['dados'], entrada['webhook'])
+                
+                status_novo = ConfiguracaoCacheService.obter_status_pedido_novo()
+                pedidos = Pedido.objects.bulk_create([
+                    WebhookService.montar_pedido(entrada['dados'], status_novo, entrada['webhook'])
+                    for entrada in a_criar
+                ])
+                # Itens de todos os pedidos do lote em um único INSERT
+                ItemPedido.objects.bulk_create([
+                    item
+                    for entrada, pedido in zip(a_criar, pedidos)
+                    for item in WebhookService.montar_itens(entrada['dados'], pedido)
+                ])
+                BuscaService.indexar_apos_commit(BuscaService.TIPO_PEDIDO, [pedido.id for pedido in pedidos])
+                QuadroPedidosService.invalidar()
+        except IntegrityError:
+            # Outro processo inseriu um dos pedidos depois da verificação: processa
+            # o lote item a item, cada pedido com o seu próprio savepoint
+            logger.warning("Conflito ao inserir o lote de pedidos; processando item a item")
+            return WebhookService._processar_lote_item_a_item(entradas)
+        
+        for entrada, pedido in zip(a_criar, pedidos):
+            entrada['pedido_id'] = pedido.id
+            entrada['mensagem'] = f"Pedido #{pedido.numero_pedido} recebido com sucesso"
+        
+        return [WebhookService._resultado_lote(entrada) for entrada in entradas]
+    
+    @staticmethod
+    def _marcar_falha(entrada, status_code, mensagem):
+        entrada['webhook'].status_code = status_code
+        entrada['webhook'].erro = mensagem
+        entrada['webhook'].processado = False
+        entrada['mensagem'] = mensagem
+    
+    @staticmethod
+    def _resultado_lote(entrada):
+        dados = entrada['dados'] or {}
+        return {
+            'indice': entrada['indice'],
+            'numero_pedido': dados.get('numero_pedido'),
+            'sucesso': entrada['webhook'].processado,
+            'mensagem': entrada['mensagem'],
+            'pedido_id': entrada.get('pedido_id'),
+            'webhook_id': entrada['webhook'].id,
+        }
+    
+    @staticmethod
+    def _processar_lote_item_a_item(entradas):
+        """Alternativa ao bulk_create quando o lote conflita com pedidos inseridos em paralelo."""
+        status_novo = ConfiguracaoCacheService.obter_status_pedido_novo()
+        resultados = []
+        for entrada in entradas:
+            # Os webhooks do bulk_create desfeito são gravados de novo
+            webhook = entrada['webhook']
+            webhook.pk = None
+            webhook._state.adding = True
+            if webhook.processado:
+                # Volta ao estado de "em processamento" até o pedido ser criado
+                webhook.status_code = None
+                webhook.processado = False
+                webhook.save()
+                sucesso, mensagem, pedido_id = WebhookService.criar_pedido(webhook, entrada['dados'], status_novo)
+                if not sucesso and webhook.status_code is None:
+                    WebhookService._marcar_falha(entrada, 400, mensagem)
+                    webhook.save(update_fields=['status_code', 'erro', 'processado'])
+                entrada['mensagem'] = mensagem
+                entrada['pedido_id'] = pedido_id
+            else:
+                webhook.save()
+            resultados.append(WebhookService._resultado_lote(entrada))
+        return resultados
+    
+    @staticmethod
+    def reservar_webhooks_na_fila(tamanho_lote):
+        """
+        Reserva para este worker até `tamanho_lote` webhooks da fila, do mais antigo
+        para o mais novo.
+        
+        Cada reserva é um UPDATE condicional no status_code, então dois workers
+        nunca processam o mesmo webhook, mesmo sem SELECT FOR UPDATE (SQLite).
+        
+        Returns:
+            list: Webhooks reservados
+        """
+        ids = list(
+            Webhook.objects.filter(status_code=WebhookService.STATUS_NA_FILA)
+            .order_by('recebido_em', 'id')
+            .values_list('id', flat=True)[:tamanho_lote]
+        )
+        reservados = [
+            webhook_id for webhook_id in ids
+            if Webhook.objects.filter(pk=webhook_id, status_code=WebhookService.STATUS_NA_FILA)
+            .update(status_code=WebhookService.STATUS_PROCESSANDO)
+        ]
+        return list(Webhook.objects.filter(pk__in=reservados).order_by('recebido_em', 'id'))
+    
+    @staticmethod
+    def liberar_webhooks_travados():
+        """
+        Devolve para a fila os webhooks que ficaram em processamento (por exemplo,
+        quando o worker foi interrompido). Só deve ser usado sem outros workers rodando.
+        
+        Returns:
+            int: Quantidade de webhooks liberados
+        """
+        return Webhook.objects.filter(status_code=WebhookService.STATUS_PROCESSANDO).update(
+            status_code=WebhookService.STATUS_NA_FILA
+        )
+    
+    @staticmethod
+    def processar_lote_webhooks(webhooks):
+        """
+        Cria os pedidos de um lote de webhooks reservados.
+        
+        O lote é gravado em uma única transação (uma única trava de escrita no
+        SQLite); cada pedido tem o seu próprio savepoint, então a falha de um não
+        desfaz os demais.
+        
+        Returns:
+            int: Quantidade de pedidos criados
+        """
+        criados = 0
+        with transaction.atomic():
+            status_novo = WebhookService.obter_status_pedido_novo()
+            for webhook in webhooks:
+                try:
+                    dados, erro = WebhookService.validar_payload(webhook.payload)
+                    if erro:
+                        sucesso, mensagem = False, erro
+                    else:
+                        sucesso, mensagem, _ = WebhookService.criar_pedido(webhook, dados, status_novo)
+                except Exception as e:
+                    logger.error(f"Erro inesperado ao processar o webhook {webhook.id}: {str(e)}")
+                    logger.error(traceback.format_exc())
+                    sucesso, mensagem = False, f"Erro ao processar webhook: {str(e)}"
+                    webhook.status_code = 500
+                
+                if sucesso:
+                    criados += 1
+                    continue
+                
+                # Falhas de validação (sem produtos, dados inválidos...) não
+                # atualizam o webhook em criar_pedido
+                if webhook.status_code == WebhookService.STATUS_PROCESSANDO:
+                    webhook.status_code = 400
+                webhook.erro = mensagem
+                webhook.processado = False
+                webhook.save(update_fields=['status_code', 'erro', 'processado'])
+        return criados
+    
+    @staticmethod
+    def processar_webhooks_na_fila(tamanho_lote=None, limite=None):
+        """
+        Processa os webhooks da fila em lotes até esvaziá-la ou atingir o limite.
+        
+        Returns:
+            int: Quantidade de webhooks processados
+        """
+        tamanho_lote = tamanho_lote or settings.PEDIDOS_WEBHOOK_TAMANHO_LOTE
+        processados = 0
+        while limite is None or processados < limite:
+            if limite is not None:
+                tamanho_lote = min(tamanho_lote, limite - processados)
+            webhooks = WebhookService.reservar_webhooks_na_fila(tamanho_lote)
+            if not webhooks:
+                break
+            
+            criados = WebhookService.processar_lote_webhooks(webhooks)
+            logger.info(f"Lote de {len(webhooks)} webhook(s) processado: {criados} pedido(s) criado(s)")
+            processados += len(webhooks)
+        
+        return processados
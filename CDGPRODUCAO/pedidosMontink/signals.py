@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from pedidosMontink.models import WebhookConfig, WebhookEndpointConfig, StatusPedido, Pedido
+from pedidosMontink.services.configuracao_cache_service import ConfiguracaoCacheService
+from pedidosMontink.services.quadro_pedidos_service import QuadroPedidosService
+
+
+def invalidar_configuracao(sender, **kwargs):
+    """Invalida o cache de configurações quando uma delas é criada, alterada ou removida."""
+    ConfiguracaoCacheService.invalidar()
+
+
+for modelo in (WebhookConfig, WebhookEndpointConfig, StatusPedido):
+    post_save.connect(invalidar_configuracao, sender=modelo, dispatch_uid=f'invalidar_configuracao_save_{modelo.__name__}')
+    post_delete.connect(invalidar_configuracao, sender=modelo, dispatch_uid=f'invalidar_configuracao_delete_{modelo.__name__}')
+
+
+def invalidar_quadro(sender, **kwargs):
+    """Invalida os totais do quadro de pedidos quando um pedido é criado, removido ou alterado."""
+    QuadroPedidosService.invalidar()
+
+
+post_save.connect(invalidar_quadro, sender=Pedido, dispatch_uid='invalidar_quadro_save_Pedido')
+post_delete.connect(invalidar_quadro, sender=Pedido, dispatch_uid='invalidar_quadro_delete_Pedido')
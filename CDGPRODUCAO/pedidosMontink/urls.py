@@ -1,14 +1,17 @@
 from django.urls import path
-from .views.webhook_receber import WebhookReceberView
+from .views.webhook_receber import WebhookReceberView, WebhookReceberLoteView
 from .views.pedido_listar import (
     WebhookListarView, StatusPedidoListView, PedidoDetailView, 
-    AtualizarStatusPedidoView, AtualizarStatusPedidosEmLoteView
+    AtualizarStatusPedidoView, AtualizarStatusPedidosEmLoteView, QuadroPedidosView, ExportarPedidosView
 )
 from .views.webhook_enviar import EnviarWebhookManualView
 
 urlpatterns = [
     path('receber/', WebhookReceberView.as_view(), name='webhook-receiver'),
+    path('receber/lote/', WebhookReceberLoteView.as_view(), name='webhook-receiver-lote'),
     path('pedidos/', WebhookListarView.as_view(), name='pedidos-listar'),
+    path('pedidos/exportar/', ExportarPedidosView.as_view(), name='pedidos-exportar'),
+    path('pedidos/quadro/', QuadroPedidosView.as_view(), name='pedidos-quadro'),
     path('pedidos/<int:pk>/', PedidoDetailView.as_view(), name='pedido-detalhe'),
     path('pedidos/<int:pk>/status/', AtualizarStatusPedidoView.as_view(), name='pedido-atualizar-status'),
     path('pedidos/<int:pk>/enviar-webhook/', EnviarWebhookManualView.as_view(), name='pedido-enviar-webhook'),
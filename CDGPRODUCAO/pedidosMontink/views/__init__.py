@@ -1,5 +1,6 @@
-from .webhook_receber import WebhookReceberView
+from .webhook_receber import WebhookReceberView, WebhookReceberLoteView
 
 __all__ = [
     'WebhookReceberView',
+    'WebhookReceberLoteView',
 ]
\ No newline at end of file
@@ -2,33 +2,98 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from ..models.webhook_pedido import Pedido, StatusPedido
-from ..serializers.pedido_serializers import PedidoSerializer, PedidoListSerializer, StatusPedidoSerializer
+from ..serializers.pedido_serializers import (
+    PedidoSerializer, PedidoListSerializer, StatusPedidoSerializer, ColunaQuadroSerializer
+)
 from ..services.pedido_service import PedidoService
-from django.db.models import Q
-from rest_framework.pagination import PageNumberPagination
+from ..services.quadro_pedidos_service import QuadroPedidosService
+from ..services.exportacao_service import ExportacaoPedidosService
+from ..pagination import PedidoPagination, PedidoCursorPagination
+from django.conf import settings
+from django.db.models import Q, Count, Max
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
+from config.etag import calcular_etag, resposta_nao_modificada
+from config.exportacao import FORMATO_CSV, FORMATOS, resposta_exportacao
+from busca.filters import BuscaTextoFilter
+from busca.services.busca_service import BuscaService
 
 
-class PedidoPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+class PedidoSearchFilter(SearchFilter):
+    """
+    Busca livre (?search=) da listagem de pedidos.
+    
+    Um termo só com dígitos busca o número do pedido e o SKU pelos índices, no
+    modo de busca pedido (exato ou prefixo); os demais termos usam icontains nos
+    campos de texto. Com modo_busca=contem todos os campos usam icontains, como antes.
+    """
+    def get_search_fields(self, view, request):
+        if request.query_params.get('modo_busca') == PedidoService.MODO_CONTEM:
+            return ['numero_pedido'] + list(view.search_fields)
+        return super().get_search_fields(view, request)
+
+    def filter_queryset(self, request, queryset, view):
+        termos = self.get_search_terms(request)
+        modo = request.query_params.get('modo_busca') or PedidoService.MODO_PREFIXO
+        if modo != PedidoService.MODO_CONTEM and len(termos) == 1 and termos[0].isdigit():
+            return queryset.filter(
+                PedidoService.filtro_numero_pedido(termos[0], modo)
+                | PedidoService.filtro_texto('sku', termos[0], modo)
+            )
+        return super().filter_queryset(request, queryset, view)
 
 
 class WebhookListarView(generics.ListAPIView):
     """
     View para listar pedidos com filtros
+    
+    numero_pedido e sku são buscados conforme o parâmetro modo_busca: 'prefixo'
+    (padrão), 'exato' ou 'contem' (ver PedidoService.listar_pedidos).
+    
+    ?q= faz a busca textual pelo índice de busca (número, cliente, e-mail,
+    destinatário, produtos e SKUs), com os pedidos ordenados por relevância.
+    
+    A paginação padrão é por número de página (?page=, com count). Com
+    ?paginacao=cursor a listagem é paginada por cursor (PedidoCursorPagination),
+    com o total opcional (?total=nenhum|estimado|exato).
     """
     serializer_class = PedidoListSerializer
     pagination_class = PedidoPagination
-    filter_backends = [SearchFilter, OrderingFilter]
-    search_fields = ['numero_pedido', 'nome_cliente', 'sku', 'nome_produto']
-    ordering_fields = ['numero_pedido', 'criado_em', 'status__ordem']
+    filter_backends = [PedidoSearchFilter, OrderingFilter, BuscaTextoFilter]
+    busca_tipo = BuscaService.TIPO_PEDIDO
+    search_fields = ['nome_cliente', 'sku', 'nome_produto']
+    ordering_fields = ['numero_pedido', 'criado_em', 'status__ordem', 'total_itens', 'quantidade_total']
     ordering = ['-criado_em']
 
+    PAGINACAO_PAGINA = 'pagina'
+    PAGINACAO_CURSOR = 'cursor'
+
+    def paginacao_cursor(self):
+        paginacao = self.request.query_params.get('paginacao') or self.PAGINACAO_PAGINA
+        if paginacao not in (self.PAGINACAO_PAGINA, self.PAGINACAO_CURSOR):
+            raise ValidationError({
+                "erro": f"paginacao inválida. Use '{self.PAGINACAO_PAGINA}' ou '{self.PAGINACAO_CURSOR}'"
+            })
+        return paginacao == self.PAGINACAO_CURSOR
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = PedidoCursorPagination() if self.paginacao_cursor() else self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
         filtros = {}
         
+        # Modo de busca de número do pedido e SKU
+        modo_busca = self.request.query_params.get('modo_busca', None)
+        if modo_busca:
+            if modo_busca not in PedidoService.MODOS_BUSCA:
+                raise ValidationError({
+                    "erro": f"modo_busca inválido. Use um destes: {', '.join(PedidoService.MODOS_BUSCA)}"
+                })
+            filtros['modo_busca'] = modo_busca
+        
         # Filtro por número do pedido
         numero_pedido = self.request.query_params.get('numero_pedido', None)
         if numero_pedido:
@@ -55,13 +120,90 @@ class WebhookListarView(generics.ListAPIView):
         
         return PedidoService.listar_pedidos(filtros)
 
+    def list(self, request, *args, **kwargs):
+        if self.paginacao_cursor():
+            return self.listar_por_cursor(request)
+
+        # ETag a partir do total e do último atualizado_em dos pedidos filtrados,
+        # calculado antes de paginar e serializar. Alterações só no cadastro de
+        # StatusPedido (nome, cor) não mudam o ETag.
+        queryset = self.filter_queryset(self.get_queryset())
+        versao = queryset.aggregate(total=Count('id'), ultimo=Max('atualizado_em'))
+        etag = calcular_etag('pedidos', request.get_full_path(), versao['total'], versao['ultimo'])
+        nao_modificado = resposta_nao_modificada(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+
+        resposta = super().list(request, *args, **kwargs)
+        resposta['ETag'] = etag
+        return resposta
+
+    def listar_por_cursor(self, request):
+        # Sem contar o conjunto filtrado a cada requisição: o ETag vem dos pedidos
+        # da própria página (id, atualizado_em e status) e do total, se pedido
+        queryset = self.filter_queryset(self.get_queryset())
+        pagina = self.paginate_queryset(queryset)
+        etag = calcular_etag(
+            'pedidos', request.get_full_path(), self.paginator.total,
+            *[(pedido.id, pedido.atualizado_em, pedido.status_id) for pedido in pagina]
+        )
+        nao_modificado = resposta_nao_modificada(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+
+        serializer = self.get_serializer(pagina, many=True)
+        resposta = self.get_paginated_response(serializer.data)
+        resposta['ETag'] = etag
+        return resposta
+
+
+class ExportarPedidosView(WebhookListarView):
+    """
+    Exporta os pedidos em CSV ou NDJSON (?formato=csv|ndjson, padrão csv).
+
+    Aceita os mesmos filtros, busca e ordenação da listagem, sem paginação: os
+    pedidos são lidos do banco em lotes e cada linha é enviada assim que lida
+    (ver ExportacaoPedidosService). Com ?q= são exportados todos os pedidos
+    encontrados, na ordem da listagem (sem o limite nem o ranking da busca).
+    """
+    busca_completa = True
+
+    def list(self, request, *args, **kwargs):
+        formato = request.query_params.get('formato') or FORMATO_CSV
+        if formato not in FORMATOS:
+            raise ValidationError({"erro": f"formato inválido. Use um destes: {', '.join(FORMATOS)}"})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return resposta_exportacao(
+            formato,
+            ExportacaoPedidosService.COLUNAS,
+            ExportacaoPedidosService.registros(queryset),
+            'pedidos'
+        )
+
 
 class PedidoDetailView(generics.RetrieveAPIView):
     """
     View para obter detalhes de um pedido específico
     """
     serializer_class = PedidoSerializer
-    queryset = Pedido.objects.select_related('status')
+
+    def get_queryset(self):
+        return PedidoService.pedidos_com_itens()
+
+    def retrieve(self, request, *args, **kwargs):
+        # ETag a partir do atualizado_em e do status do pedido, sem carregar o pedido inteiro
+        versao = Pedido.objects.filter(pk=kwargs.get(self.lookup_field)).values_list('atualizado_em', 'status_id').first()
+        if versao is None:
+            return Response({"erro": "Pedido não encontrado"}, status=status.HTTP_404_NOT_FOUND)
+        etag = calcular_etag('pedido', kwargs.get(self.lookup_field), *versao)
+        nao_modificado = resposta_nao_modificada(request, etag)
+        if nao_modificado is not None:
+            return nao_modificado
+
+        resposta = super().retrieve(request, *args, **kwargs)
+        resposta['ETag'] = etag
+        return resposta
     
 
 class AtualizarStatusPedidoView(APIView):
@@ -94,6 +236,31 @@ class StatusPedidoListView(generics.ListAPIView):
     serializer_class = StatusPedidoSerializer
 
 
+class QuadroPedidosView(APIView):
+    """
+    View do quadro (kanban) de pedidos: para cada status ativo, o total de
+    pedidos, a soma de valor_pedido e das quantidades e os pedidos mais recentes.
+    
+    ?limite= define quantos pedidos vêm em cada coluna (padrão:
+    PEDIDOS_QUADRO_LIMITE, máximo 100).
+    """
+    LIMITE_MAXIMO = 100
+    
+    def get(self, request):
+        try:
+            limite = int(request.query_params.get('limite', settings.PEDIDOS_QUADRO_LIMITE))
+        except (TypeError, ValueError):
+            limite = 0
+        if not 0 < limite <= self.LIMITE_MAXIMO:
+            return Response(
+                {"erro": f"limite deve ser um número entre 1 e {self.LIMITE_MAXIMO}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        colunas = QuadroPedidosService.montar_quadro(limite)
+        return Response({"colunas": ColunaQuadroSerializer(colunas, many=True).data})
+
+
 class AtualizarStatusPedidosEmLoteView(APIView):
     """
     View para atualizar o status de múltiplos pedidos em lote
@@ -1,6 +1,7 @@
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
@@ -19,6 +20,9 @@ class WebhookReceberView(APIView):
     Esta view recebe os dados de pedidos enviados por sistemas externos,
     verifica se a assinatura é válida usando a secret_key configurada, 
     e salva o pedido na base de dados.
+    
+    Com PEDIDOS_WEBHOOK_ASSINCRONO ativo, o webhook é apenas registrado e a resposta
+    é 202; o pedido é criado depois pelo comando `processar_webhooks`.
     """
     def post(self, request, *args, **kwargs):
         """
@@ -32,9 +36,11 @@ class WebhookReceberView(APIView):
         
         # Manter o payload bruto para verificação da assinatura
         payload_raw = request.body
-          # Validar o formato do JSON recebido
+        
+        # Converter e validar o JSON recebido uma única vez; o serviço recebe os
+        # dados validados e usa os bytes brutos só na assinatura e no registro
         try:
-            dados = json.loads(payload_raw.decode('utf-8'))
+            dados = json.loads(payload_raw)
             serializer = WebhookPedidoRequestSerializer(data=dados)
             
             if not serializer.is_valid():
@@ -59,7 +65,7 @@ class WebhookReceberView(APIView):
                     'pedido_id': None
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             # Criar um registro de webhook com erro de JSON inválido
             from pedidosMontink.models import Webhook
             
@@ -79,10 +85,13 @@ class WebhookReceberView(APIView):
                 'pedido_id': None
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Processar o webhook
-        sucesso, mensagem, pedido_id = WebhookService.processar_webhook_pedido(
+        # Processar o webhook (ou apenas enfileirá-lo, no modo assíncrono)
+        enfileirar = settings.PEDIDOS_WEBHOOK_ASSINCRONO
+        sucesso, mensagem, pedido_id, webhook_id = WebhookService.processar_webhook_pedido(
             payload_raw=payload_raw, 
-            assinatura_recebida=assinatura
+            assinatura_recebida=assinatura,
+            enfileirar=enfileirar,
+            dados=serializer.validated_data
         )
         
         # Preparar a resposta
@@ -97,11 +106,19 @@ class WebhookReceberView(APIView):
         
         codigo_status = status.HTTP_201_CREATED if sucesso else status.HTTP_400_BAD_REQUEST
         
+        if enfileirar and sucesso:
+            # O status do webhook já foi registrado como "na fila"
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        
         # Certifique-se de atualizar o registro do webhook se ainda não foi feito
         from pedidosMontink.models import Webhook
         try:
-            webhook = Webhook.objects.filter(payload=payload_raw.decode('utf-8')).order_by('-recebido_em').first()
-            if webhook and webhook.status_code is None:
+            webhook = Webhook.objects.filter(pk=webhook_id).first() if webhook_id else None
+            if webhook and sucesso and webhook.status_code == status.HTTP_200_OK:
+                # Entrega repetida de um pedido que já existia: nada foi criado, e a
+                # resposta usa o mesmo 200 registrado no webhook
+                codigo_status = status.HTTP_200_OK
+            elif webhook and webhook.status_code is None:
                 webhook.status_code = codigo_status
                 webhook.processado = sucesso
                 if not sucesso and not webhook.erro:
@@ -110,4 +127,42 @@ class WebhookReceberView(APIView):
         except Exception:
             pass  # Se não conseguir atualizar o webhook, apenas continue
         
-        return Response(serializer.data, status=codigo_status)
\ No newline at end of file
+        return Response(serializer.data, status=codigo_status)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class WebhookReceberLoteView(APIView):
+    """
+    View para receber vários webhooks de pedidos em uma única requisição
+    (por exemplo, quando a Montink reenvia um acúmulo de pedidos).
+    
+    O corpo é uma lista (ou um objeto {"pedidos": [...]}) de itens no formato
+    {"payload": "<JSON do pedido, como texto>", "assinatura": "<HMAC-SHA256 do payload>"}.
+    O payload vai como texto para que a assinatura seja verificada sobre os mesmos
+    bytes assinados pelo remetente.
+    """
+    def post(self, request, *args, **kwargs):
+        itens = request.data.get('pedidos') if isinstance(request.data, dict) else request.data
+        
+        if not isinstance(itens, list) or not itens:
+            return Response({
+                'sucesso': False,
+                'mensagem': 'Envie uma lista de pedidos no formato [{"payload": ..., "assinatura": ...}]',
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(itens) > settings.PEDIDOS_WEBHOOK_LOTE_MAXIMO:
+            return Response({
+                'sucesso': False,
+                'mensagem': f'O lote pode ter no máximo {settings.PEDIDOS_WEBHOOK_LOTE_MAXIMO} pedidos',
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        resultados = WebhookService.processar_lote_webhooks_pedido(itens)
+        criados = sum(1 for resultado in resultados if resultado['sucesso'])
+        
+        return Response({
+            'sucesso': criados > 0,
+            'mensagem': f"{criados} pedidos recebidos com sucesso. {len(resultados) - criados} falhas.",
+            'total': len(resultados),
+            'criados': criados,
+            'falhas': len(resultados) - criados,
+            'resultados': resultados,
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,248 @@
+"""
+Benchmark da listagem de pedidos em uma tabela `pedidos` sintética.
+
+Compara as consultas anteriores (icontains em numero_pedido e sku, busca livre com
+icontains em quatro colunas, sem os índices de status/criado_em/sku) com as atuais
+(modo de busca por prefixo com índices), e a busca textual ?q= (índice FTS5)
+com o icontains equivalente. Cada cenário mede uma página da listagem: o
+count() da paginação e os 10 primeiros pedidos. Por último, compara uma página
+profunda na paginação por número de página (count + OFFSET) com a paginação
+por cursor (?paginacao=cursor, sem total).
+
+O banco é um arquivo SQLite separado (não usa o banco do projeto); ele é
+reaproveitado entre execuções com a mesma quantidade de pedidos.
+
+Uso: python tests/benchmark_listagem_pedidos.py [quantidade_pedidos] [repeticoes]
+"""
+
+import os
+import sys
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Q
+from pedidosMontink.models import Pedido
+from pedidosMontink.pagination import PedidoCursorPagination
+from pedidosMontink.services.pedido_service import PedidoService
+from busca.services.busca_service import BuscaService
+
+INDICES_NOVOS = [indice for indice in Pedido._meta.indexes]
+INICIO = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+QUANTIDADE_SKUS = 50000
+
+
+def preparar_banco(quantidade):
+    caminho = os.path.join(tempfile.gettempdir(), f'benchmark_pedidos_{quantidade}.sqlite3')
+    connection.settings_dict['NAME'] = caminho
+    call_command('migrate', verbosity=0)
+    BuscaService._disponivel = None
+    if Pedido.objects.count() == quantidade:
+        print(f"Reaproveitando {caminho}")
+        return
+
+    print(f"Gerando {quantidade} pedidos em {caminho}...")
+    aleatorio = random.Random(42)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("DELETE FROM pedidos_itens")
+        cursor.execute("DELETE FROM pedidos")
+        cursor.execute("DELETE FROM pedidosMontink_webhook")
+        cursor.execute("DELETE FROM pedidosMontink_statuspedido")
+        for ordem, nome in enumerate(['Pedido Novo', 'Em Produção', 'Enviado', 'Entregue', 'Cancelado']):
+            cursor.execute(
+                "INSERT INTO pedidosMontink_statuspedido (id, nome, ordem, ativo) VALUES (%s, %s, %s, 1)",
+                [ordem + 1, nome, ordem]
+            )
+        cursor.execute(
+            "INSERT INTO pedidosMontink_webhook (id, evento, payload, recebido_em, verificado, processado, payload_sha256) "
+            "VALUES (1, 'pedido.novo', '{}', %s, 1, 1, '')", [INICIO.strftime('%Y-%m-%d %H:%M:%S')]
+        )
+
+        colunas_pedido = (
+            "id, titulo, valor_pedido, numero_pedido, nome_cliente, documento_cliente, email_cliente, "
+            "status_id, webhook_id, nome_destinatario, endereco, numero, cidade, uf, cep, bairro, "
+            "telefone_destinatario, pais, nome_info_adicional, telefone_info_adicional, email_info_adicional, "
+            "nome_produto, sku, quantidade, design_capa_frente, mockup_capa_frente, criado_em, atualizado_em"
+        )
+        sql_pedido = f"INSERT INTO pedidos ({colunas_pedido}) VALUES ({', '.join(['%s'] * 28)})"
+        sql_item = (
+            "INSERT INTO pedidos_itens (pedido_id, ordem, nome, sku, quantidade, design_capa_frente, mockup_capa_frente) "
+            "VALUES (%s, 0, %s, %s, %s, 'https://exemplo.com/d.pdf', 'https://exemplo.com/m.png')"
+        )
+        lote = 20000
+        for inicio in range(1, quantidade + 1, lote):
+            pedidos, itens = [], []
+            for pedido_id in range(inicio, min(inicio + lote, quantidade + 1)):
+                criado_em = (INICIO + timedelta(minutes=pedido_id)).strftime('%Y-%m-%d %H:%M:%S')
+                sku = f"SKU-{aleatorio.randrange(QUANTIDADE_SKUS):05d}"
+                quantidade_item = aleatorio.randint(1, 5)
+                pedidos.append((
+                    pedido_id, f"Pedido #{pedido_id}", '99.90', pedido_id, f"Cliente {pedido_id}", '12345678900',
+                    'cliente@exemplo.com', aleatorio.randint(1, 5), 1, 'Destinatário', 'Rua Exemplo', '100',
+                    'Rio de Janeiro', 'RJ', '20000-000', 'Centro', '21999999999', 'Brasil', 'Loja',
+                    '21999999999', 'loja@exemplo.com', 'Caderno', sku, quantidade_item,
+                    'https://exemplo.com/d.pdf', 'https://exemplo.com/m.png', criado_em, criado_em
+                ))
+                itens.append((pedido_id, 'Caderno', sku, quantidade_item))
+            cursor.executemany(sql_pedido, pedidos)
+            cursor.executemany(sql_item, itens)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def preparar_indice_busca(quantidade):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {BuscaService.TABELAS[BuscaService.TIPO_PEDIDO]}")
+        if cursor.fetchone()[0] == quantidade:
+            return
+    print("Indexando a busca textual...")
+    BuscaService.reindexar(BuscaService.TIPO_PEDIDO, tamanho_lote=5000)
+
+
+def busca_textual(texto):
+    """Mesma consulta do filtro ?q= da listagem (BuscaTextoFilter)."""
+    ids = BuscaService.buscar(BuscaService.TIPO_PEDIDO, texto)
+    return PedidoService.listar_pedidos().filter(pk__in=ids).order_by(BuscaService.ordem_ranking(ids))
+
+
+def alternar_indices(criar):
+    with connection.schema_editor() as editor:
+        for indice in INDICES_NOVOS:
+            if criar:
+                editor.add_index(Pedido, indice)
+            else:
+                editor.remove_index(Pedido, indice)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def medir_pagina(consulta, repeticoes):
+    """consulta é um queryset ou uma função que monta o queryset (medida junto)."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        queryset = consulta() if callable(consulta) else consulta
+        queryset.count()
+        list(queryset[:10])
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def medir_pagina_profunda(quantidade, repeticoes):
+    """Página do meio da listagem (-criado_em): OFFSET com count contra cursor."""
+    deslocamento = quantidade // 2
+    queryset = PedidoService.listar_pedidos().order_by('-criado_em', '-id')
+    meio = queryset[deslocamento - 1]
+    cursor = PedidoCursorPagination.codificar_cursor('-criado_em', meio.criado_em.isoformat(), meio.id)
+    criado_em, id_pedido = PedidoCursorPagination.decodificar_cursor(cursor, '-criado_em')
+
+    def por_offset():
+        queryset.count()
+        return list(queryset[deslocamento:deslocamento + 10])
+
+    def por_cursor():
+        return list(queryset.filter(criado_em__lte=criado_em).filter(
+            Q(criado_em__lt=criado_em) | Q(criado_em=criado_em, id__lt=id_pedido)
+        )[:10])
+
+    assert [p.id for p in por_offset()] == [p.id for p in por_cursor()]
+    resultados = []
+    for consulta in (por_offset, por_cursor):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            consulta()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        resultados.append(statistics.median(tempos))
+    return f"página {deslocamento // 10 + 1} (offset/cursor)", resultados
+
+
+def cenarios(quantidade):
+    numero = str(quantidade // 2)[:6]
+    sku = 'SKU-01234'
+    periodo = (INICIO + timedelta(minutes=quantidade // 2), INICIO + timedelta(minutes=quantidade // 2, days=30))
+    anterior = Pedido.objects.select_related('status')
+
+    return [
+        (
+            f"numero_pedido={numero}",
+            anterior.filter(numero_pedido__icontains=numero),
+            PedidoService.listar_pedidos({'numero_pedido': numero}),
+        ),
+        (
+            f"sku={sku}",
+            anterior.filter(sku__icontains=sku),
+            PedidoService.listar_pedidos({'sku': sku}),
+        ),
+        (
+            "status=2 + 30 dias",
+            anterior.filter(status=2, criado_em__gte=periodo[0], criado_em__lte=periodo[1]),
+            PedidoService.listar_pedidos({'status': 2, 'data_inicio': periodo[0], 'data_fim': periodo[1]}),
+        ),
+        (
+            f"search={numero}",
+            anterior.filter(
+                Q(numero_pedido__icontains=numero) | Q(nome_cliente__icontains=numero)
+                | Q(sku__icontains=numero) | Q(nome_produto__icontains=numero)
+            ),
+            PedidoService.listar_pedidos().filter(
+                PedidoService.filtro_numero_pedido(numero, PedidoService.MODO_PREFIXO)
+                | PedidoService.filtro_texto('sku', numero, PedidoService.MODO_PREFIXO)
+            ),
+        ),
+        (
+            f"q=Cliente {numero}",
+            anterior.filter(
+                Q(nome_cliente__icontains='Cliente') | Q(email_cliente__icontains='Cliente')
+                | Q(nome_produto__icontains='Cliente') | Q(sku__icontains='Cliente')
+            ).filter(
+                Q(nome_cliente__icontains=numero) | Q(email_cliente__icontains=numero)
+                | Q(nome_produto__icontains=numero) | Q(sku__icontains=numero)
+            ),
+            lambda: busca_textual(f"Cliente {numero}"),
+        ),
+        (
+            "q=01234",
+            anterior.filter(
+                Q(nome_cliente__icontains='01234') | Q(email_cliente__icontains='01234')
+                | Q(nome_produto__icontains='01234') | Q(sku__icontains='01234')
+            ),
+            lambda: busca_textual("01234"),
+        ),
+        (
+            "sem filtros",
+            anterior,
+            PedidoService.listar_pedidos(),
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    preparar_banco(quantidade)
+    preparar_indice_busca(quantidade)
+
+    lista = cenarios(quantidade)
+    alternar_indices(criar=False)
+    try:
+        antes = [medir_pagina(consulta_anterior, repeticoes) for _, consulta_anterior, _ in lista]
+    finally:
+        alternar_indices(criar=True)
+    depois = [medir_pagina(consulta_atual, repeticoes) for _, _, consulta_atual in lista]
+
+    print(f"\n{quantidade} pedidos, mediana de {repeticoes} repetições (count + 10 primeiros)\n")
+    print(f"{'Cenário':<28} {'Antes (ms)':>12} {'Depois (ms)':>12}")
+    for (nome, _, _), tempo_antes, tempo_depois in zip(lista, antes, depois):
+        print(f"{nome:<28} {tempo_antes:12.1f} {tempo_depois:12.1f}")
+    nome, (tempo_antes, tempo_depois) = medir_pagina_profunda(quantidade, repeticoes)
+    print(f"{nome:<28} {tempo_antes:12.1f} {tempo_depois:12.1f}")
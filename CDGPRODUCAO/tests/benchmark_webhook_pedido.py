@@ -0,0 +1,118 @@
+"""
+Benchmark do tratamento do payload de um webhook de pedido (sem banco de dados).
+
+Compara o fluxo anterior (a view decodifica e converte o JSON para validar, e o
+serviço decodifica e converte de novo para ler os campos manualmente) com o fluxo
+atual (uma conversão e uma validação, e o pedido é montado com os dados validados).
+
+Uso: python tests/benchmark_webhook_pedido.py [repeticoes]
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from pedidosMontink.models import Pedido, StatusPedido, Webhook
+from pedidosMontink.serializers.webhook_serializers import WebhookPedidoRequestSerializer
+from pedidosMontink.services.webhook_service import WebhookService
+
+PAYLOAD = json.dumps({
+    "valor_pedido": "129.90",
+    "custo_envio": "15.00",
+    "numero_pedido": 123456,
+    "nome_cliente": "Cliente Teste",
+    "documento_cliente": "12345678900",
+    "email_cliente": "cliente@exemplo.com",
+    "produtos": [{
+        "nome": "Caderno Personalizado",
+        "sku": "CAD-001",
+        "quantidade": 2,
+        "id_sku": 10,
+        "designs": {"capa_frente": "https://exemplo.com/design-frente.pdf"},
+        "mockups": {"capa_frente": "https://exemplo.com/mockup-frente.png"}
+    }],
+    "informacoes_adicionais": {"nome": "Loja", "telefone": "21999999999", "email": "loja@exemplo.com"},
+    "endereco_envio": {
+        "nome_destinatario": "Cliente Teste", "endereco": "Rua Exemplo", "numero": "100",
+        "cidade": "Rio de Janeiro", "uf": "RJ", "cep": "20000-000", "bairro": "Centro",
+        "telefone": "21999999999"
+    }
+}).encode('utf-8')
+
+STATUS = StatusPedido(nome="Pedido Novo")
+WEBHOOK = Webhook(evento='pedido.novo')
+
+
+def fluxo_anterior(payload_raw):
+    # View: decodifica, converte e valida
+    dados = json.loads(payload_raw.decode('utf-8'))
+    serializer = WebhookPedidoRequestSerializer(data=dados)
+    serializer.is_valid()
+    # Serviço: decodifica e converte de novo, e lê os campos manualmente
+    payload_str = payload_raw.decode('utf-8')
+    payload = json.loads(payload_str)
+    produto = payload.get('produtos', [])[0]
+    endereco = payload.get('endereco_envio', {})
+    info = payload.get('informacoes_adicionais', {})
+    return Pedido(
+        numero_pedido=payload.get('numero_pedido'),
+        titulo=f"Pedido #{payload.get('numero_pedido')} - {produto.get('nome')}",
+        valor_pedido=payload.get('valor_pedido', 0),
+        custo_envio=payload.get('custo_envio'),
+        nome_cliente=payload.get('nome_cliente', ''),
+        documento_cliente=payload.get('documento_cliente', ''),
+        email_cliente=payload.get('email_cliente', ''),
+        status=STATUS, webhook=WEBHOOK,
+        nome_destinatario=endereco.get('nome_destinatario', ''),
+        endereco=endereco.get('endereco', ''), numero=endereco.get('numero', ''),
+        cidade=endereco.get('cidade', ''), uf=endereco.get('uf', ''), cep=endereco.get('cep', ''),
+        bairro=endereco.get('bairro', ''), telefone_destinatario=endereco.get('telefone', ''),
+        pais=endereco.get('pais', 'Brasil'),
+        nome_info_adicional=info.get('nome', ''), telefone_info_adicional=info.get('telefone', ''),
+        email_info_adicional=info.get('email', ''),
+        nome_produto=produto.get('nome', ''), sku=produto.get('sku', ''),
+        quantidade=produto.get('quantidade', 1), id_sku=produto.get('id_sku'),
+        design_capa_frente=produto.get('designs', {}).get('capa_frente', ''),
+        mockup_capa_frente=produto.get('mockups', {}).get('capa_frente', '')
+    ), payload_str
+
+
+def fluxo_atual(payload_raw):
+    dados = json.loads(payload_raw)
+    serializer = WebhookPedidoRequestSerializer(data=dados)
+    serializer.is_valid()
+    # O texto do payload só é decodificado uma vez, para o registro do webhook
+    return WebhookService.montar_pedido(serializer.validated_data, STATUS, WEBHOOK), payload_raw.decode('utf-8')
+
+
+def medir(nome, funcao, repeticoes):
+    # Tempo
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(PAYLOAD)
+    tempo_ms = (time.perf_counter() - inicio) * 1000 / repeticoes
+
+    # Memória: pico alocado durante o processamento de um webhook
+    tracemalloc.start()
+    funcao(PAYLOAD)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{nome:<16} {tempo_ms:8.3f} ms/webhook   pico de memória {pico / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"Payload de {len(PAYLOAD)} bytes, {repeticoes} repetições\n")
+    # Aquecimento (imports e caches dos serializers)
+    fluxo_anterior(PAYLOAD)
+    fluxo_atual(PAYLOAD)
+    medir("Fluxo anterior", fluxo_anterior, repeticoes)
+    medir("Fluxo atual", fluxo_atual, repeticoes)
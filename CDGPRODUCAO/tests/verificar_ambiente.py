@@ -70,9 +70,9 @@ def verificar_pastas_formularios():
     from formsProducao.services.zerohum_service import ZeroHumService
     
     # Verifica a pasta do ZeroHum
-    zerohum_id = ZeroHumService.PASTA_ID
-    if zerohum_id or ZeroHumService.setup_pasta_drive():
-        logger.info(f"OK: Pasta ZeroHum configurada com ID: {ZeroHumService.PASTA_ID}")
+    zerohum_id = ZeroHumService.obter_pasta_id()
+    if zerohum_id:
+        logger.info(f"OK: Pasta ZeroHum configurada com ID: {zerohum_id}")
     else:
         logger.error("FALHA: Não foi possível configurar a pasta ZeroHum")
     
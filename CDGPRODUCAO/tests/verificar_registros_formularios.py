@@ -94,12 +94,10 @@ def tentar_corrigir_links():
         return
     
     # Verificar se a pasta ZeroHum existe
-    if ZeroHumService.PASTA_ID is None:
-        pasta_id = ZeroHumService.setup_pasta_drive()
-        if not pasta_id:
-            logger.error("❌ Não foi possível configurar a pasta ZeroHum")
-            return
-        ZeroHumService.PASTA_ID = pasta_id
+    pasta_id = ZeroHumService.obter_pasta_id()
+    if not pasta_id:
+        logger.error("❌ Não foi possível configurar a pasta ZeroHum")
+        return
     
     # Tentar encontrar os arquivos no Google Drive pelos nomes esperados
     for form in formularios_sem_links:
@@ -109,7 +107,7 @@ def tentar_corrigir_links():
         # Buscar o arquivo no Google Drive
         try:
             # Consulta para encontrar o arquivo por nome na pasta específica
-            query = f"name='{nome_arquivo}' and '{ZeroHumService.PASTA_ID}' in parents and trashed=false"
+            query = f"name='{nome_arquivo}' and '{pasta_id}' in parents and trashed=false"
             response = drive_service.service.files().list(
                 q=query,
                 spaces='drive',
@@ -94,8 +94,6 @@ def verificar_estrutura_pastas():
     pasta_id = ZeroHumService.setup_pasta_drive()
     if pasta_id:
         logger.info(f"✓ Pasta ZeroHum encontrada com ID: {pasta_id}")
-        # Atualizar o ID da pasta no serviço
-        ZeroHumService.PASTA_ID = pasta_id
         return True
     else:
         logger.error("❌ Pasta ZeroHum não encontrada e não foi possível criar")